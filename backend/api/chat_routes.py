@@ -1,58 +1,209 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse
-from services.chatbot_services import ChatbotServices
-import speech_recognition as sr
-from gtts import gTTS
-import uuid, os, logging
-from pydub import AudioSegment
-
-logger = logging.getLogger(__name__)
+from contextlib import AsyncExitStack
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from utils.responses import ORJSONResponse, negotiate, audio_response, multipart_response
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from services.chatbot_services import get_chatbot_service
+from services.speech_stream import split_sentences, synthesize_in_order
+from typing import Optional
+from urllib.parse import quote
+from config.setting import VOICE_CONFIG
+from services.speech import recognize_pcm, gtts_cached_filename, synthesize_cached
+from services.tts_cache import get_tts_cache
+from services.voice_executor import get_voice_executor, StageTimings
+from services.warmup import WARMUP
+from utils.audio_utils import decode_stream_to_pcm, vad_trim
+from utils.uploads import AudioUpload
+from utils.exceptions import AppException
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
 voice_router = APIRouter()
 
-OUTPUT_DIR = "responses"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+async def transcribe_upload(upload: AudioUpload, timings: StageTimings) -> str:
+    """Stream an uploaded recording into the decoder and transcribe it."""
+    executor = get_voice_executor()
+
+    # Upload chunks go straight into ffmpeg (pipes, no temp files, no full buffering)
+    with timings.stage("upload_decode"):
+        chunks = await upload.open()
+        pcm = await decode_stream_to_pcm(chunks, upload.format)
+
+    # Trim silence in the transcode process pool
+    with timings.stage("vad"):
+        pcm = await executor.transcode(vad_trim, pcm)
+
+    # Speech Recognition in the bounded STT pool
+    with timings.stage("stt"):
+        return await executor.stt(recognize_pcm, pcm)
+
+
+def resolve_session_id(session_id: Optional[str], upload: AudioUpload) -> str:
+    """Session ID from the query string, else from the multipart form."""
+    session_id = session_id or upload.fields.get("session_id")
+    if not session_id:
+        raise HTTPException(status_code=400, detail="session_id is required")
+    return session_id
+
 
 @voice_router.post("/chat")
 async def voice_chat(
-    file: UploadFile = File(...),
-    session_id: str = Form(...)
+    request: Request,
+    session_id: Optional[str] = Query(None, description="Falls back to the 'session_id' form field")
+):
+    """
+    Voice chat; expects multipart form data with a 'file' part (or a raw audio/* body).
+
+    The reply format is negotiated from ``Accept``:
+
+    - ``application/json`` (default, also for ``*/*``): transcript, answer
+      and the ``audio_path`` of the cached TTS file under /static.
+    - ``audio/mpeg``: the MP3 itself (``Range`` requests get 206), with the
+      transcript and answer URL-encoded in ``X-User-Query`` / ``X-AI-Response``.
+    - ``multipart/mixed``: the JSON part followed by the MP3 part.
+    """
+    executor = get_voice_executor()
+    async with executor.admit() as timings:
+        try:
+            upload = AudioUpload(request)
+            text = await transcribe_upload(upload, timings)
+            session_id = resolve_session_id(session_id, upload)
+            logger.info(f"Transcribed: {text}")
+        except AppException as e:
+            logger.warning(f"Voice input rejected: {e.message}")
+            return ORJSONResponse({"error": e.message}, status_code=e.status_code)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Voice chat error: {e}")
+            return ORJSONResponse({"error": str(e)}, status_code=500)
+
+        try:
+            # Get chatbot response
+            with timings.stage("llm"):
+                chatbot = await run_in_threadpool(get_chatbot_service)
+                response = await run_in_threadpool(chatbot.get_product_info, text, session_id)
+            raw_text = response.get("answer", "No response")
+
+            # Generate TTS (served from the content-addressed cache on repeats)
+            with timings.stage("tts"):
+                tts_filename = await executor.stt(gtts_cached_filename, raw_text)
+
+            metadata = {
+                "user_query": text,
+                "ai_response": raw_text,
+                "audio_path": f"/static/{tts_filename}",
+                "timings_ms": timings.stages,
+            }
+            reply_format = negotiate(request.headers.get("accept"), ["audio/mpeg", "multipart/mixed", "application/json"])
+            if reply_format == "application/json":
+                return ORJSONResponse(metadata)
+
+            audio = await executor.stt(get_tts_cache().read, tts_filename)
+            if reply_format == "multipart/mixed":
+                return multipart_response(metadata, audio)
+            return audio_response(
+                audio,
+                request.headers.get("range"),
+                headers={
+                    "X-User-Query": quote(text),
+                    "X-AI-Response": quote(raw_text),
+                    "X-Session-ID": quote(session_id),
+                },
+            )
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Voice chat error: {e}")
+            return ORJSONResponse({"error": str(e)}, status_code=500)
+
+
+@voice_router.post("/chat/stream")
+async def voice_chat_stream(
+    request: Request,
+    session_id: Optional[str] = Query(None, description="Falls back to the 'session_id' form field")
 ):
+    """
+    Voice chat with sentence-chunked streaming TTS.
+
+    The LLM answer is streamed, split into sentences and synthesized with
+    bounded parallelism; MP3 chunks are sent in order over a chunked
+    response, so playback starts after the first sentence. The transcript
+    is returned URL-encoded in the ``X-User-Query`` header.
+    """
+    # The admission slot is held until the last audio chunk is sent: the LLM
+    # stream and the TTS calls are the expensive part of this endpoint
+    admission = AsyncExitStack()
+    timings = await admission.enter_async_context(get_voice_executor().admit())
+    streaming = False
     try:
-        # Save uploaded file
-        temp_input = f"temp_{uuid.uuid4().hex}.webm"
-        with open(temp_input, "wb") as f:
-            f.write(await file.read())
-
-        # Convert to WAV using pydub
-        temp_wav = f"temp_{uuid.uuid4().hex}.wav"
-        audio = AudioSegment.from_file(temp_input, format="webm")
-        audio.export(temp_wav, format="wav")
-        os.remove(temp_input)
-
-        # Speech Recognition
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(temp_wav) as source:
-            audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data)
-        os.remove(temp_wav)
-
-        logger.info(f"Transcribed: {text}")
-
-        # Get chatbot response
-        response = ChatbotServices().get_product_info(text, session_id)
-        raw_text = response.get("answer", "No response")
-
-        # Generate TTS
-        tts_filename = f"speech_{uuid.uuid4().hex}.mp3"
-        tts_path = os.path.join(OUTPUT_DIR, tts_filename)
-        gTTS(raw_text).save(tts_path)
-
-        return JSONResponse({
-            "user_query": text,
-            "ai_response": raw_text,
-            "audio_path": f"/static/{tts_filename}"
-        })
-
-    except Exception as e:
-        logger.error(f"Voice chat error: {e}")
-        return JSONResponse({"error": str(e)}, status_code=500)
+        try:
+            upload = AudioUpload(request)
+            text = await transcribe_upload(upload, timings)
+            session_id = resolve_session_id(session_id, upload)
+            logger.info(f"Transcribed: {text}")
+        except AppException as e:
+            logger.warning(f"Voice input rejected: {e.message}")
+            return ORJSONResponse({"error": e.message}, status_code=e.status_code)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Voice chat error: {e}")
+            return ORJSONResponse({"error": str(e)}, status_code=500)
+
+        chatbot = await run_in_threadpool(get_chatbot_service)
+        sentences = iterate_in_threadpool(
+            split_sentences(
+                chatbot.stream_product_info(text, session_id),
+                min_chars=VOICE_CONFIG.get("stream_min_sentence_chars", 20),
+                max_chars=VOICE_CONFIG.get("stream_max_sentence_chars", 400),
+            )
+        )
+        audio_chunks = synthesize_in_order(
+            sentences,
+            synthesize_cached,
+            max_parallel=VOICE_CONFIG.get("stream_max_parallel_tts", 3),
+        )
+        response = StreamingResponse(
+            _release_after(audio_chunks, admission),
+            media_type="audio/mpeg",
+            headers={"X-User-Query": quote(text), "X-Session-ID": quote(session_id)},
+            # Also releases the slot if the client is gone before the body is iterated
+            background=BackgroundTask(admission.aclose),
+        )
+        streaming = True
+        return response
+    finally:
+        if not streaming:
+            await admission.aclose()
+
+
+async def _release_after(chunks, admission: AsyncExitStack):
+    """Yield ``chunks``, then leave the voice admission slot (also on disconnect)."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await admission.aclose()
+
+
+@voice_router.get("/health")
+async def health():
+    """Voice pipeline status: "warming_up" until this worker's warm-up is done, plus executor load."""
+    snapshot = WARMUP.snapshot()
+    executor = get_voice_executor()
+    return {
+        "service": "voice",
+        "status": "healthy" if snapshot["ready"] else "warming_up",
+        "components": {
+            name: component["ready"]
+            for name, component in snapshot["components"].items()
+            if name in ("chatbot", "llm", "speech")
+        },
+        "in_flight": executor.pending,
+        "max_in_flight": executor.max_pending,
+    }
@@ -1,22 +1,15 @@
 import speech_recognition as sr
 from services.chatbot_services import ChatbotServices
+from services.tts_cache import get_tts_cache
 from gtts import gTTS
-import os
-import uuid
-import logging
+import io
+from utils.logging import get_logger
 
 # =========================
 # Setup Logging
 # =========================
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler()]
-)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
-OUTPUT_DIR = "responses"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
 def voice_input() -> str:
@@ -43,10 +36,15 @@ def text_to_speech(text: str) -> str:
     """Convert text to speech, save as mp3, return file path."""
     try:
         clean_text = str(text)
-        file_name = f"speech_{uuid.uuid4().hex}.mp3"
-        file_path = os.path.join(OUTPUT_DIR, file_name)
-        tts = gTTS(text=clean_text, lang="en")
-        tts.save(file_path)
+
+        def _synthesize(speech_text: str) -> bytes:
+            buffer = io.BytesIO()
+            gTTS(text=speech_text, lang="en").write_to_fp(buffer)
+            return buffer.getvalue()
+
+        cache = get_tts_cache()
+        file_name = cache.get_or_synthesize(clean_text, "en", "gtts", _synthesize)
+        file_path = cache.path_for(file_name)
         logger.info(f"TTS saved to {file_path}")
         return file_path
     except Exception as e:
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from db.chat_history_setup import insert_message, fetch_history  # use your working functions
+import hashlib
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from db.chat_history_setup import insert_message, insert_messages, fetch_history  # use your working functions
 
 history_router = APIRouter(prefix="/api/history", tags=["History"])
 
@@ -16,9 +19,23 @@ class ChatMessage(BaseModel):
     audioUrl: str | None = None
 
 
+MAX_BATCH_SIZE = 100
+
+
+# 🧩 Batch of chat messages (idempotent on message ``id``)
+class ChatMessageBatch(BaseModel):
+    messages: list[ChatMessage] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
 # ✅ GET - Fetch chat history
 @history_router.get("/{session_id}")
-async def get_chat_history(session_id: str):
+async def get_chat_history(session_id: str, request: Request):
+    """
+    Chat history of a session, with an ``ETag``.
+
+    The frontend polls this endpoint; a client that sends the last ETag in
+    ``If-None-Match`` gets an empty 304 while the history is unchanged.
+    """
     try:
         # Use your helper from chat_history_setup
         history_docs = fetch_history(session_id=session_id)
@@ -37,11 +54,28 @@ async def get_chat_history(session_id: str):
             for doc in history_docs
         ]
 
-        return {"history": history}
+        body = orjson.dumps({"history": history})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch history: {e}")
 
+    # Weak: the compression middleware may change the bytes on the wire
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` check with weak comparison (``W/`` prefixes ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
 
 # ✅ POST - Save chat message
 @history_router.post("/{session_id}")
@@ -64,3 +98,31 @@ async def save_chat_message(session_id: str, msg: ChatMessage):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save message: {e}")
+
+
+# ✅ POST - Save several chat messages in one request
+@history_router.post("/{session_id}/batch")
+async def save_chat_messages(session_id: str, batch: ChatMessageBatch):
+    try:
+        messages = [
+            {
+                "id": msg.id,
+                "role": msg.role,
+                "text": msg.text,
+                "timestamp": msg.timestamp,
+                "contentType": msg.contentType,
+                "imageUrl": msg.imageUrl,
+                "audioUrl": msg.audioUrl,
+            }
+            for msg in batch.messages
+        ]
+
+        result = insert_messages(session_id, messages)
+        return {
+            "status": "success",
+            "inserted": result["inserted"],
+            "skipped": result["skipped"],
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save messages: {e}")
@@ -1,10 +1,34 @@
+import asyncio
+import time
+from contextlib import nullcontext
+
+import orjson
+
 from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from config.setting import BATCH_CONFIG
+from utils.admission import Rejected, get_route_class
 from utils.exceptions import AppException
-from services.chatbot_services import ChatbotServices
+from services.chatbot_services import get_chatbot_service
 
 
 routes_router = APIRouter(tags=["Chatbot"])
-chatbot_service = ChatbotServices()
+
+MAX_BATCH_ITEMS = BATCH_CONFIG.get("max_items", 1000)
+
+
+# 🧩 One question of a batch
+class BatchItem(BaseModel):
+    query: str = Field(..., min_length=1)
+    session_id: str = "default"
+
+
+# 🧩 Batch of questions answered by /batch
+class BatchRequest(BaseModel):
+    items: list[BatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    max_concurrency: int | None = Field(None, ge=1, description="Parallel LLM calls (capped by batch.max_concurrency)")
 
 
 @routes_router.get("/ask_product")
@@ -13,8 +37,90 @@ async def ask_product(
     session_id: str = Query("default", description="Unique session ID to maintain chat history")
 ):
     try:
-        return chatbot_service.get_product_info(query, session_id=session_id)
+        chatbot_service = await run_in_threadpool(get_chatbot_service)
+        # Embedding, LLM and DB calls block: keep them off the event loop
+        return await run_in_threadpool(chatbot_service.get_product_info, query, session_id=session_id)
     except AppException as e:
         return {"error": e.message, "status_code": e.status_code}
     except Exception as e:
         return {"error": str(e), "status_code": 500}
+
+
+@routes_router.post("/batch")
+async def ask_batch(batch: BatchRequest):
+    """
+    Answer many questions in one request, streamed back as NDJSON.
+
+    All queries are embedded and searched in one batched pass, then the LLM
+    calls run with bounded concurrency, each one admitted through the
+    ``batch.route_class`` admission class like a single chat turn, so a
+    batch cannot exceed that class's in-flight cap. Each result is written as one JSON
+    line (with its ``index`` in the request) as soon as it completes, and a
+    final ``{"done": true, ...}`` line closes the stream. Items of the same
+    session run in request order, one at a time, so their history stays
+    consistent.
+    """
+    chatbot_service = await run_in_threadpool(get_chatbot_service)
+    queries = [item.query for item in batch.items]
+    contexts = await run_in_threadpool(
+        chatbot_service.retriever.retrieve_batch, queries, BATCH_CONFIG.get("embed_batch_size", 64)
+    )
+    limit = BATCH_CONFIG.get("max_concurrency", 8)
+    concurrency = min(batch.max_concurrency or limit, limit)
+    return StreamingResponse(
+        _stream_batch(chatbot_service, batch.items, contexts, concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_batch(chatbot_service, items: list[BatchItem], contexts: list, concurrency: int):
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    route_class = get_route_class(BATCH_CONFIG.get("route_class", "llm"))
+    results: asyncio.Queue = asyncio.Queue()
+
+    sessions: dict[str, list[int]] = {}
+    for index, item in enumerate(items):
+        sessions.setdefault(item.session_id, []).append(index)
+
+    async def answer(index: int) -> dict:
+        item = items[index]
+        item_start = time.perf_counter()
+        try:
+            admission = route_class.admit(item.session_id) if route_class is not None else nullcontext()
+            async with semaphore, admission:
+                response = await run_in_threadpool(
+                    chatbot_service.get_product_info, item.query, item.session_id, contexts[index]
+                )
+            line = {"index": index, **response}
+        except Rejected as e:
+            line = {"index": index, "query": item.query, "session_id": item.session_id, "error": e.message,
+                    "retry_after": e.retry_after}
+        except AppException as e:
+            line = {"index": index, "query": item.query, "session_id": item.session_id, "error": e.message}
+        except Exception as e:
+            line = {"index": index, "query": item.query, "session_id": item.session_id, "error": str(e)}
+        line["ms"] = round((time.perf_counter() - item_start) * 1000, 1)
+        return line
+
+    async def run_session(indices: list[int]):
+        for index in indices:
+            await results.put(await answer(index))
+
+    tasks = [asyncio.create_task(run_session(indices)) for indices in sessions.values()]
+    errors = 0
+    try:
+        for _ in range(len(items)):
+            line = await results.get()
+            errors += "error" in line
+            yield orjson.dumps(line) + b"\n"
+        yield orjson.dumps({
+            "done": True,
+            "count": len(items),
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }) + b"\n"
+    finally:
+        # Client disconnected: don't start LLM calls nobody will read
+        for task in tasks:
+            task.cancel()
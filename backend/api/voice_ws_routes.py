@@ -0,0 +1,16 @@
+from fastapi import APIRouter, WebSocket
+from services.voice_session import VoiceSession
+
+voice_ws_router = APIRouter()
+
+
+@voice_ws_router.websocket("/ws/{session_id}")
+async def voice_session_ws(websocket: WebSocket, session_id: str):
+    """
+    Persistent full-duplex voice session.
+
+    Keeps the chatbot, chat history, retrieved context and chosen voice in
+    memory for the lifetime of the connection; see VoiceSession for the
+    message protocol.
+    """
+    await VoiceSession(websocket, session_id).run()
@@ -0,0 +1,215 @@
+# backend/benchmarks/fakes.py
+
+"""
+Local stand-ins for the external services used by the chatbot.
+
+They let the FastAPI app run offline for benchmarks and evaluations:
+a chat model with configurable latency and token rate, an extractive
+stand-in for the review summary job, deterministic embeddings, and an
+in-memory replacement for the Astra DB collections.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from typing import Any, Iterator, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+FAKE_ANSWER = (
+    "Based on the reviews, the boAt Rockerz 235v2 is a solid choice. "
+    "Customers like the bass, the fast charging and the battery life of six to eight hours. "
+    "Some buyers mention it is not ideal for gaming. "
+    "Would you like me to compare it with other wireless headsets?"
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that sleeps like a remote LLM and returns a canned answer.
+
+    Attributes:
+        latency (float): Seconds before the first token (time to first token).
+        tokens_per_second (float): Generation speed after the first token.
+        answer (str): Text returned for every prompt.
+    """
+
+    latency: float = 0.3
+    tokens_per_second: float = 80.0
+    answer: str = FAKE_ANSWER
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency-chat"
+
+    def _tokens(self) -> list[str]:
+        return re.findall(r"\S+\s*", self.answer)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        tokens = self._tokens()
+        time.sleep(self.latency + len(tokens) / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.answer))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for token in self._tokens():
+            time.sleep(1.0 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class FakeSummaryModel(BaseChatModel):
+    """
+    Chat model standing in for the LLM of the review summary job.
+
+    Reads the ``[rating] review`` lines of the summary prompt and returns
+    the JSON shape the prompt asks for, built extractively: pros are the
+    opening clauses of the best-rated reviews, cons those of the worst.
+
+    Attributes:
+        latency (float): Seconds per call.
+    """
+
+    latency: float = 0.5
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-review-summary"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        prompt = messages[-1].content
+        reviews = [(int(rating), text.strip()) for rating, text in re.findall(r"^\[(\d)\S*\]\s*(.+)$", prompt, re.M)]
+        reviews.sort(key=lambda review: -review[0])
+
+        def clause(text: str) -> str:
+            # A few words, like the prompt asks for
+            return " ".join(re.split(r"[.!,;\n]", text, maxsplit=1)[0].split()[:5])
+
+        pros = [clause(text) for rating, text in reviews if rating >= 4][:3]
+        cons = [clause(text) for rating, text in reversed(reviews) if rating <= 2][:3]
+        positive = sum(rating >= 4 for rating, _ in reviews)
+        content = json.dumps({
+            "summary": f"{positive} of {len(reviews)} sampled reviewers rate it 4 stars or more.",
+            "pros": [p for p in pros if p],
+            "cons": [c for c in cons if c],
+        })
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embeddings (hashing trick, L2-normalized).
+
+    Texts sharing words get similar vectors, so retrieval behaves
+    plausibly without downloading a model.
+    """
+
+    def __init__(self, size: int = 384):
+        self.size = size
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.size
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class InMemoryCollection:
+    """Thread-safe subset of the astrapy Collection API used by the app."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: list[dict] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _matches(doc: dict, filter: Optional[dict]) -> bool:
+        for key, condition in (filter or {}).items():
+            if isinstance(condition, dict) and "$in" in condition:
+                if doc.get(key) not in condition["$in"]:
+                    return False
+            elif doc.get(key) != condition:
+                return False
+        return True
+
+    def insert_one(self, document: dict):
+        with self._lock:
+            doc = {"_id": uuid.uuid4().hex, **document}
+            self._docs.append(doc)
+        return type("InsertOneResult", (), {"inserted_id": doc["_id"]})()
+
+    def insert_many(self, documents: list[dict], ordered: bool = True, **kwargs):
+        """Like the Data API: ``_id`` is unique; an unordered insert keeps going past duplicates."""
+        inserted, duplicates = [], []
+        with self._lock:
+            existing = {doc["_id"] for doc in self._docs}
+            for document in documents:
+                doc = {"_id": uuid.uuid4().hex, **document}
+                if doc["_id"] in existing:
+                    duplicates.append(doc["_id"])
+                    if ordered:
+                        break
+                    continue
+                existing.add(doc["_id"])
+                self._docs.append(doc)
+                inserted.append(doc["_id"])
+        if duplicates:
+            from astrapy.exceptions import CollectionInsertManyException, DataAPIResponseException
+
+            errors = [{"errorCode": "DOCUMENT_ALREADY_EXISTS", "message": f"Document already exists with _id '{_id}'"}
+                      for _id in duplicates]
+            raise CollectionInsertManyException(
+                inserted_ids=inserted,
+                exceptions=[DataAPIResponseException.from_response(command=None, raw_response={"errors": errors})],
+            )
+        return type("InsertManyResult", (), {"inserted_ids": inserted})()
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, **kwargs):
+        with self._lock:
+            docs = [dict(doc) for doc in self._docs if self._matches(doc, filter)]
+        if projection:
+            keep = {key for key, include in projection.items() if include}
+            docs = [{k: v for k, v in doc.items() if k in keep or k == "_id"} for doc in docs]
+        return iter(docs)
+
+    def delete_many(self, filter: Optional[dict] = None):
+        with self._lock:
+            self._docs = [doc for doc in self._docs if not self._matches(doc, filter)]
+
+
+class InMemoryDatabase:
+    """Stand-in for an astrapy Database holding InMemoryCollections."""
+
+    def __init__(self):
+        self._collections: dict[str, InMemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_collection(self, name: str) -> InMemoryCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = InMemoryCollection(name)
+            return self._collections[name]
+
+    def list_collections(self):
+        return [type("CollectionDescriptor", (), {"name": name})() for name in self._collections]
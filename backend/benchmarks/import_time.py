@@ -0,0 +1,60 @@
+# backend/benchmarks/import_time.py
+
+"""
+Per-package import time of the API process.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+aggregates the self time of every imported module by top-level package,
+which shows what worker cold start is spent on. Complements the
+in-process stage report served on ``/debug/startup``.
+
+Usage (from backend/):
+    python -m benchmarks.import_time --top 25
+    python -m benchmarks.import_time --module api.routes
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module: str) -> tuple[dict, float]:
+    """Return (self milliseconds per top-level package, total milliseconds) for importing ``module``."""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([backend_dir, os.path.dirname(backend_dir)])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=backend_dir, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{result.stderr[-2000:]}")
+
+    packages, total = {}, 0.0
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_ms = int(match.group(1)) / 1000
+        packages[match.group(4).split(".")[0]] = packages.get(match.group(4).split(".")[0], 0.0) + self_ms
+        total += self_ms
+    return packages, total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time per top-level package.")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    packages, total = measure(args.module)
+    print(f"📦 import {args.module}: {total:.1f} ms across {len(packages)} packages")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{ms:>9.1f} ms  {ms / total:>6.1%}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# backend/benchmarks/load_test.py
+
+"""
+Offline load test for the chatbot API.
+
+Boots the FastAPI app in-process with local stand-ins (fake LLM with
+configurable latency and token rate, hashing embeddings over the product
+CSV in an in-memory vector store, in-memory chat history, fake STT/TTS)
+and drives the main endpoints at a fixed concurrency. Throughput and
+p50/p95/p99 latency per scenario are written to a JSON report.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --concurrency 16 --requests 200 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks.fakes import FakeChatModel, HashingEmbeddings, InMemoryDatabase
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CSV = os.path.join(REPO_ROOT, "data", "flipkart_product_review.csv")
+WEBM_MAGIC = b"\x1a\x45\xdf\xa3"
+
+QUERIES = [
+    "Which bluetooth headset has the best battery life?",
+    "Is the boAt Rockerz good for gaming?",
+    "Show me cheap wireless earphones",
+    "What do customers say about the sound quality?",
+    "Recommend a product with fast charging",
+]
+
+
+def build_app(args):
+    """Import the FastAPI app with every external dependency replaced by a local stand-in."""
+    from langchain_core.vectorstores import InMemoryVectorStore
+
+    memory_db = InMemoryDatabase()
+
+    # Chat history store used by /api/history/*
+    import db.chat_history_setup as chat_history_setup
+    chat_history_setup.connect_to_database = lambda: memory_db
+
+    # Retriever: in-memory vector store over the product CSV + fake LLM
+    from ingestion.csv_loader import CSVLoader
+    from services.retreiver import RetrieverServices
+    import services.chatbot_services as chatbot_services
+
+    vectorstore = InMemoryVectorStore(HashingEmbeddings())
+    vectorstore.add_documents(CSVLoader(args.csv).load())
+    llm = FakeChatModel(latency=args.llm_latency, tokens_per_second=args.token_rate)
+    retriever = RetrieverServices(llm=llm, vectorstore=vectorstore, db=memory_db)
+    chatbot_services.RetrieverServices = lambda *a, **k: retriever
+
+    # Voice pipeline: skip ffmpeg / Google STT / gTTS, keep the executors and timings
+    import api.chat_routes as chat_routes
+    from services.voice_executor import get_voice_executor
+
+    async def fake_decode(chunks, input_format=None):
+        async for _ in chunks:
+            pass
+        return b"\x00\x00" * 16000
+
+    def fake_stt(pcm: bytes) -> str:
+        time.sleep(args.stt_latency)
+        return QUERIES[0]
+
+    def fake_tts(text: str, voice: str = "com") -> str:
+        time.sleep(args.tts_latency)
+        return "tts_benchmark.mp3"
+
+    executor = get_voice_executor()
+    executor.transcode = executor.stt  # stand-ins are not picklable; keep them in-process
+    chat_routes.decode_stream_to_pcm = fake_decode
+    chat_routes.vad_trim = lambda pcm: pcm
+    chat_routes.recognize_pcm = fake_stt
+    chat_routes.gtts_cached_filename = fake_tts
+
+    from main import app
+    return app
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    indices = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in indices:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += 0 if ok else 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def _session(i: int) -> str:
+    return f"bench-{i % 50}"
+
+
+async def ask_product(client, i):
+    return await client.get(
+        "/api/chat/ask_product",
+        params={"query": QUERIES[i % len(QUERIES)], "session_id": _session(i)},
+    )
+
+
+async def history_save_batch(client, i):
+    messages = [
+        {"id": f"{i}_u", "role": "user", "text": QUERIES[i % len(QUERIES)], "timestamp": "10:00:00"},
+        {"id": f"{i}_a", "role": "ai", "text": "Here you go.", "timestamp": "10:00:01"},
+    ]
+    return await client.post(f"/api/history/{_session(i)}/batch", json={"messages": messages})
+
+
+async def history_get(client, i):
+    return await client.get(f"/api/history/{_session(i)}")
+
+
+async def voice_chat(client, i):
+    audio = WEBM_MAGIC + b"\x00" * 4096
+    return await client.post(
+        "/api/voice/chat",
+        params={"session_id": _session(i)},
+        files={"file": ("voice.webm", audio, "audio/webm")},
+    )
+
+
+SCENARIOS = {
+    "ask_product": ask_product,
+    "history_save_batch": history_save_batch,
+    "history_get": history_get,
+    "voice_chat": voice_chat,
+}
+
+
+async def main_async(args) -> dict:
+    app = build_app(args)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+        for name in args.scenarios:
+            print(f"▶ {name}: {args.requests} requests @ concurrency {args.concurrency}")
+            results[name] = await run_scenario(client, SCENARIOS[name], args.requests, args.concurrency)
+            print(f"  {results[name]}")
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test with local stand-ins.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds to first token")
+    parser.add_argument("--token-rate", type=float, default=80.0, help="tokens per second")
+    parser.add_argument("--stt-latency", type=float, default=0.2)
+    parser.add_argument("--tts-latency", type=float, default=0.2)
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--output", default="benchmark_results.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(main_async(args))
+    report = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# backend/benchmarks/retrieval_eval.py
+
+"""
+Retrieval quality versus latency evaluation.
+
+Builds a labeled query set from the product review CSV (paraphrases of
+each product title mapped to its product_id) and runs it against every
+retriever backend in the ``evaluation`` config section, for each
+document format and k. Reports recall@k, MRR@k and per-query latency
+(p50/p95), and marks the Pareto-optimal configurations (no other
+configuration has both higher recall and lower p95 latency).
+
+Usage (from backend/):
+    python -m benchmarks.retrieval_eval --output retrieval_eval.json
+    python -m benchmarks.retrieval_eval --backends memory-hashing --k 1 3 5
+"""
+
+import argparse
+import json
+import platform
+import random
+import time
+from datetime import datetime
+
+import pandas as pd
+from langchain_core.documents import Document
+
+from config.setting import EVALUATION_CONFIG
+from benchmarks.fakes import HashingEmbeddings
+from benchmarks.load_test import DEFAULT_CSV, summarize
+from utils.logging import get_logger
+from utils.exceptions import AppException
+
+logger = get_logger(__name__)
+
+# Words that describe the product category rather than identify the product
+GENERIC_WORDS = {"bluetooth", "headset", "wired", "wireless", "with", "version", "series", "-"}
+
+QUERY_TEMPLATES = [
+    "{name}",
+    "reviews of {core}",
+    "is the {core} worth buying",
+    "how is the sound quality of {core}",
+    "{core} battery life",
+    "what do customers say about {short}",
+    "{short} review",
+    "{shuffled}",
+]
+
+
+# ======================
+# 🏷️ Labeled query set
+# ======================
+def paraphrase_title(title: str, count: int, rng: random.Random) -> list[str]:
+    """
+    Generate ``count`` query paraphrases of a product title.
+
+    Paraphrases lowercase the title, strip category words ("Bluetooth
+    Headset"), shorten it to brand + model, shuffle or drop words and
+    wrap the result in question templates.
+    """
+    words = title.split()
+    core_words = [w for w in words if w.lower() not in GENERIC_WORDS] or words
+    core = " ".join(core_words[:5])
+    short = " ".join(core_words[:3])
+    shuffled_words = core_words[:]
+    rng.shuffle(shuffled_words)
+    if len(shuffled_words) > 2:
+        shuffled_words.pop(rng.randrange(len(shuffled_words)))
+
+    values = {
+        "name": title.lower(),
+        "core": core,
+        "short": short,
+        "shuffled": " ".join(shuffled_words).lower(),
+    }
+    queries = [template.format(**values) for template in QUERY_TEMPLATES]
+    while len(queries) < count:
+        queries.append(rng.choice(QUERY_TEMPLATES).format(**values).lower())
+    return queries[:count]
+
+
+def build_query_set(csv_path: str, queries_per_product: int, seed: int) -> list[dict]:
+    """Return ``[{"query", "product_id", "product_title"}]`` for every product in the CSV."""
+    data = pd.read_csv(csv_path)
+    if not {"product_id", "product_title"}.issubset(data.columns):
+        raise AppException("Evaluation CSV needs product_id and product_title columns")
+
+    rng = random.Random(seed)
+    products = data[["product_id", "product_title"]].drop_duplicates("product_id")
+    query_set = []
+    for product_id, title in products.itertuples(index=False):
+        for query in paraphrase_title(title, queries_per_product, rng):
+            query_set.append({"query": query, "product_id": product_id, "product_title": title})
+    return query_set
+
+
+def format_documents(docs: list[Document], document_format: str) -> list[Document]:
+    """Apply a document format ("review" or "title_review") to the ingested CSV documents."""
+    if document_format == "review":
+        return docs
+    if document_format == "title_review":
+        return [
+            Document(page_content=f"{doc.metadata['product_name']}. {doc.page_content}", metadata=doc.metadata)
+            for doc in docs
+        ]
+    raise AppException(f"Unsupported document format: {document_format}")
+
+
+# ======================
+# 🗄️ Backends
+# ======================
+def build_embeddings(embeddings_config: dict):
+    if embeddings_config.get("provider") == "hashing":
+        return HashingEmbeddings(size=embeddings_config.get("dimension", 384))
+    from ingestion.data_ingestion import create_embeddings
+    return create_embeddings(embeddings_config)
+
+
+def build_vectorstore(backend: dict, docs: list[Document]):
+    """
+    Build the vector store for one backend config.
+
+    ``memory`` indexes ``docs`` in an exact in-memory store; ``astradb``
+    opens the existing collection as ingested (``docs`` are not re-added).
+    """
+    embeddings = build_embeddings(backend.get("embeddings", {}))
+    kind = backend.get("vectorstore", "memory")
+
+    if kind == "memory":
+        from langchain_core.vectorstores import InMemoryVectorStore
+        vectorstore = InMemoryVectorStore(embeddings)
+        vectorstore.add_documents(docs)
+        return vectorstore
+    if kind == "astradb":
+        from langchain_astradb import AstraDBVectorStore
+        from config.setting import ASTRA_DB_API_ENDPOINT, ASTRA_DB_APPLICATION_TOKEN, ASTRA_DB_KEYSPACE
+        if not (ASTRA_DB_API_ENDPOINT and ASTRA_DB_APPLICATION_TOKEN):
+            raise AppException("Astra DB credentials are not configured")
+        return AstraDBVectorStore(
+            embedding=embeddings,
+            collection_name=backend.get("collection_name", "chatbotecomm"),
+            api_endpoint=ASTRA_DB_API_ENDPOINT,
+            token=ASTRA_DB_APPLICATION_TOKEN,
+            namespace=ASTRA_DB_KEYSPACE,
+        )
+    raise AppException(f"Unsupported vectorstore for evaluation: {kind}")
+
+
+# ======================
+# 📏 Metrics
+# ======================
+def evaluate(vectorstore, query_set: list[dict], k: int) -> dict:
+    """Run every query with top-k retrieval; return recall@k, MRR@k and latency percentiles."""
+    retriever = vectorstore.as_retriever(search_type="similarity", search_kwargs={"k": k})
+    latencies, hits, reciprocal_ranks = [], 0, 0.0
+    retriever.invoke(query_set[0]["query"])  # warm-up (lazy model/client init)
+
+    for item in query_set:
+        start = time.perf_counter()
+        docs = retriever.invoke(item["query"])
+        latencies.append(time.perf_counter() - start)
+
+        ranks = [i for i, doc in enumerate(docs, 1) if doc.metadata.get("product_id") == item["product_id"]]
+        if ranks:
+            hits += 1
+            reciprocal_ranks += 1.0 / ranks[0]
+
+    timing = summarize(latencies, 0, sum(latencies))
+    return {
+        "k": k,
+        "queries": len(query_set),
+        "recall_at_k": round(hits / len(query_set), 4),
+        "mrr": round(reciprocal_ranks / len(query_set), 4),
+        "p50_ms": timing["p50_ms"],
+        "p95_ms": timing["p95_ms"],
+        "mean_ms": timing["mean_ms"],
+    }
+
+
+def mark_pareto(results: list[dict]) -> list[dict]:
+    """Flag results not dominated on (higher recall, lower p95 latency)."""
+    for result in results:
+        result["pareto"] = not any(
+            other["recall_at_k"] >= result["recall_at_k"]
+            and other["p95_ms"] <= result["p95_ms"]
+            and (other["recall_at_k"] > result["recall_at_k"] or other["p95_ms"] < result["p95_ms"])
+            for other in results
+        )
+    return results
+
+
+def print_table(results: list[dict]):
+    header = f"{'backend':<18} {'documents':<13} {'k':>3} {'recall@k':>9} {'MRR':>7} {'p50 ms':>8} {'p95 ms':>8}  pareto"
+    print(header)
+    print("-" * len(header))
+    for r in sorted(results, key=lambda r: (r["p95_ms"], -r["recall_at_k"])):
+        print(
+            f"{r['backend']:<18} {r['document_format']:<13} {r['k']:>3} {r['recall_at_k']:>9.3f} "
+            f"{r['mrr']:>7.3f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f}  {'★' if r['pareto'] else ''}"
+        )
+
+
+# ======================
+# 🚀 Entry point
+# ======================
+def run(args) -> list[dict]:
+    from ingestion.csv_loader import CSVLoader
+
+    query_set = build_query_set(args.csv, args.queries_per_product, args.seed)
+    base_docs = CSVLoader(args.csv).load()
+    print(f"🏷️ {len(query_set)} labeled queries over {len(base_docs)} documents")
+
+    backends = [b for b in EVALUATION_CONFIG.get("backends", []) if not args.backends or b["name"] in args.backends]
+    results = []
+    for backend in backends:
+        # Remote stores are evaluated as ingested; only local ones can be re-indexed per format
+        formats = args.document_formats if backend.get("vectorstore", "memory") == "memory" else ["as_ingested"]
+        for document_format in formats:
+            try:
+                docs = base_docs if document_format == "as_ingested" else format_documents(base_docs, document_format)
+                build_start = time.perf_counter()
+                vectorstore = build_vectorstore(backend, docs)
+                build_s = round(time.perf_counter() - build_start, 3)
+            except Exception as e:
+                logger.warning(f"Skipping backend {backend['name']} ({document_format}): {e}")
+                print(f"⚠️ Skipping {backend['name']} ({document_format}): {e}")
+                continue
+
+            for k in args.k:
+                result = evaluate(vectorstore, query_set, k)
+                result.update(backend=backend["name"], document_format=document_format, build_s=build_s)
+                results.append(result)
+    return mark_pareto(results)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Retrieval recall/MRR versus latency evaluation.")
+    parser.add_argument("--backends", nargs="+", help="backend names from the evaluation config (default: all)")
+    parser.add_argument("--k", nargs="+", type=int, default=EVALUATION_CONFIG.get("k_values", [1, 3, 5, 10]))
+    parser.add_argument(
+        "--document-formats", nargs="+",
+        default=EVALUATION_CONFIG.get("document_formats", ["review"]), choices=["review", "title_review"],
+    )
+    parser.add_argument("--queries-per-product", type=int, default=EVALUATION_CONFIG.get("queries_per_product", 8))
+    parser.add_argument("--seed", type=int, default=EVALUATION_CONFIG.get("seed", 42))
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--output", help="optional JSON report path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args)
+    if not results:
+        print("❌ No backend could be evaluated")
+        return
+    print_table(results)
+
+    if args.output:
+        report = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "config": {k: v for k, v in vars(args).items() if k != "output"},
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
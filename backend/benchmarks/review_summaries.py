@@ -0,0 +1,28 @@
+# backend/benchmarks/review_summaries.py
+
+"""
+Offline run of the review summary job.
+
+Runs ``ingestion.review_summaries`` with ``FakeSummaryModel`` in place of
+the LLM, so the job (sampling, worker pool, checkpoint/resume) can be
+exercised and timed without an API key. Takes every option of the job
+except ``--llm``; the stand-in's per-call latency comes from
+``review_summaries.job.local_latency_s``.
+
+Usage (from backend/):
+    python -m benchmarks.review_summaries --workers 4 --limit 20
+    python -m benchmarks.review_summaries --output /tmp/summaries.jsonl --restart
+"""
+
+from config.setting import REVIEW_SUMMARY_CONFIG
+from benchmarks.fakes import FakeSummaryModel
+from ingestion import review_summaries
+
+
+def main(argv=None):
+    latency = REVIEW_SUMMARY_CONFIG.get("job", {}).get("local_latency_s", 0.5)
+    return review_summaries.main(argv, llm=FakeSummaryModel(latency=latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,31 @@
 from datetime import datetime
 from db.client import connect_to_database
+from utils.logging import get_logger
+from utils.tracing import span
 # from client import connect_to_database
-from astrapy.constants import VectorMetric
-from astrapy.info import (
-    CollectionDefinition,
-    CollectionVectorOptions,
-    VectorServiceOptions,
-)
 
 COLLECTION_NAME = "chat_history"
 
+logger = get_logger(__name__)
+
 
 # -------------------------------
 # 1️⃣ Create the collection (run once)
 # -------------------------------
 def create_collection():
+    from astrapy.constants import VectorMetric
+    from astrapy.info import (
+        CollectionDefinition,
+        CollectionVectorOptions,
+        VectorServiceOptions,
+    )
+
     database = connect_to_database()
 
     # Check if the collection already exists
     existing_collections = [c.name for c in database.list_collections()]
     if COLLECTION_NAME in existing_collections:
-        print(f"⚠️ Collection '{COLLECTION_NAME}' already exists.")
+        logger.warning(f"⚠️ Collection '{COLLECTION_NAME}' already exists.")
         return
 
     # Create with vector search enabled
@@ -37,12 +42,13 @@ def create_collection():
         ),
     )
 
-    print(f"✅ Created collection: {collection.full_name}")
+    logger.info(f"✅ Created collection: {collection.full_name}")
 
 
 # -------------------------------
 # 2️⃣ Insert chat message
 # -------------------------------
+@span("db.insert_message")
 def insert_message(message_data: dict):
     """
     Insert a chat message into Astra DB.
@@ -57,16 +63,88 @@ def insert_message(message_data: dict):
             message_data["timestamp"] = datetime.utcnow().isoformat()
 
         collection.insert_one(message_data)
-        print(f"✅ Message inserted for session {message_data.get('session_id')}")
+        logger.info(f"✅ Message inserted for session {message_data.get('session_id')}")
         return True
     except Exception as e:
-        print(f"❌ Failed to insert message: {e}")
+        logger.exception(f"❌ Failed to insert message: {e}")
         raise
 
 
+# -------------------------------
+# 2️⃣b Insert a batch of chat messages
+# -------------------------------
+# Data API error code of an insert whose ``_id`` is already stored
+DUPLICATE_ID_ERROR = "DOCUMENT_ALREADY_EXISTS"
+
+
+def message_key(session_id: str, message_id: str) -> str:
+    """Deterministic ``_id`` of a batch-inserted message."""
+    return f"{session_id}:{message_id}"
+
+
+@span("db.insert_messages")
+def insert_messages(session_id: str, messages: list[dict]) -> dict:
+    """
+    Insert several chat messages for one session with a single insert_many.
+
+    Messages are idempotent on their client-side ``id``: each document's
+    ``_id`` is ``"<session_id>:<id>"``, so the database itself rejects a
+    message stored before, even by a concurrent retry of the same batch.
+    Those duplicate-key errors of the unordered insert are reported as
+    skipped; any other error is raised. Ids repeated inside the batch keep
+    their first occurrence.
+
+    Returns:
+        dict: ``inserted`` and ``skipped`` message ids.
+    """
+    try:
+        db = connect_to_database()
+        collection = db.get_collection(COLLECTION_NAME)
+
+        # De-duplicate inside the batch, keeping the first occurrence
+        unique = {}
+        for message in messages:
+            unique.setdefault(message["id"], message)
+
+        now = datetime.utcnow().isoformat()
+        docs = []
+        for message_id, message in unique.items():
+            doc = {**message, "_id": message_key(session_id, message_id), "session_id": session_id}
+            doc.setdefault("timestamp", now)
+            docs.append(doc)
+
+        try:
+            stored = set(collection.insert_many(docs, ordered=False).inserted_ids)
+        except Exception as e:
+            if not _only_duplicate_ids(e):
+                raise
+            stored = set(e.inserted_ids)
+
+        inserted = [message_id for message_id in unique if message_key(session_id, message_id) in stored]
+        skipped = [message_id for message_id in unique if message_key(session_id, message_id) not in stored]
+        logger.info(f"✅ {len(inserted)} messages inserted for session {session_id} ({len(skipped)} skipped)")
+        return {"inserted": inserted, "skipped": skipped}
+    except Exception as e:
+        logger.exception(f"❌ Failed to insert messages: {e}")
+        raise
+
+
+def _only_duplicate_ids(error: Exception) -> bool:
+    """True if an unordered insert_many failed only because some ``_id``s already exist."""
+    if getattr(error, "inserted_ids", None) is None or not getattr(error, "exceptions", None):
+        return False
+    descriptors = [
+        descriptor
+        for root in error.exceptions
+        for descriptor in (getattr(root, "error_descriptors", None) or [None])
+    ]
+    return all(descriptor is not None and descriptor.error_code == DUPLICATE_ID_ERROR for descriptor in descriptors)
+
+
 # -------------------------------
 # 3️⃣ Fetch chat history
 # -------------------------------
+@span("db.fetch_history")
 def fetch_history(session_id: str):
     """
     Fetch all chat messages for a specific session_id.
@@ -77,10 +155,10 @@ def fetch_history(session_id: str):
 
         cursor = collection.find({"session_id": session_id})
         history = list(cursor)
-        print(f"💬 Found {len(history)} messages for session {session_id}")
+        logger.info(f"💬 Found {len(history)} messages for session {session_id}")
         return history
     except Exception as e:
-        print(f"❌ Failed to fetch history: {e}")
+        logger.exception(f"❌ Failed to fetch history: {e}")
         raise
 
 
@@ -101,7 +179,7 @@ if __name__ == "__main__":
     msgs = fetch_history("test_session_123")
 
     for msg in msgs:
-        print(f"- [{msg['role']}] {msg['text']}")
+        logger.info(f"- [{msg['role']}] {msg['text']}")
 
 
 
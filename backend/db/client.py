@@ -1,5 +1,4 @@
 import os
-from astrapy import DataAPIClient
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -10,6 +9,8 @@ def connect_to_database():
     if not ASTRA_DB_TOKEN:
         raise ValueError("❌ Missing Astra DB Token — please set ASTRA_DB_TOKEN environment variable")
 
+    from astrapy import DataAPIClient  # imported on first connection, not at API startup
+
     client = DataAPIClient(ASTRA_DB_TOKEN)
     db = client.get_database_by_api_endpoint(ASTRA_DB_API_ENDPOINT)
     return db
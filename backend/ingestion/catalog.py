@@ -0,0 +1,203 @@
+# backend/ingestion/catalog.py
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from utils.logging import get_logger
+from utils.exceptions import AppException
+
+logger = get_logger(__name__)
+
+
+class ProductCatalog:
+    """
+    Columnar, in-memory product catalog for structured questions.
+
+    Every product attribute is one NumPy array indexed by row, so filters,
+    sorts and aggregates ("cheapest in electronics", "average price per
+    category") are vectorized and run in microseconds, with no vector
+    search or LLM call. ``category`` is dictionary-encoded: ``categories``
+    holds the distinct names and ``category_codes`` the int16 index of each
+    row's category.
+
+    Built at ingestion from the ``APILoader`` documents (the only source
+    with price, category and rating counts) and persisted next to the
+    vector index.
+
+    Attributes:
+        ids (np.ndarray): Product ids (object).
+        titles (np.ndarray): Product titles (object).
+        categories (list[str]): Distinct category names, sorted.
+        category_codes (np.ndarray): int16 index into ``categories`` per row.
+        price, rating (np.ndarray): float32 columns.
+        rating_count (np.ndarray): int32 column.
+    """
+
+    NUMERIC_COLUMNS = ("price", "rating", "rating_count")
+    ARRAYS_FILE = "catalog.npz"
+    STRINGS_FILE = "catalog.json"
+
+    def __init__(self, ids, titles, categories: list[str], category_codes, price, rating, rating_count):
+        self.ids = np.asarray(ids, dtype=object)
+        self.titles = np.asarray(titles, dtype=object)
+        self.categories = list(categories)
+        self.category_codes = np.asarray(category_codes, dtype=np.int16)
+        self.price = np.asarray(price, dtype=np.float32)
+        self.rating = np.asarray(rating, dtype=np.float32)
+        self.rating_count = np.asarray(rating_count, dtype=np.int32)
+        if not all(len(column) == len(self.ids) for column in (self.titles, self.category_codes, self.price, self.rating, self.rating_count)):
+            raise AppException("Catalog columns have different lengths")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ========== BUILD / PERSIST ========== #
+    @classmethod
+    def from_documents(cls, documents: list[Document]) -> "ProductCatalog":
+        """Build the catalog from API product documents (other documents are ignored)."""
+        products = [doc.metadata for doc in documents if doc.metadata.get("source") == "api"]
+        categories, codes = np.unique([str(p["category"]) for p in products], return_inverse=True)
+        catalog = cls(
+            ids=[p["id"] for p in products],
+            titles=[p["title"] for p in products],
+            categories=categories.tolist(),
+            category_codes=codes,
+            price=[p["price"] for p in products],
+            rating=[p["rating"] for p in products],
+            rating_count=[p["rating_count"] for p in products],
+        )
+        logger.info(f"🗂️ Built product catalog: {len(catalog)} products in {len(catalog.categories)} categories")
+        return catalog
+
+    def save(self, directory: str):
+        """Write the catalog atomically (temp files + rename) to ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        arrays_path = os.path.join(directory, self.ARRAYS_FILE)
+        strings_path = os.path.join(directory, self.STRINGS_FILE)
+
+        with open(arrays_path + ".tmp", "wb") as f:
+            np.savez(f, category_codes=self.category_codes, **{name: getattr(self, name) for name in self.NUMERIC_COLUMNS})
+        with open(strings_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {"ids": self.ids.tolist(), "titles": self.titles.tolist(), "categories": self.categories},
+                f, ensure_ascii=False,
+            )
+        os.replace(strings_path + ".tmp", strings_path)
+        os.replace(arrays_path + ".tmp", arrays_path)
+        logger.info(f"💾 Saved product catalog to {directory}")
+
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        return all(os.path.exists(os.path.join(directory, name)) for name in (cls.ARRAYS_FILE, cls.STRINGS_FILE))
+
+    @classmethod
+    def load(cls, directory: str) -> "ProductCatalog":
+        if not cls.exists(directory):
+            raise AppException(f"Product catalog not found in {directory}")
+        with np.load(os.path.join(directory, cls.ARRAYS_FILE)) as arrays:
+            columns = {name: arrays[name] for name in ("category_codes",) + cls.NUMERIC_COLUMNS}
+        with open(os.path.join(directory, cls.STRINGS_FILE), encoding="utf-8") as f:
+            strings = json.load(f)
+        return cls(ids=strings["ids"], titles=strings["titles"], categories=strings["categories"], **columns)
+
+    # ========== QUERIES ========== #
+    def category_code(self, category: str) -> Optional[int]:
+        try:
+            return self.categories.index(category)
+        except ValueError:
+            return None
+
+    def mask(
+        self,
+        category: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        min_rating_count: Optional[int] = None,
+    ) -> np.ndarray:
+        """Boolean row mask for the given filters (all optional, combined with AND)."""
+        mask = np.ones(len(self), dtype=bool)
+        if category is not None:
+            code = self.category_code(category)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.category_codes == code
+        if min_price is not None:
+            mask &= self.price >= min_price
+        if max_price is not None:
+            mask &= self.price <= max_price
+        if min_rating is not None:
+            mask &= self.rating >= min_rating
+        if min_rating_count is not None:
+            mask &= self.rating_count >= min_rating_count
+        return mask
+
+    def top(self, by: str, n: int = 5, ascending: bool = False, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Row indices of the ``n`` first products ordered by column ``by``.
+
+        Ties are broken by ``rating_count`` (more reviews first). On large
+        catalogs only the rows that can reach the top ``n`` are sorted.
+        """
+        if by not in self.NUMERIC_COLUMNS:
+            raise AppException(f"Cannot sort catalog by '{by}'")
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        if not len(rows) or n <= 0:
+            return rows[:0]
+        key = getattr(self, by)[rows].astype(np.float64)
+        if not ascending:
+            key = -key
+        if n < len(rows) // 4:
+            # Partition on the primary key, keeping every row tied with the n-th
+            threshold = np.partition(key, n - 1)[n - 1]
+            keep = key <= threshold
+            rows, key = rows[keep], key[keep]
+        order = np.lexsort((-self.rating_count[rows], key))
+        return rows[order[:n]]
+
+    def aggregate(self, mask: Optional[np.ndarray] = None) -> dict:
+        """Per-category count, price min/mean/max and mean rating over the masked rows."""
+        mask = mask if mask is not None else np.ones(len(self), dtype=bool)
+        codes = self.category_codes[mask].astype(np.intp)
+        size = len(self.categories)
+        counts = np.bincount(codes, minlength=size)
+        price_sum = np.bincount(codes, weights=self.price[mask], minlength=size)
+        rating_sum = np.bincount(codes, weights=self.rating[mask], minlength=size)
+        # Group min/max: sort by code, then reduce each contiguous run
+        price_min = np.zeros(size)
+        price_max = np.zeros(size)
+        if len(codes):
+            order = np.argsort(codes, kind="stable")
+            sorted_codes, sorted_price = codes[order], self.price[mask][order]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            price_min[sorted_codes[starts]] = np.minimum.reduceat(sorted_price, starts)
+            price_max[sorted_codes[starts]] = np.maximum.reduceat(sorted_price, starts)
+
+        return {
+            category: {
+                "count": int(counts[code]),
+                "min_price": round(float(price_min[code]), 2),
+                "mean_price": round(float(price_sum[code] / counts[code]), 2),
+                "max_price": round(float(price_max[code]), 2),
+                "mean_rating": round(float(rating_sum[code] / counts[code]), 2),
+            }
+            for code, category in enumerate(self.categories)
+            if counts[code]
+        }
+
+    def rows(self, indices) -> list[dict]:
+        return [
+            {
+                "id": self.ids[i],
+                "title": self.titles[i],
+                "category": self.categories[self.category_codes[i]],
+                "price": round(float(self.price[i]), 2),
+                "rating": round(float(self.rating[i]), 1),
+                "rating_count": int(self.rating_count[i]),
+            }
+            for i in indices
+        ]
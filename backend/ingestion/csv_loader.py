@@ -53,14 +53,21 @@ class CSVLoader:
                 logger.error(f"CSV missing required columns: {missing}")
                 raise AppException(f"CSV file missing required columns: {missing}")
 
+            # product_id is optional; it labels documents for retrieval evaluation
+            columns = ["product_title", "review", "rating"]
+            if "product_id" in data.columns:
+                columns.append("product_id")
+
             docs = []
-            for _, row in data[["product_title", "review", "rating"]].iterrows():
+            for _, row in data[columns].iterrows():
                 try:
                     metadata = {
                         "source": "csv",
                         "product_name": row["product_title"],
                         "rating": row["rating"]
                     }
+                    if "product_id" in row:
+                        metadata["product_id"] = row["product_id"]
                     doc = Document(page_content=row["review"], metadata=metadata)
                     docs.append(doc)
                 except Exception as e:
@@ -1,9 +1,8 @@
 from ingestion.csv_loader import CSVLoader
 from ingestion.api_loader import APILoader
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_openai import OpenAIEmbeddings
-from langchain_astradb import AstraDBVectorStore
-from astrapy import DataAPIClient  # ✅ NEW: For direct Astra DB access
+from ingestion.local_index import LocalVectorIndex
+from ingestion.catalog import ProductCatalog
+from ingestion.embedding_batcher import with_micro_batching
 from config.setting import (
     CSV_FILE_PATH,
     API_URL,
@@ -12,6 +11,8 @@ from config.setting import (
     ASTRA_DB_KEYSPACE,
     EMBEDDINGS_CONFIG,
     VECTORSTORE_CONFIG,
+    LOCAL_INDEX_DIR,
+    CATALOG_DIR,
 )
 from utils.logging import get_logger
 from utils.exceptions import AppException
@@ -19,6 +20,29 @@ from utils.exceptions import AppException
 logger = get_logger(__name__)
 
 
+def create_embeddings(embeddings_config: dict):
+    """
+    Build the embeddings model described by an ``embeddings`` config block.
+
+    Args:
+        embeddings_config (dict): ``provider`` ("huggingface" or "openai") and ``model``.
+
+    Returns:
+        Embeddings: A LangChain embeddings instance.
+    """
+    provider = embeddings_config.get("provider", "huggingface")
+    logger.info(f"🔍 Initializing embeddings provider: {provider}")
+
+    # Provider SDKs (torch for huggingface) are imported only when selected
+    if provider == "huggingface":
+        from langchain_huggingface import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=embeddings_config["model"])
+    if provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(model=embeddings_config["model"])
+    raise AppException(f"Unsupported embeddings provider: {provider}")
+
+
 class DataIngestion:
     """
     DataIngestion pipeline:
@@ -34,6 +58,7 @@ class DataIngestion:
 
         # ✅ Initialize Astra DB connection for chat history
         try:
+            from astrapy import DataAPIClient  # ✅ NEW: For direct Astra DB access
             self.client = DataAPIClient(ASTRA_DB_APPLICATION_TOKEN)
             self.db = self.client.get_database_by_api_endpoint(ASTRA_DB_API_ENDPOINT)
             logger.info("✅ Connected to Astra DB successfully for chat storage.")
@@ -47,6 +72,13 @@ class DataIngestion:
         """
         try:
             logger.info("🚀 Starting data ingestion pipeline...")
+            vstore_provider = VECTORSTORE_CONFIG.get("provider", "astradb")
+
+            # 0. Local index already built: memory-map it instead of re-ingesting
+            if vstore_provider == "local" and LocalVectorIndex.exists(LOCAL_INDEX_DIR):
+                if not ProductCatalog.exists(CATALOG_DIR):
+                    self.build_catalog(self.api_loader.load())
+                return LocalVectorIndex.load(LOCAL_INDEX_DIR, with_micro_batching(create_embeddings(EMBEDDINGS_CONFIG)))
 
             # 1. Load product data
             logger.info("📥 Loading data from CSV and API...")
@@ -55,22 +87,17 @@ class DataIngestion:
             all_docs = csv_docs + api_docs
             logger.info(f"✅ Loaded {len(all_docs)} documents (CSV + API)")
 
-            # 2. Create embeddings
-            provider = EMBEDDINGS_CONFIG.get("provider", "huggingface")
-            logger.info(f"🔍 Initializing embeddings provider: {provider}")
+            # Columnar catalog of the API products (price / category / rating)
+            self.build_catalog(api_docs)
 
-            if provider == "huggingface":
-                embeddings = HuggingFaceEmbeddings(model_name=EMBEDDINGS_CONFIG["model"])
-            elif provider == "openai":
-                embeddings = OpenAIEmbeddings(model=EMBEDDINGS_CONFIG["model"])
-            else:
-                raise AppException(f"Unsupported embeddings provider: {provider}")
+            # 2. Create embeddings (queries from concurrent requests are micro-batched)
+            embeddings = with_micro_batching(create_embeddings(EMBEDDINGS_CONFIG))
 
             # 3. Create vector store
-            vstore_provider = VECTORSTORE_CONFIG.get("provider", "astradb")
             logger.info(f"🗄️ Initializing vector store provider: {vstore_provider}")
 
             if vstore_provider == "astradb":
+                from langchain_astradb import AstraDBVectorStore
                 vstore = AstraDBVectorStore(
                     embedding=embeddings,
                     collection_name="chatbotecomm",
@@ -78,6 +105,10 @@ class DataIngestion:
                     token=ASTRA_DB_APPLICATION_TOKEN,
                     namespace=ASTRA_DB_KEYSPACE,
                 )
+            elif vstore_provider == "local":
+                # Build once, then serve from the memory-mapped copy on disk
+                LocalVectorIndex.build(all_docs, embeddings).save(LOCAL_INDEX_DIR)
+                return LocalVectorIndex.load(LOCAL_INDEX_DIR, embeddings)
             else:
                 raise AppException(f"Unsupported vectorstore provider: {vstore_provider}")
 
@@ -92,6 +123,13 @@ class DataIngestion:
             logger.exception(f"❌ Error in DataIngestion pipeline: {e}")
             raise AppException(f"DataIngestion failed: {str(e)}")
 
+    def build_catalog(self, api_docs: list):
+        """Build and persist the columnar product catalog; ingestion goes on without it on failure."""
+        try:
+            ProductCatalog.from_documents(api_docs).save(CATALOG_DIR)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not build product catalog: {e}")
+
     def get_astra_db(self):
         """
         ✅ Direct Astra DB client for other services (chat history storage).
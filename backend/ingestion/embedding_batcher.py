@@ -0,0 +1,160 @@
+# backend/ingestion/embedding_batcher.py
+
+"""
+Micro-batching of query embeddings across concurrent requests.
+
+Every chat turn embeds its query with its own forward pass. A small model
+like MiniLM costs about the same for a batch of 16 short queries as for
+one, so under load most of the CPU goes to per-call overhead.
+``MicroBatchingEmbeddings`` wraps the embeddings model. ``embed_query``
+puts the text on a queue and waits on a future. A dedicated thread takes
+the first queued query, collects whatever else arrives within
+``window_ms`` (up to ``max_batch_size``), embeds them in one
+``embed_documents`` call and resolves each caller's future.
+
+``embed_documents`` (index builds, /api/chat/batch) is already batched
+and goes straight to the wrapped model.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from langchain_core.embeddings import Embeddings
+
+from config.setting import EMBEDDINGS_CONFIG
+from utils.exceptions import AppException
+from utils.logging import get_logger
+from utils.metrics import Histogram
+
+logger = get_logger(__name__)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size",
+    "Queries embedded per micro-batch forward pass.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+EMBEDDING_BATCH_FILL = Histogram(
+    "embedding_batch_fill_ratio",
+    "Micro-batch size divided by max_batch_size.",
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
+EMBEDDING_QUEUE_WAIT = Histogram(
+    "embedding_queue_wait_seconds",
+    "Time a query waited in the micro-batcher before its forward pass started.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+_STOP = object()
+
+
+class MicroBatchingEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that batches concurrent ``embed_query`` calls.
+
+    The batching thread is started lazily and restarted in a forked child,
+    so an instance built before ``fork`` (see server.py) works in every
+    worker.
+
+    Attributes:
+        embeddings (Embeddings): Wrapped model; queries and documents must embed the same way.
+        window (float): Seconds to wait for more queries after the first one.
+        max_batch_size (int): Queries per forward pass.
+        timeout (float): Seconds a caller waits for its vector.
+    """
+
+    def __init__(self, embeddings: Embeddings, window_ms: float = 5, max_batch_size: int = 32, timeout: float = 30.0):
+        self.embeddings = embeddings
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue: queue.Queue = None
+        self._thread: threading.Thread = None
+
+    # ========== CALLERS ========== #
+    def embed_query(self, text: str) -> list[float]:
+        future: Future = Future()
+        self._ensure_started().put((text, future, time.perf_counter()))
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            raise AppException("Query embedding timed out", 504)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def close(self):
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(_STOP)
+                self._thread.join(timeout=5)
+            self._thread = None
+
+    # ========== BATCHING THREAD ========== #
+    def _ensure_started(self) -> queue.Queue:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # First use, or first use after fork (threads don't survive fork)
+                    self._queue = queue.Queue()
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def _run(self):
+        pending = self._queue
+        while True:
+            first = pending.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch_size:
+                try:
+                    # Queries already queued are taken even when the window is 0
+                    item = pending.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    pending.put(_STOP)
+                    break
+                batch.append(item)
+            self._embed(batch)
+
+    def _embed(self, batch: list[tuple]):
+        start = time.perf_counter()
+        for _, _, enqueued in batch:
+            EMBEDDING_QUEUE_WAIT.observe(start - enqueued)
+        EMBEDDING_BATCH_SIZE.observe(len(batch))
+        EMBEDDING_BATCH_FILL.observe(len(batch) / self.max_batch_size)
+
+        # Identical queries (retries, popular questions) are embedded once
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            vectors = dict(zip(texts, self.embeddings.embed_documents(texts)))
+        except Exception as e:
+            logger.exception(f"❌ Embedding micro-batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for text, future, _ in batch:
+            future.set_result(vectors[text])
+
+
+def with_micro_batching(embeddings: Embeddings) -> Embeddings:
+    """Wrap ``embeddings`` in a micro-batcher if ``embeddings.micro_batch`` is enabled."""
+    cfg = EMBEDDINGS_CONFIG.get("micro_batch", {})
+    if not cfg.get("enabled", False):
+        return embeddings
+    logger.info(f"🧺 Micro-batching query embeddings (window={cfg.get('window_ms', 5)}ms, max={cfg.get('max_batch_size', 32)})")
+    return MicroBatchingEmbeddings(
+        embeddings,
+        window_ms=cfg.get("window_ms", 5),
+        max_batch_size=cfg.get("max_batch_size", 32),
+        timeout=cfg.get("timeout_s", 30.0),
+    )
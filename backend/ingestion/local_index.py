@@ -0,0 +1,147 @@
+# backend/ingestion/local_index.py
+
+import json
+import os
+from typing import Any, Iterable, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from utils.logging import get_logger
+from utils.exceptions import AppException
+
+logger = get_logger(__name__)
+
+
+class LocalVectorIndex(VectorStore):
+    """
+    Read-only exact cosine-similarity index stored on local disk.
+
+    Vectors are L2-normalized float32 rows in ``vectors.npy``; documents
+    (page_content + metadata) are in ``documents.json``. ``load()`` opens
+    the matrix with ``mmap_mode="r"``, so the pages come from the OS page
+    cache and are shared by every process that maps the same file,
+    including workers forked after the index was loaded (see server.py).
+
+    Attributes:
+        vectors (np.ndarray): (n_documents, dimension) normalized vectors.
+        documents (list[Document]): Documents in row order.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    DOCUMENTS_FILE = "documents.json"
+
+    def __init__(self, embedding: Embeddings, vectors: np.ndarray, documents: list[Document]):
+        if len(vectors) != len(documents):
+            raise AppException("Local index vectors and documents are out of sync")
+        self.embedding = embedding
+        self.vectors = vectors
+        self.documents = documents
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    # ========== BUILD / PERSIST ========== #
+    @classmethod
+    def build(cls, documents: list[Document], embedding: Embeddings, batch_size: int = 256) -> "LocalVectorIndex":
+        """Embed ``documents`` in batches and return an in-memory index."""
+        rows = []
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            rows.extend(embedding.embed_documents([doc.page_content for doc in batch]))
+        vectors = _normalize(np.asarray(rows, dtype=np.float32).reshape(len(documents), -1))
+        logger.info(f"🧮 Built local index: {vectors.shape[0]} vectors x {vectors.shape[1] if vectors.size else 0} dims")
+        return cls(embedding, vectors, documents)
+
+    def save(self, directory: str):
+        """Write the index atomically (temp files + rename) to ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        vectors_path = os.path.join(directory, self.VECTORS_FILE)
+        documents_path = os.path.join(directory, self.DOCUMENTS_FILE)
+
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        with open(documents_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in self.documents],
+                f, ensure_ascii=False, default=_json_default,
+            )
+        os.replace(documents_path + ".tmp", documents_path)
+        os.replace(vectors_path + ".tmp", vectors_path)
+        logger.info(f"💾 Saved local index to {directory}")
+
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        return all(os.path.exists(os.path.join(directory, name)) for name in (cls.VECTORS_FILE, cls.DOCUMENTS_FILE))
+
+    @classmethod
+    def load(cls, directory: str, embedding: Embeddings) -> "LocalVectorIndex":
+        """Memory-map a saved index."""
+        if not cls.exists(directory):
+            raise AppException(f"Local index not found in {directory}")
+        vectors = np.load(os.path.join(directory, cls.VECTORS_FILE), mmap_mode="r")
+        with open(os.path.join(directory, cls.DOCUMENTS_FILE), encoding="utf-8") as f:
+            documents = [Document(page_content=d["page_content"], metadata=d["metadata"]) for d in json.load(f)]
+        logger.info(f"📂 Memory-mapped local index from {directory} ({vectors.shape[0]} vectors)")
+        return cls(embedding, vectors, documents)
+
+    # ========== SEARCH ========== #
+    def similarity_search_with_score_by_vector(self, embedding: list[float], k: int = 4, **kwargs: Any) -> list[tuple[Document, float]]:
+        if not len(self.documents):
+            return []
+        query = _normalize(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        scores = self.vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.documents[i], float(scores[i])) for i in top]
+
+    def similarity_search_batch_by_vector(self, embeddings: list[list[float]], k: int = 4) -> list[list[Document]]:
+        """Top-k documents for many query vectors with one matrix product."""
+        if not len(self.documents) or not len(embeddings):
+            return [[] for _ in embeddings]
+        queries = _normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ self.vectors.T  # (n_queries, n_documents)
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return [[self.documents[i] for i in row] for row in top]
+
+    def similarity_search_by_vector(self, embedding: list[float], k: int = 4, **kwargs: Any) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> list[tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k)
+
+    def _select_relevance_score_fn(self):
+        # Cosine similarity in [-1, 1] -> relevance in [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[list[dict]] = None, **kwargs: Any) -> list[str]:
+        raise NotImplementedError("LocalVectorIndex is read-only; rebuild it with LocalVectorIndex.build()")
+
+    @classmethod
+    def from_texts(cls, texts: list[str], embedding: Embeddings, metadatas: Optional[list[dict]] = None, **kwargs: Any) -> "LocalVectorIndex":
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=text, metadata=metadata) for text, metadata in zip(texts, metadatas)]
+        return cls.build(documents, embedding)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def _json_default(value):
+    # numpy scalars (e.g. ratings read by pandas)
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
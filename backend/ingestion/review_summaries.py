@@ -0,0 +1,252 @@
+# backend/ingestion/review_summaries.py
+
+"""
+Offline batch job: one review summary per product.
+
+Serving used to pass raw individual reviews to the LLM, which re-derived
+pros and cons from them on every question. This job reads the review CSV
+once, groups it by ``product_id`` and, for every product, stores:
+
+- pros, cons and a one-line summary, generated by the LLM from a sample
+  of the product's reviews;
+- a sentiment breakdown (positive / neutral / negative counts and the
+  average rating), computed from all of its ratings.
+
+Each finished product is appended to a JSONL checkpoint and fsynced, so
+an interrupted run resumes where it stopped. Failed products are retried
+on the next run. LLM calls run in a bounded thread pool.
+At serving time ``RetrieverServices`` puts the summary of each retrieved
+product in place of its raw reviews (``review_summaries.keep_reviews``
+keeps some of them), so one short block stands in for many reviews; the
+serving side lives in ``services.review_summary_service`` so the API
+process never imports pandas.
+
+Usage (from backend/):
+    python -m ingestion.review_summaries --llm groq --workers 4
+    python -m benchmarks.review_summaries                    # offline stand-in LLM
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+import pandas as pd
+
+from config.setting import REVIEW_SUMMARY_CONFIG, REVIEW_SUMMARIES_PATH, REVIEW_SUMMARY_CSV_PATH, get_llm_config
+from services.review_summary_service import read_summaries
+from utils.logging import get_logger
+from utils.exceptions import AppException
+
+logger = get_logger(__name__)
+
+
+# ======================
+# 📥 Input
+# ======================
+def load_products(csv_path: str, reviews_per_product: int = 30, max_review_chars: int = 300) -> list[dict]:
+    """
+    Group the review CSV by product.
+
+    Returns:
+        list[dict]: ``product_id``, ``title``, ``ratings`` (all of them) and
+        ``reviews`` (a sample of ``(rating, text)`` spread over every rating,
+        so the LLM sees both praise and complaints).
+    """
+    data = pd.read_csv(csv_path)
+    required = {"product_id", "product_title", "rating", "review"}
+    if not required.issubset(data.columns):
+        raise AppException(f"Review CSV missing columns: {required - set(data.columns)}")
+
+    products = []
+    for product_id, group in data.dropna(subset=["review"]).groupby("product_id", sort=True):
+        # Round-robin over ratings (5, 1, 4, 2, 3, 5, ...) until the sample is full
+        by_rating = {rating: list(rows.review) for rating, rows in group.groupby("rating")}
+        order = sorted(by_rating, key=lambda r: -abs(r - 3))
+        sample = []
+        while len(sample) < reviews_per_product and any(by_rating.values()):
+            for rating in order:
+                if by_rating[rating] and len(sample) < reviews_per_product:
+                    sample.append((int(rating), str(by_rating[rating].pop(0))[:max_review_chars]))
+        products.append({
+            "product_id": str(product_id),
+            "title": str(group.product_title.iloc[0]),
+            "ratings": [int(r) for r in group.rating],
+            "reviews": sample,
+        })
+    return products
+
+
+def sentiment_breakdown(ratings: list[int]) -> dict:
+    """Positive (4-5), neutral (3) and negative (1-2) review counts and the average rating."""
+    return {
+        "review_count": len(ratings),
+        "average_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+        "positive": sum(r >= 4 for r in ratings),
+        "neutral": sum(r == 3 for r in ratings),
+        "negative": sum(r <= 2 for r in ratings),
+    }
+
+
+# ======================
+# 🧠 Job
+# ======================
+class ReviewSummaryJob:
+    """
+    Generates per-product review summaries with resumable checkpoints.
+
+    Attributes:
+        llm: LangChain chat model.
+        output_path (str): JSONL checkpoint; one summary per line.
+        workers (int): Maximum LLM calls in flight.
+        max_retries (int): Extra attempts per product before it is left for the next run.
+    """
+
+    def __init__(self, llm, output_path: str, workers: int = 4, max_retries: int = 2):
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import ChatPromptTemplate
+        from prompt_library.system_prompt import REVIEW_SUMMARY_PROMPT
+
+        self.chain = ChatPromptTemplate.from_messages([("human", REVIEW_SUMMARY_PROMPT)]) | llm | StrOutputParser()
+        self.output_path = output_path
+        self.workers = workers
+        self.max_retries = max_retries
+        self._write_lock = threading.Lock()
+
+    def completed(self) -> set[str]:
+        """Product ids already in the checkpoint."""
+        return set(read_summaries(self.output_path))
+
+    def _repair_checkpoint(self):
+        """Cut a line torn by a crash mid-write, so new lines don't get glued to it."""
+        if not os.path.exists(self.output_path):
+            return
+        with open(self.output_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+                logger.warning(f"⚠️ Dropped a torn last line from {self.output_path}")
+
+    def run(self, products: list[dict]) -> dict:
+        """Summarize every product not yet in the checkpoint; returns run statistics."""
+        self._repair_checkpoint()
+        done = self.completed()
+        todo = [p for p in products if p["product_id"] not in done]
+        logger.info(f"🧾 {len(done)} products already summarized, {len(todo)} to go ({self.workers} workers)")
+
+        start = time.perf_counter()
+        failed = []
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="review-summary") as pool:
+            futures = {pool.submit(self.summarize, product): product for product in todo}
+            for future in as_completed(futures):
+                product = futures[future]
+                try:
+                    self._checkpoint(future.result())
+                    logger.info(f"✅ Summarized {product['product_id']} ({product['title'][:50]})")
+                except Exception as e:
+                    failed.append(product["product_id"])
+                    logger.error(f"❌ Could not summarize {product['product_id']}: {e}")
+
+        return {
+            "skipped": len(done),
+            "summarized": len(todo) - len(failed),
+            "failed": failed,
+            "elapsed_s": round(time.perf_counter() - start, 2),
+        }
+
+    def summarize(self, product: dict) -> dict:
+        reviews = "\n".join(f"[{rating}★] {text}" for rating, text in product["reviews"])
+        for attempt in range(self.max_retries + 1):
+            try:
+                raw = self.chain.invoke({"title": product["title"], "reviews": reviews})
+                generated = parse_summary(raw)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"⚠️ Summary of {product['product_id']} failed ({e}), retrying")
+                time.sleep(2 ** attempt)
+        return {
+            "product_id": product["product_id"],
+            "title": product["title"],
+            **generated,
+            "sentiment": sentiment_breakdown(product["ratings"]),
+            "reviews_sampled": len(product["reviews"]),
+        }
+
+    def _checkpoint(self, summary: dict):
+        with self._write_lock, open(self.output_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def parse_summary(raw: str) -> dict:
+    """Extract ``summary`` / ``pros`` / ``cons`` from the model output (tolerates text around the JSON)."""
+    match = re.search(r"\{.*\}", raw, re.S)
+    if not match:
+        raise AppException("LLM reply contains no JSON object")
+    data = json.loads(match.group(0))
+    return {
+        "summary": str(data.get("summary", "")).strip(),
+        "pros": [str(p).strip() for p in data.get("pros", []) if str(p).strip()][:5],
+        "cons": [str(c).strip() for c in data.get("cons", []) if str(c).strip()][:5],
+    }
+
+
+# ======================
+# 🚀 CLI
+# ======================
+def build_llm(provider: str):
+    """Chat model for the job: "groq" or "openai"."""
+    llm_config = get_llm_config(provider)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(api_key=os.getenv("GROQ_API_KEY"), model=llm_config.get("model", "llama-3.1-70b"), temperature=0)
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(api_key=os.getenv("OPENAI_API_KEY"), model=llm_config.get("model", "gpt-4"), temperature=0)
+    raise AppException(f"Unsupported LLM provider: {provider}")
+
+
+def parse_args(argv=None):
+    job = REVIEW_SUMMARY_CONFIG.get("job", {})
+    parser = argparse.ArgumentParser(description="Generate per-product review summaries (resumable).")
+    parser.add_argument("--csv", default=REVIEW_SUMMARY_CSV_PATH)
+    parser.add_argument("--output", default=REVIEW_SUMMARIES_PATH)
+    parser.add_argument("--llm", default=job.get("llm", "groq"), choices=["groq", "openai"])
+    parser.add_argument("--workers", type=int, default=job.get("workers", 4))
+    parser.add_argument("--max-retries", type=int, default=job.get("max_retries", 2))
+    parser.add_argument("--reviews-per-product", type=int, default=job.get("reviews_per_product", 30))
+    parser.add_argument("--max-review-chars", type=int, default=job.get("max_review_chars", 300))
+    parser.add_argument("--limit", type=int, default=None, help="only the first N products")
+    parser.add_argument("--restart", action="store_true", help="discard the checkpoint and start over")
+    return parser.parse_args(argv)
+
+
+def main(argv=None, llm=None) -> Optional[dict]:
+    """
+    Run the job from the command line.
+
+    Args:
+        argv (list | None): CLI arguments (default: ``sys.argv``).
+        llm: Chat model to use instead of ``--llm`` (e.g. an offline stand-in).
+    """
+    args = parse_args(argv)
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+
+    products = load_products(args.csv, args.reviews_per_product, args.max_review_chars)[:args.limit]
+    job = ReviewSummaryJob(llm or build_llm(args.llm), args.output, workers=args.workers, max_retries=args.max_retries)
+    stats = job.run(products)
+    logger.info(f"🏁 Review summaries: {stats} -> {args.output}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
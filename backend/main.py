@@ -1,14 +1,30 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from dotenv import load_dotenv
+import importlib
+import os
+import time
+from contextlib import asynccontextmanager
+
+# Startup profiler first, so everything imported below is timed
+from utils.startup import STARTUP
 
-# Routers
-from api.routes import routes_router
-from api.history_routes import history_router
+with STARTUP.stage("import", "fastapi"):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from starlette.concurrency import run_in_threadpool
+from dotenv import load_dotenv
 
-from api.chat_routes import voice_router
-# from api.voice_routes import voice_router
+from services.tts_cache import get_tts_cache
+from utils.static_files import CachedStaticFiles
+from utils.responses import ORJSONResponse
+from utils.metrics import MetricsMiddleware, CallbackGauge, REGISTRY, PROMETHEUS_CONTENT_TYPE
+from utils.tracing import TracingMiddleware
+from utils.admission import AdmissionMiddleware
+from utils.compression import CompressionMiddleware
+from utils.memory import read_memory
+from config.setting import TRACING_CONFIG, API_CONFIG, WARMUP_CONFIG, ADMISSION_CONFIG, COMPRESSION_CONFIG
+from services.voice_executor import get_voice_executor
+from services.speculative_retrieval import SPECULATION_STATS
+from services.warmup import WARMUP, start_warmup
 
 # Exception handlers
 from utils.exceptions import (
@@ -20,8 +36,37 @@ from utils.exceptions import (
 
 load_dotenv()
 
+STARTED_AT = time.time()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background; /ready answers 503 until it is done
+    start_warmup()
+    if WARMUP_CONFIG.get("block_startup", False):
+        await run_in_threadpool(WARMUP.wait, WARMUP_CONFIG.get("timeout_s", 120))
+    yield
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Ecommerce Chatbot API")
+# Route return values are serialized with orjson instead of json.dumps
+app = FastAPI(title="Ecommerce Chatbot API", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Per-route-class in-flight caps, bounded queues and per-session serialization
+# (innermost, so shed requests still get metrics, a request id and CORS headers)
+if ADMISSION_CONFIG.get("enabled", True):
+    app.add_middleware(AdmissionMiddleware, config=ADMISSION_CONFIG)
+
+# Request latency histogram (exposed on /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Request id + per-stage spans (Server-Timing header, Chrome trace export)
+if TRACING_CONFIG.get("enabled", True):
+    app.add_middleware(TracingMiddleware, server_timing=TRACING_CONFIG.get("server_timing", True))
+
+# gzip/brotli for large JSON/NDJSON/text bodies (threshold + content-type allowlist)
+if COMPRESSION_CONFIG.get("enabled", True):
+    app.add_middleware(CompressionMiddleware, config=COMPRESSION_CONFIG)
 
 # CORS middleware
 app.add_middleware(
@@ -30,21 +75,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing", "X-User-Query", "X-AI-Response", "X-Session-ID", "Content-Range"],
 )
 
- # ✅ only once (clean)
-
-app.include_router(routes_router, prefix="/api/chat", tags=["chat"])
-app.include_router(voice_router, prefix="/api/voice", tags=["voice"])
-# app.include_router(history_router, prefix="/api", tags=["history"])
-app.include_router(history_router)
+# Routers — only the ones enabled in api.routers are imported, so e.g. a
+# text-only worker never loads the speech stack.
+# name -> (module, router attribute, include_router options)
+ROUTERS = {
+    "chat": ("api.routes", "routes_router", {"prefix": "/api/chat", "tags": ["chat"]}),
+    "voice": ("api.chat_routes", "voice_router", {"prefix": "/api/voice", "tags": ["voice"]}),
+    # "voice": ("api.voice_routes", "voice_router", {"prefix": "/api/voice", "tags": ["voice"]}),
+    "voice_ws": ("api.voice_ws_routes", "voice_ws_router", {"prefix": "/api/voice", "tags": ["voice"]}),
+    "history": ("api.history_routes", "history_router", {}),
+}
 
+for router_name in API_CONFIG.get("routers", list(ROUTERS)):
+    if router_name not in ROUTERS:
+        raise AppException(f"Unknown router in api.routers: {router_name}")
+    module_name, attribute, options = ROUTERS[router_name]
+    with STARTUP.stage("import", module_name):
+        router_module = importlib.import_module(module_name)
+    app.include_router(getattr(router_module, attribute), **options)
 
-from fastapi.staticfiles import StaticFiles
-app.mount("/static", StaticFiles(directory="responses"), name="static")
 
-# Static files (for TTS responses etc.)
-app.mount("/static", StaticFiles(directory="responses"), name="static")
+# Static files (for TTS responses etc.) — content-addressed TTS audio is served as immutable
+app.mount("/static", CachedStaticFiles(directory=get_tts_cache().directory), name="static")
 
 # Exception handlers
 app.add_exception_handler(AppException, app_exception_handler)
@@ -52,7 +107,57 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
 
+# Gauges read at scrape time
+CallbackGauge("voice_requests_in_flight", "Voice requests admitted by the voice executor.",
+              lambda: get_voice_executor().pending)
+CallbackGauge("speculative_retrieval_hit_rate", "Share of resolved speculations that were reused.",
+              lambda: SPECULATION_STATS.hit_rate)
+CallbackGauge("speculative_retrieval_launched", "Speculative retrievals started.",
+              lambda: SPECULATION_STATS.launched)
+CallbackGauge("speculative_retrieval_wasted_seconds", "Seconds spent on discarded speculative retrievals.",
+              lambda: SPECULATION_STATS.wasted_seconds)
+# Per-worker memory; PSS splits pages shared with the preloading parent (server.py)
+CallbackGauge("process_resident_memory_bytes", "Resident set size of this worker.",
+              lambda: read_memory().get("rss_bytes", 0))
+CallbackGauge("process_proportional_memory_bytes", "Proportional set size (PSS) of this worker.",
+              lambda: read_memory().get("pss_bytes", 0))
+CallbackGauge("app_ready", "1 once every warm-up component of this worker is ready.",
+              lambda: int(WARMUP.ready))
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/debug/startup", include_in_schema=False)
+def startup_profile():
+    """Import and lazy-initialization times of this worker."""
+    return STARTUP.report()
+
+
+@app.get("/live", include_in_schema=False)
+def live():
+    """Liveness: the process is up and serving, warm or not."""
+    return {"status": "alive", "pid": os.getpid(), "uptime_s": round(time.time() - STARTED_AT, 1)}
+
+
+@app.get("/ready", include_in_schema=False)
+def ready():
+    """Readiness: 200 once the model, index, DB and LLM are warm, 503 before."""
+    snapshot = WARMUP.snapshot()
+    if snapshot["ready"]:
+        return snapshot
+    return ORJSONResponse(snapshot, status_code=503, headers={"Retry-After": str(WARMUP_CONFIG.get("retry_interval_s", 10))})
+
+
 @app.get("/")
 def root():
     return {"message": "Ecommerce Chatbot API is running 🚀"}
+
+
+if API_CONFIG.get("startup_report", True):
+    STARTUP.log_report()
+
 #uvicorn main:app --reload --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -32,3 +32,19 @@ YOUR ANSWER (as a professional company representative):
 """
 
 
+
+
+# Offline per-product review summaries (ingestion/review_summaries.py)
+REVIEW_SUMMARY_PROMPT = """
+You summarize customer reviews of one product for a shopping assistant.
+
+PRODUCT: {title}
+REVIEWS (rating in brackets):
+{reviews}
+
+Reply with JSON only, no other text, in exactly this shape:
+{{"summary": "<one or two sentences on overall customer opinion>",
+  "pros": ["<short phrase>", "..."],
+  "cons": ["<short phrase>", "..."]}}
+Give at most 5 pros and 5 cons, each a few words, using only what the reviews say.
+"""
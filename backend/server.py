@@ -0,0 +1,222 @@
+# backend/server.py
+
+"""
+Preload-and-fork server.
+
+Running ``uvicorn --workers N`` makes every worker import the app and load
+its own copy of the embedding model and vector index, so memory grows
+linearly with the worker count. This server instead:
+
+1. imports the app and builds ChatbotServices (embedding model weights,
+   memory-mapped local index, LLM client) once in the parent,
+2. freezes the GC so collections in the workers don't write to (and
+   un-share) the preloaded objects,
+3. binds the listening socket and forks N workers that serve it with
+   uvicorn, sharing the parent's pages copy-on-write,
+4. supervises the workers (restarting any that die) and periodically
+   logs each worker's RSS / PSS / shared memory.
+
+POSIX only (uses fork). Services are only preloaded with
+``vectorstore.provider: local``: loading the memory-mapped index opens no
+sockets, and the LLM and chat-history clients connect lazily on their
+first request, which happens in the workers. With ``astradb``, building
+the vector store talks to Astra DB (collection setup, ``add_documents``),
+so the parent would hold keep-alive connections that every worker then
+shares. In that case only the app is imported before forking and each
+worker builds its own services.
+
+Usage (from backend/):
+    python server.py --workers 4 --port 5000
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Tokenizers/torch thread pools must not be started before fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+from config.setting import SERVER_CONFIG, VECTORSTORE_CONFIG
+from utils.exceptions import AppException
+from utils.logging import get_logger, shutdown_logging
+from utils.memory import read_memory, format_memory
+from utils.startup import STARTUP
+
+logger = get_logger(__name__)
+
+
+class PreforkServer:
+    """
+    Parent process that preloads the app and supervises forked workers.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        memory_report_interval (float): Seconds between memory reports (0 disables).
+    """
+
+    def __init__(self, host: str, port: int, workers: int, preload: bool = True, memory_report_interval: float = 60):
+        if not hasattr(os, "fork"):
+            raise AppException("Preload-and-fork mode needs a POSIX platform; use uvicorn directly instead")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.preload = preload
+        self.memory_report_interval = memory_report_interval
+        self.children: dict[int, int] = {}  # pid -> worker number
+        self._stopping = False
+        self._socket = None
+        self.app = None
+
+    # ========== PARENT ========== #
+    def load(self):
+        """Import the app and build the shared services before forking."""
+        with STARTUP.stage("import", "main"):
+            from main import app
+        self.app = app
+
+        provider = VECTORSTORE_CONFIG.get("provider", "astradb")
+        if self.preload and provider != "local":
+            logger.warning(
+                f"⚠️ Not preloading services: vectorstore.provider '{provider}' opens network connections "
+                "that forked workers would share; each worker initializes its own"
+            )
+        elif self.preload:
+            from services.chatbot_services import get_chatbot_service
+            try:
+                with STARTUP.stage("init", "preload"):
+                    get_chatbot_service()
+            except Exception as e:
+                # Workers will build their own copy on first use instead
+                logger.exception(f"❌ Preload failed, workers will initialize lazily: {e}")
+
+        logger.info(f"🧠 Parent after preload: {format_memory(read_memory())}")
+        gc.collect()
+        gc.freeze()
+
+    def bind(self):
+        self._socket = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.listen(2048)
+        self._socket.set_inheritable(True)
+        logger.info(f"🔌 Listening on {self.host}:{self.port} with {self.workers} workers")
+
+    def spawn(self, number: int):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(number)  # never returns
+        self.children[pid] = number
+        logger.info(f"🍴 Worker {number} started (pid {pid})")
+
+    def run(self):
+        self.load()
+        self.bind()
+        for number in range(self.workers):
+            self.spawn(number)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        last_report = time.monotonic()
+        while self.children:
+            self._reap()
+            if self.memory_report_interval and time.monotonic() - last_report >= self.memory_report_interval:
+                self.report_memory()
+                last_report = time.monotonic()
+            time.sleep(0.5)
+        logger.info("👋 All workers exited")
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            number = self.children.pop(pid, None)
+            if number is None:
+                continue
+            if not self._stopping:
+                logger.warning(f"⚠️ Worker {number} (pid {pid}) exited with status {status}, restarting")
+                self.spawn(number)
+
+    def _handle_stop(self, signum, frame):
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(f"🛑 Received signal {signum}, stopping workers")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def report_memory(self) -> list[dict]:
+        """Log and return RSS/PSS/shared memory of the parent and every worker."""
+        rows = [{"role": "parent", "pid": os.getpid(), **read_memory()}]
+        rows += [{"role": f"worker-{n}", "pid": pid, **read_memory(pid)} for pid, n in sorted(self.children.items())]
+        for row in rows:
+            logger.info(f"🧮 {row['role']:<9} pid={row['pid']:<7} {format_memory(row)}")
+        total_pss = sum(row.get("pss_bytes", 0) for row in rows)
+        logger.info(f"🧮 total pss={total_pss / 2**20:.1f}MB across {len(rows)} processes")
+        return rows
+
+    # ========== WORKER ========== #
+    def _run_worker(self, number: int):
+        import uvicorn
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        self._watch_parent(os.getppid())
+        status = 0
+        try:
+            logger.info(f"👷 Worker {number} serving (pid {os.getpid()}, {format_memory(read_memory())})")
+            config = uvicorn.Config(self.app, log_config=None, timeout_graceful_shutdown=10)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except Exception as e:
+            logger.exception(f"❌ Worker {number} crashed: {e}")
+            status = 1
+        finally:
+            shutdown_logging()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+
+    @staticmethod
+    def _watch_parent(parent_pid: int):
+        """Stop this worker gracefully if the parent dies (e.g. SIGKILL) instead of orphaning it."""
+        def _watch():
+            while os.getppid() == parent_pid:
+                time.sleep(1)
+            logger.warning(f"⚠️ Parent {parent_pid} exited, stopping worker {os.getpid()}")
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        threading.Thread(target=_watch, name="parent-watchdog", daemon=True).start()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Preload the app once, then fork uvicorn workers.")
+    parser.add_argument("--host", default=SERVER_CONFIG.get("host", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=SERVER_CONFIG.get("port", 5000))
+    parser.add_argument("--workers", type=int, default=SERVER_CONFIG.get("workers", 4))
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=SERVER_CONFIG.get("preload", True))
+    parser.add_argument("--memory-report-interval", type=float, default=SERVER_CONFIG.get("memory_report_interval_s", 60))
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    PreforkServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        preload=args.preload,
+        memory_report_interval=args.memory_report_interval,
+    ).run()
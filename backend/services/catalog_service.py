@@ -0,0 +1,223 @@
+# backend/services/catalog_service.py
+
+import re
+import threading
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from config.setting import CATALOG_CONFIG, CATALOG_DIR
+from ingestion.catalog import ProductCatalog
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# phrase -> (column, ascending); longer phrases are matched first
+SORT_PHRASES = {
+    "most expensive": ("price", False),
+    "least expensive": ("price", True),
+    "highest price": ("price", False),
+    "lowest price": ("price", True),
+    "priciest": ("price", False),
+    "cheapest": ("price", True),
+    "cheap": ("price", True),
+    "budget": ("price", True),
+    "top rated": ("rating", False),
+    "best rated": ("rating", False),
+    "highest rated": ("rating", False),
+    "lowest rated": ("rating", True),
+    "worst rated": ("rating", True),
+    "most reviewed": ("rating_count", False),
+    "most popular": ("rating_count", False),
+}
+_SORT_PATTERN = re.compile(r"\b(" + "|".join(sorted(map(re.escape, SORT_PHRASES), key=len, reverse=True)) + r")\b")
+_MAX_PRICE = re.compile(r"\b(?:under|below|less than|cheaper than|up to|within)\s*(?:\$|rs\.?\s*|₹)?\s*(\d+(?:\.\d+)?)")
+_MIN_PRICE = re.compile(r"\b(?:over|above|more than|at least)\s*(?:\$|rs\.?\s*|₹)?\s*(\d+(?:\.\d+)?)")
+_COUNT = re.compile(r"\b(?:top|first|best)\s+(\d{1,2})\b|\b(\d{1,2})\s+(?:cheapest|best|top|most|products|items)\b")
+_CATEGORIES_QUESTION = re.compile(r"\b(?:what|which|list|show)\b.*\bcategor(?:y|ies)\b")
+
+
+class CatalogService:
+    """
+    Structured lookups over the ``ProductCatalog`` for the retriever.
+
+    ``parse()`` turns questions such as "3 cheapest items in electronics
+    under 100" into a filter/sort spec, and ``context_for()`` renders the
+    result as one short document that is placed ahead of the
+    similarity-search hits, so the LLM gets exact prices and ratings
+    instead of whatever three reviews happened to be nearest.
+    """
+
+    def __init__(self, catalog: ProductCatalog, category_aliases: Optional[dict] = None, top_n: int = 5):
+        self.catalog = catalog
+        self.top_n = top_n
+        # lower-cased phrase -> catalog category, longest first
+        names = {category.lower(): category for category in catalog.categories}
+        for alias, category in (category_aliases or {}).items():
+            if category in catalog.categories:
+                names[alias.lower()] = category
+        self._category_names = sorted(names.items(), key=lambda item: -len(item[0]))
+
+    def match_category(self, text: str) -> Optional[str]:
+        match = self._search_category(text)
+        return match[0] if match else None
+
+    def _search_category(self, text: str) -> Optional[tuple]:
+        for phrase, category in self._category_names:
+            match = re.search(r"(?<![\w'])" + re.escape(phrase) + r"(?![\w'])", text)
+            if match:
+                return category, match
+        return None
+
+    def parse(self, query: str) -> Optional[dict]:
+        """
+        Structured spec of a catalog question, or None if the query is not one.
+
+        Returns:
+            dict: ``kind`` ("categories" or "products"), and for products
+            ``category``, ``min_price``, ``max_price``, ``sort``, ``ascending``, ``n``.
+            ``coverage`` is the share of the query's words the spec explains and
+            ``unexplained`` lists the content words it does not; "cheapest
+            headphones with good bass" parses, but leaves "headphones", "good"
+            and "bass" unexplained.
+        """
+        text = query.lower()
+        categories_question = _CATEGORIES_QUESTION.search(text)
+        if categories_question:
+            return {"kind": "categories", **_explain(text, [categories_question])}
+
+        sort = _SORT_PATTERN.search(text)
+        max_price = _MAX_PRICE.search(text)
+        min_price = _MIN_PRICE.search(text)
+        if not (sort or max_price or min_price):
+            return None
+
+        column, ascending = SORT_PHRASES[sort.group(1)] if sort else ("rating", False)
+        count = _COUNT.search(text)
+        category = self._search_category(text)
+        return {
+            "kind": "products",
+            "category": category[0] if category else None,
+            "min_price": float(min_price.group(1)) if min_price else None,
+            "max_price": float(max_price.group(1)) if max_price else None,
+            "sort": column,
+            "ascending": ascending,
+            "n": min(int(count.group(1) or count.group(2)), 20) if count else self.top_n,
+            **_explain(text, [sort, max_price, min_price, count, category and category[1]]),
+        }
+
+    def products(self, spec: dict) -> list[dict]:
+        mask = self.catalog.mask(category=spec["category"], min_price=spec["min_price"], max_price=spec["max_price"])
+        return self.catalog.rows(self.catalog.top(spec["sort"], spec["n"], spec["ascending"], mask=mask))
+
+    def categories(self) -> dict:
+        return self.catalog.aggregate()
+
+    def context_for(self, query: str) -> Optional[Document]:
+        """Compact catalog document answering a structured question, or None."""
+        spec = self.parse(query)
+        if spec is None:
+            return None
+
+        if spec["kind"] == "categories":
+            lines = ["Product catalog categories:"] + [
+                f"- {category}: {stats['count']} products, ${stats['min_price']}-${stats['max_price']}, "
+                f"avg rating {stats['mean_rating']}"
+                for category, stats in self.categories().items()
+            ]
+        else:
+            rows = self.products(spec)
+            lines = [f"Product catalog, {describe(spec)}:"] + [
+                f"{rank}. {row['title']} ({row['category']}) - ${row['price']}, "
+                f"rating {row['rating']} from {row['rating_count']} reviews"
+                for rank, row in enumerate(rows, start=1)
+            ]
+            if not rows:
+                lines.append("No matching products.")
+        return Document(page_content="\n".join(lines), metadata={"source": "catalog", **spec})
+
+
+# Words that carry no meaning of their own in a catalog question
+FILLER_WORDS = {
+    "a", "an", "the", "is", "are", "what", "whats", "what's", "which", "who", "show", "me", "list", "give",
+    "find", "tell", "your", "you", "do", "does", "have", "has", "got", "in", "of", "for", "from", "on", "with",
+    "and", "or", "item", "items", "product", "products", "thing", "things", "one", "ones", "any", "some",
+    "all", "please", "can", "could", "i", "we", "get", "buy", "available", "sell", "store", "shop", "category",
+    "categories", "here", "there", "now", "currently", "price", "prices", "rated", "rating", "$", "rs",
+}
+
+
+def _explain(text: str, matches: list) -> dict:
+    """
+    ``coverage``: share of the words in ``text`` that are filler or inside
+    one of ``matches``; ``unexplained``: the other words, in order.
+    """
+    spans = [match.span() for match in matches if match]
+    words = list(re.finditer(r"[\w$'₹]+", text))
+    unexplained = [
+        word.group(0) for word in words
+        if word.group(0) not in FILLER_WORDS
+        and not any(start <= word.start() and word.end() <= end for start, end in spans)
+    ]
+    return {
+        "coverage": round((len(words) - len(unexplained)) / len(words), 2) if words else 0.0,
+        "unexplained": unexplained,
+    }
+
+
+def describe(spec: dict) -> str:
+    """Human-readable summary of a products spec, e.g. "3 cheapest products in electronics under $100"."""
+    labels = {
+        ("price", True): "cheapest",
+        ("price", False): "most expensive",
+        ("rating", False): "top rated",
+        ("rating", True): "lowest rated",
+        ("rating_count", False): "most reviewed",
+        ("rating_count", True): "least reviewed",
+    }
+    parts = [f"{spec['n']} {labels[(spec['sort'], spec['ascending'])]} products"]
+    if spec["category"]:
+        parts.append(f"in {spec['category']}")
+    if spec["min_price"] is not None:
+        parts.append(f"over ${spec['min_price']:g}")
+    if spec["max_price"] is not None:
+        parts.append(f"under ${spec['max_price']:g}")
+    return " ".join(parts)
+
+
+_catalog_lock = threading.Lock()
+_catalog_service: Optional[CatalogService] = None
+_catalog_missing_logged = False
+
+
+def get_catalog_service() -> Optional[CatalogService]:
+    """
+    Process-wide catalog service, loaded on first use from the catalog
+    written at ingestion. None when disabled or not built yet; a miss is
+    not cached, so a worker started before ingestion finished picks the
+    catalog up on a later call.
+    """
+    global _catalog_service
+    if not CATALOG_CONFIG.get("enabled", True):
+        return None
+    if _catalog_service is None:
+        with _catalog_lock:
+            if _catalog_service is None:
+                _catalog_service = _load_catalog_service()
+    return _catalog_service
+
+
+def _load_catalog_service() -> Optional[CatalogService]:
+    global _catalog_missing_logged
+    if not ProductCatalog.exists(CATALOG_DIR):
+        if not _catalog_missing_logged:
+            logger.warning(f"⚠️ Product catalog not found in {CATALOG_DIR}; run ingestion to build it")
+            _catalog_missing_logged = True
+        return None
+    catalog = ProductCatalog.load(CATALOG_DIR)
+    logger.info(f"🗂️ Loaded product catalog: {len(catalog)} products")
+    return CatalogService(
+        catalog,
+        category_aliases=CATALOG_CONFIG.get("category_aliases", {}),
+        top_n=CATALOG_CONFIG.get("top_n", 5),
+    )
@@ -1,8 +1,13 @@
 # backend/services/chatbot_services.py
 
+import threading
+from functools import lru_cache
+from typing import Iterator
 from services.retreiver import RetrieverServices
 from utils.logging import get_logger
 from utils.exceptions import AppException
+from utils.tracing import span
+from utils.startup import STARTUP
 
 logger = get_logger(__name__)
 
@@ -12,11 +17,12 @@ class ChatbotServices:
     product-related information and managing user sessions.
     """
 
-    def __init__(self):
+    def __init__(self, retriever: RetrieverServices = None):
         # Initialize retriever with history support
-        self.retriever = RetrieverServices()
+        self.retriever = retriever if retriever is not None else RetrieverServices()
 
-    def get_product_info(self, query: str, session_id: str = "default") -> dict:
+    @span("chatbot.get_product_info")
+    def get_product_info(self, query: str, session_id: str = "default", context: list = None) -> dict:
         """
         Generate chatbot response for a given customer query while
         maintaining session-based chat history.
@@ -24,12 +30,13 @@ class ChatbotServices:
         Args:
             query (str): Customer's product-related question.
             session_id (str): Unique ID to maintain chat history.
+            context (list, optional): Pre-retrieved documents; retrieved if omitted.
 
         Returns:
             dict: Contains query and chatbot's answer.
         """
         try:
-            response = self.retriever.get_answer(query, session_id=session_id)
+            response = self.retriever.get_answer(query, session_id=session_id, context=context)
             logger.info(f"Generated response for query='{query}' in session='{session_id}'")
 
             return {
@@ -43,3 +50,43 @@ class ChatbotServices:
         except Exception as e:
             logger.exception(f"Unexpected error: {str(e)}")
             raise AppException("Something went wrong while generating response", 500)
+
+    def stream_product_info(self, query: str, session_id: str = "default", context: list = None) -> Iterator[str]:
+        """
+        Stream the chatbot answer for a query as it is generated.
+
+        Args:
+            query (str): Customer's product-related question.
+            session_id (str): Unique ID to maintain chat history.
+            context (list, optional): Pre-retrieved documents; retrieved if omitted.
+
+        Yields:
+            str: Answer text chunks in order.
+        """
+        try:
+            yield from self.retriever.stream_answer(query, session_id=session_id, context=context)
+            logger.info(f"Streamed response for query='{query}' in session='{session_id}'")
+        except Exception as e:
+            logger.exception(f"Unexpected error while streaming: {str(e)}")
+            raise AppException("Something went wrong while generating response", 500)
+
+
+_chatbot_lock = threading.Lock()
+
+
+def get_chatbot_service() -> ChatbotServices:
+    """
+    Process-wide ChatbotServices, built on first use.
+
+    Construction loads the LLM client, the vector store and the DB
+    connection, so it is done once per worker (timed in the startup
+    profile) instead of at import time or per request.
+    """
+    with _chatbot_lock:
+        return _build_chatbot_service()
+
+
+@lru_cache(maxsize=1)
+def _build_chatbot_service() -> ChatbotServices:
+    with STARTUP.stage("init", "ChatbotServices"):
+        return ChatbotServices()
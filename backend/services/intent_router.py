@@ -0,0 +1,214 @@
+# backend/services/intent_router.py
+
+"""
+Intent router in front of the retrieval + LLM chain.
+
+Greetings, thanks, "what can you do", "what categories do you have" and
+price/rating lookups don't need a generated answer, yet each one used to
+cost a retrieval and a full LLM call. The router classifies each query
+in two cheap steps:
+
+1. Keyword rules: whole-message patterns for small talk, and the catalog
+   parser for structured lookups. A catalog question is only answered
+   from the catalog when the parsed spec explains every content word
+   (anything not in ``FILLER_WORDS``). "cheapest headphones" leaves
+   "headphones" unexplained when no category matches it, so it goes to
+   the LLM, which still gets the catalog document as context.
+2. Nearest centroid: the query embedding, computed once and reused for
+   retrieval, is compared with the mean embedding of each intent's
+   example utterances from configuration.yaml.
+
+Intents with a template (or a catalog answer) whose confidence reaches
+the threshold are answered directly. Everything else, including the
+``product_qa`` intent, goes to the LLM chain as before.
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from utils.logging import get_logger
+from utils.metrics import Counter, Histogram
+from services.catalog_service import CatalogService, describe
+
+logger = get_logger(__name__)
+
+INTENT_ROUTED = Counter(
+    "intent_routed",
+    "Chat turns by detected intent, classification method and route (template or llm).",
+    labelnames=("intent", "method", "route"),
+)
+INTENT_CONFIDENCE = Histogram(
+    "intent_confidence",
+    "Confidence of the best intent per chat turn.",
+    labelnames=("method",),
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+INTENT_ROUTER_LATENCY = Histogram(
+    "intent_router_seconds",
+    "Time spent classifying a chat turn (excluding the shared query embedding).",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+)
+
+# Whole-message small talk; anything longer goes on to the other checks
+RULES = {
+    "greeting": re.compile(r"^\s*(?:hi+|hello+|hey+|hiya|yo|namaste|good\s+(?:morning|afternoon|evening))(?:\s+(?:there|bot|team))?\s*[!.?]*\s*$"),
+    "thanks": re.compile(r"^\s*(?:thanks?(?:\s+you)?|thank\s+you(?:\s+so\s+much)?|thx|ty|great,?\s+thanks?)\s*[!.]*\s*$"),
+    "goodbye": re.compile(r"^\s*(?:bye+|goodbye|see\s+you(?:\s+later)?|good\s*night)\s*[!.]*\s*$"),
+    "help": re.compile(r"^\s*(?:help|what\s+can\s+you\s+do|how\s+(?:can|do)\s+you\s+help(?:\s+me)?|who\s+are\s+you)\s*[?!.]*\s*$"),
+}
+
+
+class Route:
+    """
+    Classification of one query.
+
+    Attributes:
+        intent (str): Detected intent ("product_qa" when nothing else matched).
+        confidence (float): Rule coverage or centroid cosine similarity.
+        method (str): "rule", "centroid" or "none".
+        answer (str | None): Templated answer; None means "use the LLM".
+        query_vector (list | None): Query embedding, reusable for retrieval.
+    """
+
+    def __init__(self, intent: str, confidence: float, method: str, answer: Optional[str] = None, query_vector=None):
+        self.intent = intent
+        self.confidence = confidence
+        self.method = method
+        self.answer = answer
+        self.query_vector = query_vector
+
+    def __repr__(self):
+        route = "template" if self.answer is not None else "llm"
+        return f"Route({self.intent}, {self.method}, {self.confidence:.2f} -> {route})"
+
+
+class IntentRouter:
+    """
+    Keyword-rule plus nearest-centroid intent classifier.
+
+    Attributes:
+        threshold (float): Minimum centroid cosine similarity to answer from a template.
+    """
+
+    def __init__(self, embeddings, get_catalog: Callable[[], Optional[CatalogService]], config: dict):
+        self.embeddings = embeddings
+        self.get_catalog = get_catalog
+        self.threshold = config.get("threshold", 0.75)
+        self.templates = config.get("templates", {})
+        self.exemplars = config.get("exemplars", {})
+        self._centroids = None  # (intent names, (n_intents, dim) normalized matrix)
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Embed the example utterances now instead of on the first query."""
+        if self.exemplars and self.embeddings is not None:
+            self._get_centroids()
+
+    # ========== CLASSIFICATION ========== #
+    def route(self, query: str, embed: bool = True) -> Route:
+        """
+        Classify ``query`` and build the templated answer when confident.
+
+        Args:
+            query (str): User message.
+            embed (bool): Allow the centroid step (embeds the query). Off when
+                the caller already has retrieval context for the query.
+        """
+        start = time.perf_counter()
+        route = self._route_rules(query)
+        classify_seconds = time.perf_counter() - start
+
+        if route is None and embed and self.exemplars and self.embeddings is not None:
+            # The embedding is shared with retrieval, so it is not counted as router time
+            vector = self.embeddings.embed_query(query)
+            start = time.perf_counter()
+            route = self._route_centroid(vector)
+            classify_seconds += time.perf_counter() - start
+        if route is None:
+            route = Route("product_qa", 0.0, "none")
+
+        INTENT_ROUTER_LATENCY.observe(classify_seconds)
+        INTENT_CONFIDENCE.observe(route.confidence, method=route.method)
+        INTENT_ROUTED.inc(intent=route.intent, method=route.method, route="template" if route.answer is not None else "llm")
+        logger.info(f"🧭 {route} for query='{query[:80]}'")
+        return route
+
+    def _route_rules(self, query: str) -> Optional[Route]:
+        text = query.strip().lower()
+        for intent, pattern in RULES.items():
+            if pattern.match(text):
+                return Route(intent, 1.0, "rule", answer=self._template(intent))
+
+        catalog = self.get_catalog()
+        spec = catalog.parse(query) if catalog is not None else None
+        if spec is None:
+            return None
+        intent = "categories" if spec["kind"] == "categories" else "catalog_lookup"
+        # Any unexplained content word ("headphones", "this bag") may change the answer: leave it to the LLM
+        answer = self._catalog_answer(catalog, spec) if not spec["unexplained"] else None
+        return Route(intent, spec["coverage"], "rule", answer=answer)
+
+    def _route_centroid(self, vector) -> Optional[Route]:
+        intents, centroids = self._get_centroids()
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not len(intents) or norm == 0:
+            return None
+        scores = centroids @ (query / norm)
+        best = int(np.argmax(scores))
+        intent, confidence = intents[best], round(float(scores[best]), 3)
+
+        answer = None
+        if confidence >= self.threshold:
+            if intent == "categories":
+                catalog = self.get_catalog()
+                answer = self._catalog_answer(catalog, {"kind": "categories"}) if catalog is not None else None
+            else:
+                answer = self._template(intent)
+        return Route(intent, confidence, "centroid", answer=answer, query_vector=vector)
+
+    def _get_centroids(self):
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    intents, rows = [], []
+                    for intent, examples in self.exemplars.items():
+                        if not examples:
+                            continue
+                        vectors = np.asarray(self.embeddings.embed_documents(list(examples)), dtype=np.float32)
+                        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+                        centroid = vectors.mean(axis=0)
+                        rows.append(centroid / max(float(np.linalg.norm(centroid)), 1e-12))
+                        intents.append(intent)
+                    self._centroids = (intents, np.vstack(rows) if rows else np.zeros((0, 0), dtype=np.float32))
+                    logger.info(f"🧭 Intent centroids ready: {intents}")
+        return self._centroids
+
+    # ========== ANSWERS ========== #
+    def _template(self, intent: str) -> Optional[str]:
+        return self.templates.get(intent)
+
+    @staticmethod
+    def _catalog_answer(catalog: CatalogService, spec: dict) -> str:
+        if spec["kind"] == "categories":
+            stats = catalog.categories()
+            lines = [f"We currently have {len(stats)} categories:"] + [
+                f"- {category.title()}: {s['count']} products from ${s['min_price']} to ${s['max_price']} "
+                f"(average rating {s['mean_rating']}/5)"
+                for category, s in stats.items()
+            ]
+            lines.append("Ask me for the cheapest or top rated products in any of them!")
+            return "\n".join(lines)
+
+        rows = catalog.products(spec)
+        if not rows:
+            return f"I couldn't find any products matching that ({describe(spec)}). Try a different category or price range."
+        lines = [f"Here are the {describe(spec)}:"] + [
+            f"{rank}. {row['title']} - ${row['price']} (rated {row['rating']}/5 by {row['rating_count']} customers)"
+            for rank, row in enumerate(rows, start=1)
+        ]
+        return "\n".join(lines)
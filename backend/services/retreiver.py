@@ -1,15 +1,47 @@
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.chat_history import InMemoryChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain.schema.runnable import RunnablePassthrough
-from langchain.schema.output_parser import StrOutputParser
-from langchain.prompts import ChatPromptTemplate
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
 import os
-from ingestion.data_ingestion import DataIngestion
-from config.setting import get_llm_config
+import threading
+from typing import Iterator
+from config.setting import get_llm_config, VECTORSTORE_CONFIG, INTENT_ROUTER_CONFIG, REVIEW_SUMMARY_CONFIG
 from prompt_library.system_prompt import PRODUCT_BOT_PROMPT
+from services.catalog_service import get_catalog_service
+from services.intent_router import IntentRouter
+from services.review_summary_service import get_review_summaries, summary_document
 from datetime import datetime
+import time
+from utils.metrics import STAGE_LATENCY, time_stage
+from utils.logging import get_logger
+from utils.tracing import current_trace, record_span, span
+
+logger = get_logger(__name__)
+
+
+class LLMLatencyCallback(BaseCallbackHandler):
+    """Records LLM call latency (invoke and stream) in the stage histogram and request trace."""
+
+    def __init__(self):
+        self._starts = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), current_trace())
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), current_trace())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._starts.pop(run_id, None)
+        if started is not None:
+            start, trace = started
+            end = time.perf_counter()
+            STAGE_LATENCY.observe(end - start, stage="llm")
+            record_span("llm", start, end, trace=trace)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._starts.pop(run_id, None)
 
 
 class RetrieverServices:
@@ -17,17 +49,29 @@ class RetrieverServices:
     Chatbot Retriever Service for Ecommerce queries with AstraDB chat history persistence.
     """
 
-    def __init__(self, provider: str = "groq"):
+    def __init__(self, provider: str = "groq", llm=None, vectorstore=None, db=None, router=None):
+        """
+        Args:
+            provider (str): "groq" or "openai" (ignored when ``llm`` is given).
+            llm: Optional pre-built chat model (e.g. a local stand-in).
+            vectorstore: Optional pre-built vector store; runs ingestion if omitted.
+            db: Optional database handle for chat history; Astra DB if omitted.
+            router: Optional IntentRouter; built from intent_router config if omitted.
+        """
         llm_config = get_llm_config(provider)
 
-        # Initialize LLM
-        if provider == "groq":
+        # Initialize LLM (provider SDKs are imported only when used)
+        if llm is not None:
+            self.llm = llm
+        elif provider == "groq":
+            from langchain_groq import ChatGroq
             self.llm = ChatGroq(
                 api_key=os.getenv("GROQ_API_KEY"),
                 model=llm_config.get("model", "llama-3.1-70b"),
                 temperature=llm_config.get("temperature", 0.2),
             )
         elif provider == "openai":
+            from langchain_openai import ChatOpenAI
             self.llm = ChatOpenAI(
                 api_key=os.getenv("OPENAI_API_KEY"),
                 model=llm_config.get("model", "gpt-4"),
@@ -35,13 +79,22 @@ class RetrieverServices:
             )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+        self.llm = self.llm.with_config(callbacks=[LLMLatencyCallback()])
+
+        if vectorstore is None or db is None:
+            from ingestion.data_ingestion import DataIngestion
 
         # Vector retriever (for product data)
-        vstore = DataIngestion().run()
-        self.retriever = vstore.as_retriever(search_type="similarity", search_kwargs={"k": 3})
+        vstore = vectorstore if vectorstore is not None else DataIngestion().run()
+        self.retriever = vstore.as_retriever(search_type="similarity", search_kwargs={"k": VECTORSTORE_CONFIG.get("top_k", 3)})
 
         # Astra DB connection for chat history
-        self.db = DataIngestion().get_astra_db()
+        self.db = db if db is not None else DataIngestion().get_astra_db()
+
+        # Intent router: small talk and catalog lookups are answered without the LLM
+        if router is None and INTENT_ROUTER_CONFIG.get("enabled", True):
+            router = IntentRouter(vstore.embeddings, get_catalog_service, INTENT_ROUTER_CONFIG)
+        self.router = router
 
         # Prompt template for conversation
         self.prompt = ChatPromptTemplate.from_messages([
@@ -49,11 +102,17 @@ class RetrieverServices:
             ("human", "{question}")
         ])
 
-        # Core chain logic
+        # Histories kept in memory for long-lived sessions (see pin_session);
+        # the service is shared, so each pin is counted per session_id
+        self._pinned_histories = {}
+        self._pin_counts = {}
+        self._pin_lock = threading.Lock()
+
+        # Core chain logic — callers may pass pre-retrieved documents as "context"
         base_chain = (
             {
-                "context": lambda x: self.retriever.invoke(x["question"]),
-                "question": RunnablePassthrough(),
+                "context": lambda x: x["context"] if x.get("context") is not None else self.retrieve(x["question"]),
+                "question": lambda x: {k: v for k, v in x.items() if k != "context"},
             }
             | self.prompt
             | self.llm
@@ -68,9 +127,114 @@ class RetrieverServices:
             history_messages_key="history",
         )
 
+    # ========== RETRIEVAL ========== #
+    def retrieve(self, query: str, query_vector: list = None) -> list:
+        """
+        Return product documents relevant to the query (catalog summary first, if any).
+
+        Args:
+            query (str): User question.
+            query_vector (list, optional): Query embedding already computed
+                (by the intent router); searched directly instead of re-embedding.
+        """
+        with time_stage("retrieval"):
+            if query_vector is not None:
+                docs = self.retriever.vectorstore.similarity_search_by_vector(
+                    query_vector, k=self.retriever.search_kwargs.get("k", 3)
+                )
+            else:
+                docs = self.retriever.invoke(query)
+        return self._with_catalog_context(query, self._with_review_summaries(docs))
+
+    def _with_review_summaries(self, docs: list) -> list:
+        """
+        Put each retrieved product's review summary (built offline) in place
+        of its raw reviews, keeping the ``keep_reviews`` best-matching ones.
+        """
+        summaries = get_review_summaries()
+        if not summaries:
+            return docs
+        keep = REVIEW_SUMMARY_CONFIG.get("keep_reviews", 0)
+        result, kept = [], {}
+        for doc in docs:
+            summary = summaries.get(str(doc.metadata.get("product_id")))
+            if summary is None:
+                result.append(doc)
+                continue
+            product_id = summary["product_id"]
+            if product_id not in kept:
+                kept[product_id] = 0
+                result.append(summary_document(summary))
+            if kept[product_id] < keep:
+                kept[product_id] += 1
+                result.append(doc)
+        return result
+
+    def _with_catalog_context(self, query: str, docs: list) -> list:
+        catalog = get_catalog_service()
+        if catalog is None:
+            return docs
+        with time_stage("catalog"):
+            summary = catalog.context_for(query)
+        return [summary] + docs if summary is not None else docs
+
+    def retrieve_batch(self, queries: list[str], batch_size: int = 64) -> list[list]:
+        """
+        Return product documents for many queries at once.
+
+        Queries are embedded in batches (one forward pass per ``batch_size``
+        queries instead of one per query). The top-k search is a single
+        matrix product on the local index; other vector stores are searched
+        by vector, one query at a time.
+        """
+        vectorstore = self.retriever.vectorstore
+        k = self.retriever.search_kwargs.get("k", 3)
+        with time_stage("embedding_batch"):
+            vectors = []
+            for start in range(0, len(queries), batch_size):
+                # MiniLM-style models embed queries and documents the same way
+                vectors.extend(vectorstore.embeddings.embed_documents(queries[start:start + batch_size]))
+        with time_stage("retrieval_batch"):
+            if hasattr(vectorstore, "similarity_search_batch_by_vector"):
+                results = vectorstore.similarity_search_batch_by_vector(vectors, k=k)
+            else:
+                results = [vectorstore.similarity_search_by_vector(vector, k=k) for vector in vectors]
+        return [self._with_catalog_context(query, self._with_review_summaries(docs)) for query, docs in zip(queries, results)]
+
     # ========== CHAT MEMORY HANDLING ========== #
+    def pin_session(self, session_id: str):
+        """
+        Load a session's history once and keep it in memory until every
+        ``pin_session`` call for it has been matched by ``unpin_session``
+        (e.g. two WebSocket connections on the same session).
+        """
+        with self._pin_lock:
+            if session_id in self._pinned_histories:
+                self._pin_counts[session_id] += 1
+                return
+        history = self._build_session_history(session_id)
+        with self._pin_lock:
+            self._pinned_histories.setdefault(session_id, history)
+            self._pin_counts[session_id] = self._pin_counts.get(session_id, 0) + 1
+
+    def unpin_session(self, session_id: str):
+        with self._pin_lock:
+            count = self._pin_counts.get(session_id, 0) - 1
+            if count > 0:
+                self._pin_counts[session_id] = count
+                return
+            self._pin_counts.pop(session_id, None)
+            self._pinned_histories.pop(session_id, None)
+
     def _get_session_history(self, session_id: str):
         """Retrieve chat history for a given session."""
+        pinned = self._pinned_histories.get(session_id)
+        if pinned is not None:
+            return pinned
+        return self._build_session_history(session_id)
+
+    def _build_session_history(self, session_id: str):
+        """Build an in-memory history from the messages stored in Astra DB."""
         messages = self._load_history_from_db(session_id)
         memory = InMemoryChatMessageHistory()
 
@@ -84,10 +248,11 @@ class RetrieverServices:
             elif "role" in msg and msg["role"] == "assistant":
                 memory.add_ai_message(msg.get("text", ""))
             else:
-                print(f"⚠️ Skipping malformed message: {msg}")
+                logger.warning(f"⚠️ Skipping malformed message: {msg}")
 
         return memory
 
+    @time_stage("history_load")
     def _load_history_from_db(self, session_id: str):
         """Fetch chat history from Astra DB for session_id."""
         try:
@@ -95,9 +260,10 @@ class RetrieverServices:
             docs = collection.find({"session_id": session_id})
             return sorted(docs, key=lambda x: x.get("timestamp", ""))
         except Exception as e:
-            print(f"[WARN] Could not load chat history: {e}")
+            logger.warning(f"⚠️ Could not load chat history: {e}")
             return []
 
+    @time_stage("history_save")
     def _save_message_to_db(self, session_id: str, user_msg: str, bot_msg: str):
         """Save chat messages to Astra DB."""
         try:
@@ -109,16 +275,45 @@ class RetrieverServices:
                 "timestamp": datetime.utcnow().isoformat(),
             }
             collection.insert_one(doc)
-            print(f"✅ Message inserted for session {session_id}")
+            logger.info(f"✅ Message inserted for session {session_id}")
+        except Exception as e:
+            logger.exception(f"❌ Failed to save chat message: {e}")
+
+    # ========== INTENT ROUTING ========== #
+    def _route(self, query: str, context: list = None):
+        """Classify the query; None when routing is disabled or fails (the LLM answers)."""
+        if self.router is None:
+            return None
+        try:
+            with time_stage("intent"):
+                # With caller-provided context there is no need to embed the query
+                return self.router.route(query, embed=context is None)
         except Exception as e:
-            print(f"[ERROR] Failed to save chat message: {e}")
+            logger.warning(f"⚠️ Intent routing failed, using the LLM: {e}")
+            return None
+
+    def _save_templated_turn(self, session_id: str, query: str, answer: str):
+        """Persist a turn answered without the LLM, in the DB and in a pinned history."""
+        pinned = self._pinned_histories.get(session_id)
+        if pinned is not None:
+            pinned.add_user_message(query)
+            pinned.add_ai_message(answer)
+        self._save_message_to_db(session_id, query, answer)
 
     # ========== MAIN CHAT FUNCTION ========== #
-    def get_answer(self, query: str, session_id: str = "default") -> str:
+    @span("retriever.get_answer")
+    def get_answer(self, query: str, session_id: str = "default", context: list = None) -> str:
         """Generate answer + persist conversation to Astra DB."""
         try:
+            route = self._route(query, context)
+            if route is not None and route.answer is not None:
+                self._save_templated_turn(session_id, query, route.answer)
+                return route.answer
+            if context is None and route is not None and route.query_vector is not None:
+                context = self.retrieve(query, query_vector=route.query_vector)
+
             response = self.chain_with_history.invoke(
-                {"question": query},
+                {"question": query, "context": context},
                 config={"configurable": {"session_id": session_id}},
             )
 
@@ -128,5 +323,32 @@ class RetrieverServices:
             return response
 
         except Exception as e:
-            print(f"[ERROR] Unexpected error in get_answer: {e}")
+            logger.exception(f"❌ Unexpected error in get_answer: {e}")
             return "⚠️ Sorry, something went wrong while processing your request."
+
+    def stream_answer(self, query: str, session_id: str = "default", context: list = None) -> Iterator[str]:
+        """Stream the answer token by token, then persist the full conversation turn."""
+        route = self._route(query, context)
+        if route is not None and route.answer is not None:
+            yield route.answer
+            self._save_templated_turn(session_id, query, route.answer)
+            return
+        if context is None and route is not None and route.query_vector is not None:
+            context = self.retrieve(query, query_vector=route.query_vector)
+
+        chunks = []
+        try:
+            with span("retriever.stream_answer"):
+                for chunk in self.chain_with_history.stream(
+                    {"question": query, "context": context},
+                    config={"configurable": {"session_id": session_id}},
+                ):
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            logger.exception(f"❌ Unexpected error in stream_answer: {e}")
+            if not chunks:
+                yield "⚠️ Sorry, something went wrong while processing your request."
+            return
+
+        self._save_message_to_db(session_id, query, "".join(chunks))
@@ -0,0 +1,58 @@
+# backend/services/review_summary_service.py
+
+import json
+import os
+from functools import lru_cache
+
+from langchain_core.documents import Document
+
+from config.setting import REVIEW_SUMMARY_CONFIG, REVIEW_SUMMARIES_PATH
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_summaries(path: str) -> dict[str, dict]:
+    """Summaries by product id; later lines win, a torn last line is ignored."""
+    summaries = {}
+    if not os.path.exists(path):
+        return summaries
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                summary = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            summaries[summary["product_id"]] = summary
+    return summaries
+
+
+@lru_cache(maxsize=1)
+def get_review_summaries() -> dict[str, dict]:
+    """
+    Process-wide summaries loaded from ``review_summaries.path`` (empty if
+    disabled or not built). Written offline by ``ingestion.review_summaries``.
+    """
+    if not REVIEW_SUMMARY_CONFIG.get("enabled", True):
+        return {}
+    summaries = read_summaries(REVIEW_SUMMARIES_PATH)
+    logger.info(f"🧾 Loaded {len(summaries)} review summaries from {REVIEW_SUMMARIES_PATH}")
+    return summaries
+
+
+def summary_document(summary: dict) -> Document:
+    """Compact document carrying one product's summary for the LLM context."""
+    sentiment = summary["sentiment"]
+    count = sentiment["review_count"] or 1
+    lines = [
+        f"{summary['title']} (review summary): {summary['summary']}",
+        f"Pros: {'; '.join(summary['pros']) or 'none mentioned'}",
+        f"Cons: {'; '.join(summary['cons']) or 'none mentioned'}",
+        f"Sentiment: {round(100 * sentiment['positive'] / count)}% positive / "
+        f"{round(100 * sentiment['neutral'] / count)}% neutral / {round(100 * sentiment['negative'] / count)}% negative "
+        f"of {sentiment['review_count']} reviews, avg {sentiment['average_rating']}/5",
+    ]
+    return Document(
+        page_content="\n".join(lines),
+        metadata={"source": "review_summary", "product_id": summary["product_id"], "product_name": summary["title"]},
+    )
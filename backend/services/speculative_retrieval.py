@@ -0,0 +1,186 @@
+# backend/services/speculative_retrieval.py
+
+import asyncio
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_tokens(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def token_overlap(a: str, b: str) -> float:
+    """Jaccard similarity of the word sets of two transcripts."""
+    tokens_a, tokens_b = set(normalize_tokens(a)), set(normalize_tokens(b))
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class SpeculationStats:
+    """Process-wide counters for speculative retrieval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.launched = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.wasted_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def record(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def hit_rate(self) -> float:
+        resolved = self.hits + self.misses
+        return self.hits / resolved if resolved else 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "launched": self.launched,
+                "hits": self.hits,
+                "misses": self.misses,
+                "wasted": self.wasted,
+                "wasted_seconds": round(self.wasted_seconds, 3),
+                "saved_seconds": round(self.saved_seconds, 3),
+                "hit_rate": round(self.hit_rate, 3),
+            }
+
+
+SPECULATION_STATS = SpeculationStats()
+
+
+class _Speculation:
+    def __init__(self, text: str, task: asyncio.Task):
+        self.text = text
+        self.task = task
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, _task):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class SpeculativeRetriever:
+    """
+    Run vector retrieval on partial transcripts while the user is still speaking.
+
+    A partial transcript is *stable* once the same words were reported
+    ``stable_partials`` times in a row; each stable text is retrieved once
+    in the background. When the final transcript arrives, the speculation
+    with the highest token overlap is reused if it reaches
+    ``similarity_threshold``; every other speculation is cancelled and
+    counted as wasted work.
+
+    Attributes:
+        retrieve (Callable[[str], list]): Blocking retrieval function.
+        similarity_threshold (float): Minimum Jaccard overlap for reuse.
+        stable_partials (int): Identical partials required before speculating.
+        max_inflight (int): Maximum speculations kept per utterance.
+    """
+
+    def __init__(
+        self,
+        retrieve: Callable[[str], list],
+        similarity_threshold: float = 0.8,
+        stable_partials: int = 2,
+        max_inflight: int = 2,
+        stats: SpeculationStats = SPECULATION_STATS,
+    ):
+        self.retrieve = retrieve
+        self.similarity_threshold = similarity_threshold
+        self.stable_partials = stable_partials
+        self.max_inflight = max_inflight
+        self.stats = stats
+        self._speculations: dict[str, _Speculation] = {}
+        self._last_partial: Optional[str] = None
+        self._repeats = 0
+
+    def on_partial(self, text: str):
+        """Feed a partial transcript; may launch a background retrieval."""
+        key = " ".join(normalize_tokens(text))
+        if not key:
+            return
+
+        self._repeats = self._repeats + 1 if key == self._last_partial else 1
+        self._last_partial = key
+        if self._repeats < self.stable_partials or key in self._speculations:
+            return
+
+        if len(self._speculations) >= self.max_inflight:
+            # keep the newest speculations, they are closest to the final transcript
+            oldest = next(iter(self._speculations))
+            self._discard(self._speculations.pop(oldest))
+
+        task = asyncio.ensure_future(run_in_threadpool(self.retrieve, text))
+        self._speculations[key] = _Speculation(text, task)
+        self.stats.record(launched=1)
+        logger.info(f"Speculative retrieval launched for partial '{text}'")
+
+    async def resolve(self, final_text: str) -> Optional[list]:
+        """
+        Return speculated documents for the final transcript, or None.
+
+        Resets the speculator for the next utterance either way.
+        """
+        speculations, self._speculations = self._speculations, {}
+        self._last_partial, self._repeats = None, 0
+        if not speculations:
+            return None
+
+        best_key, best_score = None, 0.0
+        for key, speculation in speculations.items():
+            score = token_overlap(speculation.text, final_text)
+            if score > best_score:
+                best_key, best_score = key, score
+
+        for key, speculation in speculations.items():
+            if key != best_key or best_score < self.similarity_threshold:
+                self._discard(speculation)
+
+        if best_key is None or best_score < self.similarity_threshold:
+            self.stats.record(misses=1)
+            return None
+
+        speculation = speculations[best_key]
+        already_done = speculation.task.done()
+        try:
+            docs = await speculation.task
+        except Exception as e:
+            logger.warning(f"Speculative retrieval failed, retrieving again: {e}")
+            self.stats.record(misses=1)
+            return None
+
+        self.stats.record(hits=1, saved_seconds=speculation.elapsed if already_done else 0.0)
+        logger.info(f"Speculative retrieval hit (overlap={best_score:.2f}) for '{final_text}'")
+        return docs
+
+    def cancel_all(self):
+        for speculation in self._speculations.values():
+            self._discard(speculation)
+        self._speculations = {}
+        self._last_partial, self._repeats = None, 0
+
+    def _discard(self, speculation: _Speculation):
+        speculation.task.cancel()
+        self.stats.record(wasted=1, wasted_seconds=speculation.elapsed)
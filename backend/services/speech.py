@@ -0,0 +1,46 @@
+# backend/services/speech.py
+
+import io
+
+from services.tts_cache import get_tts_cache
+from utils.audio_utils import SAMPLE_RATE, SAMPLE_WIDTH
+from utils.metrics import time_stage
+
+# gTTS accents are selected through the Google Translate top-level domain
+GTTS_VOICES = ["com", "co.uk", "com.au", "ca", "co.in", "ie", "co.za"]
+DEFAULT_GTTS_VOICE = "com"
+
+
+@time_stage("stt")
+def recognize_pcm(pcm: bytes) -> str:
+    """Blocking Google speech recognition on 16 kHz mono PCM."""
+    import speech_recognition as sr  # imported on first use, not at API startup
+
+    recognizer = sr.Recognizer()
+    audio_data = sr.AudioData(pcm, SAMPLE_RATE, SAMPLE_WIDTH)
+    return recognizer.recognize_google(audio_data)
+
+
+@time_stage("tts")
+def synthesize_gtts(text: str, voice: str = DEFAULT_GTTS_VOICE) -> bytes:
+    """Synthesize MP3 speech with gTTS into memory."""
+    from gtts import gTTS  # imported on first use, not at API startup
+
+    buffer = io.BytesIO()
+    gTTS(text, tld=voice).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def gtts_cached_filename(text: str, voice: str = DEFAULT_GTTS_VOICE) -> str:
+    """gTTS through the TTS cache, returning the cached file name."""
+    if voice not in GTTS_VOICES:
+        voice = DEFAULT_GTTS_VOICE
+    cache_voice = "en" if voice == DEFAULT_GTTS_VOICE else f"en-{voice}"
+    return get_tts_cache().get_or_synthesize(
+        text, cache_voice, "gtts", lambda speech_text: synthesize_gtts(speech_text, voice)
+    )
+
+
+def synthesize_cached(text: str, voice: str = DEFAULT_GTTS_VOICE) -> bytes:
+    """gTTS through the TTS cache, returning the MP3 bytes."""
+    return get_tts_cache().read(gtts_cached_filename(text, voice))
@@ -0,0 +1,107 @@
+# backend/services/speech_stream.py
+
+import asyncio
+import re
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+from services.voice_executor import get_voice_executor
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# End of sentence: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+
+
+def split_sentences(
+    chunks: Iterable[str],
+    min_chars: int = 20,
+    max_chars: int = 400,
+) -> Iterator[str]:
+    """
+    Re-chunk a stream of LLM tokens into speakable sentences.
+
+    Sentences shorter than ``min_chars`` are merged with the next one so
+    the TTS engine is not called for fragments like "Sure." on their own;
+    runs without punctuation are cut at the last space before ``max_chars``.
+
+    Args:
+        chunks (Iterable[str]): Streamed text pieces (tokens or deltas).
+        min_chars (int): Minimum length of an emitted sentence.
+        max_chars (int): Maximum length of an emitted sentence.
+
+    Yields:
+        str: Sentences in order; the remainder is flushed at the end.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            cut = None
+            for match in SENTENCE_END.finditer(buffer):
+                if match.end() >= min_chars:
+                    cut = match.end()
+                    break
+            if cut is None and len(buffer) > max_chars:
+                space = buffer.rfind(" ", 0, max_chars)
+                cut = space + 1 if space > 0 else max_chars
+            if cut is None:
+                break
+            sentence, buffer = buffer[:cut].strip(), buffer[cut:]
+            if sentence:
+                yield sentence
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def synthesize_in_order(
+    sentences: AsyncIterator[str],
+    synthesize: Callable[[str], bytes],
+    max_parallel: int = 3,
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize sentences concurrently and yield their audio in order.
+
+    At most ``max_parallel`` sentences are being synthesized at once; the
+    first chunk is yielded as soon as the first sentence is ready, while
+    later sentences are still being generated by the LLM or the TTS engine.
+
+    Args:
+        sentences (AsyncIterator[str]): Sentences in playback order.
+        synthesize (Callable[[str], bytes]): Blocking TTS call, run in the voice
+            executor's bounded speech pool (not the default threadpool).
+        max_parallel (int): Upper bound on concurrent TTS calls.
+
+    Yields:
+        bytes: Encoded audio for each sentence, in input order.
+    """
+    executor = get_voice_executor()
+    slots = asyncio.Semaphore(max_parallel)
+    pending: asyncio.Queue = asyncio.Queue()
+
+    async def _produce():
+        try:
+            async for sentence in sentences:
+                await slots.acquire()
+                pending.put_nowait(asyncio.ensure_future(executor.stt(synthesize, sentence)))
+        finally:
+            pending.put_nowait(None)
+
+    producer = asyncio.ensure_future(_produce())
+    try:
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            try:
+                yield await task
+            finally:
+                slots.release()
+        await producer  # surface errors raised by the sentence source
+    finally:
+        producer.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is not None:
+                task.cancel()
@@ -0,0 +1,160 @@
+# backend/services/tts_cache.py
+
+import hashlib
+import os
+import threading
+import uuid
+from functools import lru_cache
+from typing import Callable, Optional
+
+from config.setting import TTS_CACHE_CONFIG
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+
+class TTSCache:
+    """
+    Content-addressed cache for synthesized speech.
+
+    Audio is stored once per ``(engine, voice, text)`` under a file name
+    derived from the SHA-256 of that key, so identical answers (greetings,
+    fallback messages, cached responses) are served from disk instead of
+    being synthesized again. File names never change meaning, which lets
+    ``/static`` serve them with long-lived cache headers.
+
+    The directory is bounded by ``max_bytes``: when it grows past the limit
+    the least recently used audio files are deleted. Cache hits refresh the
+    file's mtime, which serves as the LRU clock.
+
+    Attributes:
+        directory (str): Directory holding the audio files (served at /static).
+        max_bytes (int): Size budget for all audio files in ``directory``.
+    """
+
+    PREFIX = "tts_"
+
+    def __init__(self, directory: str = "responses", max_bytes: int = 200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = self._scan_size()
+        logger.info(
+            f"TTSCache initialized at '{self.directory}' "
+            f"({self._size / (1024 * 1024):.1f}MB / {self.max_bytes / (1024 * 1024):.1f}MB)"
+        )
+
+    # ========== KEYS ========== #
+    @staticmethod
+    def make_key(text: str, voice: str, engine: str) -> str:
+        """Return the content hash identifying one synthesized utterance."""
+        payload = "\0".join((engine, voice, text)).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def filename_for(self, key: str, ext: str = "mp3") -> str:
+        return f"{self.PREFIX}{key}.{ext}"
+
+    def path_for(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    # ========== LOOKUP / STORE ========== #
+    def get(self, text: str, voice: str, engine: str, ext: str = "mp3") -> Optional[str]:
+        """Return the cached file name for this utterance, or None on a miss."""
+        filename = self.filename_for(self.make_key(text, voice, engine), ext)
+        path = self.path_for(filename)
+        try:
+            os.utime(path)  # refresh LRU position
+        except FileNotFoundError:
+            return None
+        return filename
+
+    def put(self, text: str, voice: str, engine: str, audio: bytes, ext: str = "mp3") -> str:
+        """Store synthesized audio and return its file name."""
+        filename = self.filename_for(self.make_key(text, voice, engine), ext)
+        path = self.path_for(filename)
+
+        # Write to a private temp name, then atomically publish it
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += len(audio) - previous
+            if self._size > self.max_bytes:
+                self._evict(keep=filename)
+        return filename
+
+    def get_or_synthesize(
+        self,
+        text: str,
+        voice: str,
+        engine: str,
+        synthesize: Callable[[str], bytes],
+        ext: str = "mp3",
+    ) -> str:
+        """
+        Return the file name for this utterance, synthesizing it on a miss.
+
+        Args:
+            text (str): Text to speak.
+            voice (str): Voice identifier (engine specific).
+            engine (str): Engine identifier, e.g. "gtts" or "openai-tts-1".
+            synthesize (Callable[[str], bytes]): Called with ``text`` on a miss.
+
+        Returns:
+            str: File name relative to the cache directory.
+        """
+        filename = self.get(text, voice, engine, ext)
+        if filename:
+            logger.info(f"TTS cache hit: {filename}")
+            return filename
+        return self.put(text, voice, engine, synthesize(text), ext)
+
+    def read(self, filename: str) -> bytes:
+        with open(self.path_for(filename), "rb") as f:
+            return f.read()
+
+    # ========== EVICTION ========== #
+    def _audio_files(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(AUDIO_EXTENSIONS):
+                yield entry
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._audio_files())
+
+    def _evict(self, keep: Optional[str] = None):
+        """Delete least recently used audio files until under ``max_bytes``."""
+        entries = sorted(
+            ((entry.stat().st_mtime, entry.stat().st_size, entry.path, entry.name)
+             for entry in self._audio_files()),
+        )
+        self._size = sum(size for _, size, _, _ in entries)
+
+        removed = 0
+        for _, size, path, name in entries:
+            if self._size <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(path)
+                self._size -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+        logger.info(f"TTSCache evicted {removed} files, size now {self._size / (1024 * 1024):.1f}MB")
+
+
+@lru_cache(maxsize=1)
+def get_tts_cache() -> TTSCache:
+    """Process-wide TTS cache configured from configuration.yaml."""
+    return TTSCache(
+        directory=TTS_CACHE_CONFIG.get("directory", "responses"),
+        max_bytes=int(TTS_CACHE_CONFIG.get("max_size_mb", 200) * 1024 * 1024),
+    )
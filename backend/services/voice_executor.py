@@ -0,0 +1,127 @@
+# backend/services/voice_executor.py
+
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+from config.setting import VOICE_CONFIG
+from utils.logging import get_logger
+from utils.tracing import span
+
+logger = get_logger(__name__)
+
+
+class StageTimings:
+    """Wall-clock duration (ms) of each stage of one voice request (also traced as ``voice.<stage>``)."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            with span(f"voice.{name}"):
+                yield
+        finally:
+            self.stages[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def __str__(self):
+        return ", ".join(f"{name}={ms}ms" for name, ms in self.stages.items())
+
+
+class VoiceExecutor:
+    """
+    Dedicated executors for the voice pipeline, kept off the event loop and
+    off the default threadpool used by text chat.
+
+    - CPU-bound decoding / VAD runs in a small process pool.
+    - Blocking STT/TTS network calls run in a bounded thread pool.
+    - ``admit()`` caps the number of voice requests in flight and rejects
+      the rest immediately with 503 + ``Retry-After`` instead of queueing.
+
+    Attributes:
+        max_pending (int): Maximum voice requests admitted at once.
+        timeout (float): Seconds allowed for a single transcode or STT call.
+    """
+
+    def __init__(
+        self,
+        transcode_workers: int = 2,
+        stt_workers: int = 4,
+        max_pending: int = 16,
+        timeout: float = 30.0,
+        retry_after: int = 1,
+    ):
+        self.transcode_workers = transcode_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pending = 0
+        self._transcode_pool: Optional[ProcessPoolExecutor] = None
+        self._stt_pool = ThreadPoolExecutor(max_workers=stt_workers, thread_name_prefix="voice-stt")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @asynccontextmanager
+    async def admit(self):
+        """Admit one voice request or fail fast with 503 when saturated."""
+        if self._pending >= self.max_pending:
+            logger.warning(f"Voice pipeline saturated ({self._pending}/{self.max_pending}), rejecting request")
+            raise HTTPException(
+                status_code=503,
+                detail="Voice service is busy, please retry shortly.",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self._pending += 1
+        timings = StageTimings()
+        try:
+            yield timings
+        finally:
+            self._pending -= 1
+            logger.info(f"Voice request timings: {timings}")
+
+    async def transcode(self, fn: Callable, *args):
+        """Run a CPU-bound, picklable function in the transcode process pool."""
+        if self._transcode_pool is None:
+            self._transcode_pool = ProcessPoolExecutor(max_workers=self.transcode_workers)
+        return await self._run(self._transcode_pool, fn, *args)
+
+    async def stt(self, fn: Callable, *args):
+        """Run a blocking speech (STT/TTS) call in the bounded thread pool."""
+        # Carry the request context (trace, request id) into the worker thread
+        context = contextvars.copy_context()
+        return await self._run(self._stt_pool, context.run, fn, *args)
+
+    async def _run(self, pool, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(pool, fn, *args), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Voice processing timed out")
+
+    def shutdown(self):
+        self._stt_pool.shutdown(wait=False, cancel_futures=True)
+        if self._transcode_pool is not None:
+            self._transcode_pool.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache(maxsize=1)
+def get_voice_executor() -> VoiceExecutor:
+    """Process-wide voice executor configured from configuration.yaml."""
+    cfg = VOICE_CONFIG.get("executor", {})
+    return VoiceExecutor(
+        transcode_workers=cfg.get("transcode_workers", 2),
+        stt_workers=cfg.get("stt_workers", 4),
+        max_pending=cfg.get("max_pending", 16),
+        timeout=cfg.get("timeout_s", 30.0),
+        retry_after=cfg.get("retry_after_s", 1),
+    )
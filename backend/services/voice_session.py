@@ -0,0 +1,355 @@
+# backend/services/voice_session.py
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from config.setting import VOICE_CONFIG
+from services.chatbot_services import ChatbotServices, get_chatbot_service
+from services.speech import recognize_pcm, synthesize_cached, GTTS_VOICES, DEFAULT_GTTS_VOICE
+from services.speech_stream import split_sentences, synthesize_in_order
+from services.speculative_retrieval import SpeculativeRetriever, SPECULATION_STATS
+from services.voice_executor import get_voice_executor, StageTimings
+from utils.admission import Rejected, get_route_class
+from utils.audio_utils import decode_to_pcm, vad_trim
+from utils.exceptions import AppException
+from utils.logging import get_logger
+from utils.tracing import start_trace, export_trace, current_request_id
+from utils.uploads import MAX_AUDIO_SIZE, sniff_audio_format
+
+logger = get_logger(__name__)
+
+WS_CONFIG = VOICE_CONFIG.get("websocket", {})
+
+
+class VoiceSession:
+    """
+    One full-duplex voice conversation over a WebSocket.
+
+    State that used to be rebuilt on every multipart POST lives here for
+    the lifetime of the connection: the ChatbotServices instance, the chat
+    history (pinned in memory, loaded from Astra DB once), recently
+    retrieved product context and the chosen voice.
+
+    Protocol (client -> server):
+        binary frame                 audio chunk of the current utterance
+        {"type": "config", "voice"}  choose the gTTS voice (accent)
+        {"type": "end"}              utterance complete, answer it
+        {"type": "cancel"}           drop the buffered utterance
+
+    Protocol (server -> client):
+        {"type": "ready", "session_id", "voices"}
+        {"type": "partial_transcript", "text"}
+        {"type": "transcript", "text"}
+        {"type": "text", "delta"}                  streamed answer text
+        binary frame                               MP3 audio, one sentence per frame, in order
+        {"type": "done", "answer", "timings_ms", "request_id"}
+        {"type": "error", "message", "status_code"}
+        {"type": "error", "message", "status_code", "retry_after"}   turn shed (busy)
+
+    Each turn is admitted like an HTTP voice request: through the
+    ``websocket.route_class`` admission class (in-flight cap, shedding and
+    one turn at a time per ``session_id``, shared with HTTP voice turns)
+    and the voice executor's cap. Partial transcripts take an executor
+    slot only when one is free, and are bounded per utterance: a new one
+    starts only after the buffer grew by ``partial_growth``, at most
+    ``max_partials`` times, so their cost stays linear in the utterance.
+    """
+
+    def __init__(self, websocket: WebSocket, session_id: str, chatbot: Optional[ChatbotServices] = None):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.chatbot = chatbot
+        self.voice = DEFAULT_GTTS_VOICE
+        self.audio = bytearray()
+        self.context_cache: OrderedDict = OrderedDict()
+        self.context_cache_size = WS_CONFIG.get("context_cache_size", 32)
+        self.partial_interval = WS_CONFIG.get("partial_interval_s", 1.5)
+        self.partial_growth = WS_CONFIG.get("partial_growth", 1.5)
+        self.max_partials = WS_CONFIG.get("max_partials", 6)
+        self._partial_task: Optional[asyncio.Task] = None
+        self._turn_task: Optional[asyncio.Task] = None
+        self._last_partial = 0.0
+        self._partial_size = 0   # buffer size the last partial was transcribed from
+        self._partials = 0       # partials started for the current utterance
+        self._send_lock = asyncio.Lock()
+        # Speculations of the utterance being received; each turn takes its own set
+        self.speculator: Optional[SpeculativeRetriever] = None
+
+    # ========== TRANSPORT ========== #
+    async def send_json(self, payload: dict):
+        async with self._send_lock:
+            await self.websocket.send_json(payload)
+
+    async def send_bytes(self, data: bytes):
+        async with self._send_lock:
+            await self.websocket.send_bytes(data)
+
+    async def run(self):
+        """Serve the connection until the client disconnects."""
+        await self.websocket.accept()
+        pinned = False
+        try:
+            if self.chatbot is None:
+                self.chatbot = await run_in_threadpool(get_chatbot_service)
+            await run_in_threadpool(self.chatbot.retriever.pin_session, self.session_id)
+            pinned = True
+            self.speculator = self._new_speculator()
+            await self.send_json({"type": "ready", "session_id": self.session_id, "voices": GTTS_VOICES})
+
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    await self.on_audio(message["bytes"])
+                elif message.get("text") is not None:
+                    await self.on_control(message["text"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._cancel_partial()
+            if self._turn_task and not self._turn_task.done():
+                self._turn_task.cancel()
+            if self.speculator is not None:
+                self.speculator.cancel_all()
+            if pinned:
+                self.chatbot.retriever.unpin_session(self.session_id)
+            logger.info(f"Voice session '{self.session_id}' closed (speculation: {SPECULATION_STATS.snapshot()})")
+
+    def _new_speculator(self) -> Optional[SpeculativeRetriever]:
+        speculation = WS_CONFIG.get("speculation", {})
+        if not speculation.get("enabled", True):
+            return None
+        return SpeculativeRetriever(
+            self.chatbot.retriever.retrieve,
+            similarity_threshold=speculation.get("similarity_threshold", 0.8),
+            stable_partials=speculation.get("stable_partials", 2),
+            max_inflight=speculation.get("max_inflight", 2),
+        )
+
+    async def on_control(self, raw: str):
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            await self.send_error("Invalid JSON control message", 400)
+            return
+
+        kind = message.get("type")
+        if kind == "config":
+            voice = message.get("voice", self.voice)
+            self.voice = voice if voice in GTTS_VOICES else DEFAULT_GTTS_VOICE
+            await self.send_json({"type": "config", "voice": self.voice})
+        elif kind == "end":
+            await self.on_end_of_utterance()
+        elif kind == "cancel":
+            self._reset_utterance()
+        else:
+            await self.send_error(f"Unknown message type: {kind}", 400)
+
+    async def send_error(self, message: str, status_code: int = 500, retry_after: Optional[int] = None):
+        payload = {"type": "error", "message": message, "status_code": status_code}
+        if retry_after is not None:
+            payload["retry_after"] = retry_after
+        await self.send_json(payload)
+
+    # ========== AUDIO ========== #
+    async def on_audio(self, data: bytes):
+        if not self.audio and sniff_audio_format(data[:16]) is None:
+            await self.send_error("Unsupported or unrecognized audio format", 415)
+            return
+        if len(self.audio) + len(data) > MAX_AUDIO_SIZE:
+            self._reset_utterance()
+            await self.send_error("Utterance too large", 413)
+            return
+
+        self.audio.extend(data)
+        self._maybe_start_partial()
+
+    def _maybe_start_partial(self):
+        if not self.partial_interval or (self._partial_task and not self._partial_task.done()):
+            return
+        if time.monotonic() - self._last_partial < self.partial_interval:
+            return
+        # Every partial re-decodes and re-transcribes the whole buffer: space them out geometrically
+        if self._partials >= self.max_partials or len(self.audio) < self._partial_size * self.partial_growth:
+            return
+        executor = get_voice_executor()
+        if executor.pending >= executor.max_pending:
+            return
+        self._last_partial = time.monotonic()
+        self._partial_size = len(self.audio)
+        self._partials += 1
+        self._partial_task = asyncio.ensure_future(self._partial_transcript(bytes(self.audio), self.speculator))
+
+    async def _partial_transcript(self, audio: bytes, speculator: Optional[SpeculativeRetriever]):
+        """Transcribe the audio received so far; failures (and a busy executor) are ignored."""
+        try:
+            async with get_voice_executor().admit() as timings:
+                text = await self._transcribe(audio, timings)
+        except Exception:
+            return
+        if text:
+            await self.on_partial_transcript(text, speculator)
+
+    async def on_partial_transcript(self, text: str, speculator: Optional[SpeculativeRetriever] = None):
+        # Only the utterance the partial was transcribed from may speculate on it
+        if speculator is not None and speculator is self.speculator:
+            speculator.on_partial(text)
+        await self.send_json({"type": "partial_transcript", "text": text})
+
+    async def _transcribe(self, audio: bytes, timings: Optional[StageTimings] = None) -> str:
+        executor = get_voice_executor()
+        timings = timings or StageTimings()
+        with timings.stage("transcode"):
+            pcm = await executor.transcode(_decode_and_trim, audio, sniff_audio_format(audio[:16]))
+        with timings.stage("stt"):
+            return await executor.stt(recognize_pcm, pcm)
+
+    def _cancel_partial(self):
+        if self._partial_task and not self._partial_task.done():
+            self._partial_task.cancel()
+        self._partial_task = None
+
+    def _reset_utterance(self):
+        """Drop the utterance being received (turns already running keep their speculations)."""
+        self._cancel_partial()
+        if self.speculator is not None:
+            self.speculator.cancel_all()
+        self.audio = bytearray()
+        self._last_partial = 0.0
+        self._partial_size = 0
+        self._partials = 0
+
+    # ========== TURN ========== #
+    async def on_end_of_utterance(self):
+        """Answer the buffered utterance in the background; turns run one at a time, in order."""
+        audio = bytes(self.audio)
+        if not audio:
+            self._reset_utterance()
+            await self.send_error("No audio received", 400)
+            return
+        # The turn takes this utterance's speculations; the next utterance starts a new set
+        speculator, self.speculator = self.speculator, self._new_speculator()
+        self._reset_utterance()
+        self._turn_task = asyncio.ensure_future(self._run_turn(audio, self._turn_task, speculator))
+
+    async def _run_turn(self, audio: bytes, previous: Optional[asyncio.Task], speculator: Optional[SpeculativeRetriever]):
+        try:
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            await self._answer_utterance(audio, speculator)
+        finally:
+            # Cancelled or failed before resolving: don't leave its retrievals running
+            if speculator is not None:
+                speculator.cancel_all()
+
+    async def _answer_utterance(self, audio: bytes, speculator: Optional[SpeculativeRetriever]):
+        # Each turn is traced like an HTTP request (the task keeps its own context)
+        with start_trace("WS voice turn") as trace:
+            try:
+                async with AsyncExitStack() as admission:
+                    try:
+                        timings = await self._admit_turn(admission)
+                    except Rejected as e:
+                        await self.send_error(e.message, e.status_code, e.retry_after)
+                        return
+                    except HTTPException as e:
+                        await self.send_error(e.detail, e.status_code, int((e.headers or {}).get("Retry-After", 1)))
+                        return
+
+                    try:
+                        text = await self._transcribe(audio, timings)
+                    except AppException as e:
+                        await self.send_error(e.message, e.status_code)
+                        return
+                    except Exception as e:
+                        logger.error(f"Voice session STT error: {e}")
+                        await self.send_error("Could not transcribe audio", 500)
+                        return
+
+                    await self.send_json({"type": "transcript", "text": text})
+                    await self.answer(text, timings, speculator)
+            finally:
+                trace.finish()
+                export_trace(trace)
+
+    async def _admit_turn(self, admission: AsyncExitStack) -> StageTimings:
+        """Take the turn's admission slots (released when ``admission`` closes); raises when shed."""
+        route_class = get_route_class(WS_CONFIG.get("route_class", "voice"))
+        if route_class is not None:
+            await admission.enter_async_context(route_class.admit(self.session_id))
+        return await admission.enter_async_context(get_voice_executor().admit())
+
+    async def get_context(self, query: str, speculator: Optional[SpeculativeRetriever] = None) -> list:
+        """
+        Retrieved product documents for the final transcript.
+
+        Reuses, in order: this connection's per-query cache, a matching
+        speculative retrieval started on the partial transcripts of the same
+        utterance (``speculator``), and finally a fresh retrieval.
+        """
+        key = " ".join(query.lower().split())
+        if key in self.context_cache:
+            self.context_cache.move_to_end(key)
+            if speculator is not None:
+                speculator.cancel_all()
+            return self.context_cache[key]
+
+        docs = await speculator.resolve(query) if speculator is not None else None
+        if docs is None:
+            docs = await run_in_threadpool(self.chatbot.retriever.retrieve, query)
+        self.context_cache[key] = docs
+        if len(self.context_cache) > self.context_cache_size:
+            self.context_cache.popitem(last=False)
+        return docs
+
+    async def answer(self, text: str, timings: StageTimings, speculator: Optional[SpeculativeRetriever] = None):
+        """Stream the answer text and its sentence-by-sentence audio back to the client."""
+        loop = asyncio.get_running_loop()
+        answer_parts = []
+
+        with timings.stage("retrieval"):
+            context = await self.get_context(text, speculator)
+
+        def _tee(tokens):
+            # Runs in the threadpool: forward each text delta to the client as it arrives
+            for token in tokens:
+                answer_parts.append(token)
+                asyncio.run_coroutine_threadsafe(self.send_json({"type": "text", "delta": token}), loop)
+                yield token
+
+        sentences = iterate_in_threadpool(
+            split_sentences(
+                _tee(self.chatbot.stream_product_info(text, self.session_id, context=context)),
+                min_chars=VOICE_CONFIG.get("stream_min_sentence_chars", 20),
+                max_chars=VOICE_CONFIG.get("stream_max_sentence_chars", 400),
+            )
+        )
+        voice = self.voice
+        try:
+            with timings.stage("llm_tts"):
+                async for audio in synthesize_in_order(
+                    sentences,
+                    lambda sentence: synthesize_cached(sentence, voice),
+                    max_parallel=VOICE_CONFIG.get("stream_max_parallel_tts", 3),
+                ):
+                    await self.send_bytes(audio)
+        except Exception as e:
+            logger.error(f"Voice session answer error: {e}")
+            await self.send_error("Something went wrong while generating response", 500)
+            return
+
+        await self.send_json({"type": "done", "answer": "".join(answer_parts), "timings_ms": timings.stages,
+                             "request_id": current_request_id()})
+
+
+def _decode_and_trim(audio: bytes, input_format: Optional[str]) -> bytes:
+    """Decode + VAD in one process-pool call (module level so it pickles)."""
+    return vad_trim(decode_to_pcm(audio, input_format=input_format))
@@ -0,0 +1,175 @@
+# backend/services/warmup.py
+
+"""
+Worker warm-up and readiness state.
+
+At startup each worker runs the warm-up components in a background
+thread. The components build ChatbotServices (embedding model and index),
+run a dummy embed + retrieval, open the chat-history DB connection, send
+a 1-token LLM request and import the speech stack. ``/ready`` answers
+503 until every required component has succeeded, so a load balancer
+never routes traffic to a cold worker. ``/live`` only says the process
+is up. Failed components are retried until they succeed.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from config.setting import WARMUP_CONFIG, API_CONFIG
+from utils.exceptions import AppException
+from utils.logging import get_logger
+from utils.startup import STARTUP
+
+logger = get_logger(__name__)
+
+
+class WarmupState:
+    """Per-component readiness and warm-up timings."""
+
+    def __init__(self, components: list[str]):
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._components = {
+            name: {"ready": False, "ms": None, "attempts": 0, "error": None} for name in components
+        }
+        if not components:
+            self.finished = self.started
+            self._ready.set()
+
+    def record(self, name: str, ready: bool, ms: float, error: Optional[str] = None):
+        with self._lock:
+            component = self._components[name]
+            component.update(ready=ready, ms=round(ms, 1), error=error)
+            component["attempts"] += 1
+            if self.finished is None and all(c["ready"] for c in self._components.values()):
+                self.finished = time.time()
+                self._ready.set()
+
+    def is_ready(self, name: str) -> bool:
+        with self._lock:
+            return self._components[name]["ready"]
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every component is ready; False on timeout."""
+        return self._ready.wait(timeout)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            components = {name: dict(c) for name, c in self._components.items()}
+        return {
+            "ready": self.ready,
+            "warmup_ms": round((self.finished - self.started) * 1000, 1) if self.finished else None,
+            "components": components,
+        }
+
+
+# ======================
+# 🔥 Components
+# ======================
+def _warm_chatbot():
+    from services.chatbot_services import get_chatbot_service
+    get_chatbot_service()
+
+
+def _warm_retrieval():
+    # Dummy embed + vector search (model weights paged in, index mapped, tokenizer loaded)
+    from services.chatbot_services import get_chatbot_service
+    retriever = get_chatbot_service().retriever
+    retriever.retrieve("wireless bluetooth headset battery life")
+    if retriever.router is not None:
+        retriever.router.warm()
+
+
+def _warm_database():
+    from services.chatbot_services import get_chatbot_service
+    collection = get_chatbot_service().retriever.db.get_collection("chat_history")
+    next(iter(collection.find({"session_id": "__warmup__"}, limit=1)), None)
+
+
+def _warm_llm():
+    from services.chatbot_services import get_chatbot_service
+    get_chatbot_service().retriever.llm.bind(max_tokens=1).invoke("ping")
+
+
+def _warm_speech():
+    import speech_recognition  # noqa: F401
+    import gtts  # noqa: F401
+
+
+COMPONENTS: dict[str, Callable[[], None]] = {
+    "chatbot": _warm_chatbot,
+    "retrieval": _warm_retrieval,
+    "database": _warm_database,
+    "llm": _warm_llm,
+    "speech": _warm_speech,
+}
+
+# A component only runs once the components it needs are ready
+DEPENDS_ON = {
+    "retrieval": "chatbot",
+    "database": "chatbot",
+    "llm": "chatbot",
+}
+
+
+VOICE_ROUTERS = {"voice", "voice_ws"}
+
+
+def _enabled_components() -> list[str]:
+    if not WARMUP_CONFIG.get("enabled", True):
+        return []
+    names = WARMUP_CONFIG.get("components", list(COMPONENTS))
+    unknown = [name for name in names if name not in COMPONENTS]
+    if unknown:
+        raise AppException(f"Unknown components in warmup.components: {unknown}")
+    if not WARMUP_CONFIG.get("llm_ping", True):
+        names = [name for name in names if name != "llm"]
+    # The speech stack is only needed when a voice router is mounted
+    if not VOICE_ROUTERS & set(API_CONFIG.get("routers", VOICE_ROUTERS)):
+        names = [name for name in names if name != "speech"]
+    return names
+
+
+WARMUP = WarmupState(_enabled_components())
+
+
+def run_warmup(state: WarmupState = WARMUP):
+    """Warm every component, retrying failures until all are ready."""
+    retry_interval = WARMUP_CONFIG.get("retry_interval_s", 10)
+    pending = list(state.snapshot()["components"])
+
+    while pending:
+        for name in list(pending):
+            dependency = DEPENDS_ON.get(name)
+            if dependency in pending:
+                continue
+            start = time.perf_counter()
+            try:
+                with STARTUP.stage("warmup", name):
+                    COMPONENTS[name]()
+            except Exception as e:
+                state.record(name, False, (time.perf_counter() - start) * 1000, error=str(e)[:300])
+                logger.warning(f"⚠️ Warm-up of '{name}' failed, retrying in {retry_interval}s: {e}")
+                continue
+            state.record(name, True, (time.perf_counter() - start) * 1000)
+            pending.remove(name)
+            logger.info(f"🔥 Warm-up of '{name}' done in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if pending:
+            time.sleep(retry_interval)
+
+    logger.info(f"✅ Worker ready: {state.snapshot()}")
+
+
+def start_warmup(state: WarmupState = WARMUP) -> threading.Thread:
+    """Run the warm-up in a daemon thread so /live answers while the worker warms up."""
+    state.started = time.time()
+    thread = threading.Thread(target=run_warmup, args=(state,), name="warmup", daemon=True)
+    thread.start()
+    return thread
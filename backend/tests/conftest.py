@@ -0,0 +1,11 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+
+# Tests import backend modules as top-level packages (utils, services, ...)
+# and the shared config package from the repository root, like the app does.
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (BACKEND_DIR, os.path.dirname(BACKEND_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,234 @@
+# backend/tests/test_admission.py
+
+import asyncio
+
+import pytest
+
+import utils.admission as admission
+from utils.admission import AdmissionLimiter, AdmissionMiddleware, Rejected, RouteClass, SessionSerializer
+
+
+def limiter(max_in_flight=1, max_queue=2, queue_timeout=1.0) -> AdmissionLimiter:
+    return AdmissionLimiter("test", max_in_flight, max_queue, queue_timeout)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ========== LIMITER ========== #
+def test_slots_are_handed_to_waiters_in_fifo_order():
+    async def scenario():
+        lim = limiter(max_in_flight=1, max_queue=3)
+        await lim.acquire()
+        order = []
+
+        async def waiter(name):
+            await lim.acquire()
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(waiter(name)) for name in ("a", "b", "c")]
+        await settle()
+        assert lim.queued == 3 and lim.in_flight == 1
+        for _ in range(3):
+            lim.release(0.1)
+            await settle()
+        await asyncio.gather(*tasks)
+        lim.release(0.1)
+        return lim, order
+
+    lim, order = asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert lim.in_flight == 0 and lim.queued == 0
+
+
+def test_new_arrival_cannot_jump_the_queue():
+    async def scenario():
+        lim = limiter(max_in_flight=1)
+        await lim.acquire()
+        queued = asyncio.ensure_future(lim.acquire())
+        await settle()
+        lim.release(0.1)                      # handed to the queued request...
+        late = asyncio.ensure_future(lim.acquire())
+        await settle()
+        assert queued.done() and not late.done()
+        assert lim.in_flight == 1
+        lim.release(0.1)
+        await late
+        lim.release(0.1)
+        return lim
+
+    assert asyncio.run(scenario()).in_flight == 0
+
+
+def test_full_queue_is_rejected_at_once():
+    async def scenario():
+        lim = limiter(max_in_flight=1, max_queue=1)
+        await lim.acquire()
+        queued = asyncio.ensure_future(lim.acquire())
+        await settle()
+        with pytest.raises(Rejected) as info:
+            await lim.acquire()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        return info.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.reason == "queue_full"
+    assert rejected.retry_after >= 1
+
+
+def test_queue_timeout_sheds_and_leaves_the_queue():
+    async def scenario():
+        lim = limiter(max_in_flight=1, queue_timeout=0.05)
+        await lim.acquire()
+        with pytest.raises(Rejected) as info:
+            await lim.acquire()
+        return lim, info.value
+
+    lim, rejected = asyncio.run(scenario())
+    assert rejected.reason == "queue_timeout"
+    assert lim.queued == 0 and lim.in_flight == 1
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def scenario():
+        lim = limiter(max_in_flight=1)
+        await lim.acquire()
+        first = asyncio.ensure_future(lim.acquire())
+        second = asyncio.ensure_future(lim.acquire())
+        await settle()
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert lim.queued == 1
+        lim.release(0.1)
+        await second
+        lim.release(0.1)
+        return lim
+
+    lim = asyncio.run(scenario())
+    assert lim.in_flight == 0 and lim.queued == 0
+
+
+def test_retry_after_grows_with_the_queue():
+    lim = limiter(max_in_flight=2)
+    lim._hold_seconds = 3.0
+    assert lim.retry_after() == 2
+    lim._waiters.extend([None] * 3)
+    assert lim.retry_after() == 6
+
+
+# ========== SESSIONS ========== #
+def test_session_turns_run_one_at_a_time_and_overflow_gets_429():
+    async def scenario():
+        sessions = SessionSerializer(max_waiting=1)
+        await sessions.acquire("s1")
+        waiting = asyncio.ensure_future(sessions.acquire("s1"))
+        await settle()
+        assert not waiting.done()
+        with pytest.raises(Rejected) as info:
+            await sessions.acquire("s1")
+        await sessions.acquire("s2")           # other sessions are independent
+        sessions.release("s2")
+        sessions.release("s1")
+        await waiting
+        sessions.release("s1")
+        return sessions, info.value
+
+    sessions, rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429 and rejected.reason == "session_busy"
+    assert len(sessions) == 0
+
+
+# ========== ROUTE CLASSES ========== #
+def route_class(**cfg) -> RouteClass:
+    return RouteClass({"name": "llm", "prefixes": ["/api/chat"], "max_in_flight": 1, **cfg}, session_queue=2)
+
+
+def test_exclude_prefixes():
+    rc = route_class(exclude_prefixes=["/api/chat/batch"])
+    assert rc.matches("/api/chat")
+    assert rc.matches("/api/chat/stream")
+    assert not rc.matches("/api/chat/batch")
+    assert not rc.matches("/api/history/abc")
+
+
+def test_admit_holds_and_releases_slot_and_session():
+    async def scenario():
+        rc = route_class(serialize_sessions=True)
+        async with rc.admit("s1"):
+            assert rc.limiter.in_flight == 1 and len(rc.sessions) == 1
+        return rc
+
+    rc = asyncio.run(scenario())
+    assert rc.limiter.in_flight == 0 and len(rc.sessions) == 0
+
+
+def test_admit_releases_the_session_when_shed():
+    async def scenario():
+        rc = route_class(serialize_sessions=True, max_queue=0)
+        async with rc.admit("s1"):
+            with pytest.raises(Rejected):
+                async with rc.admit("s2"):
+                    pass
+            assert len(rc.sessions) == 1
+        return rc
+
+    rc = asyncio.run(scenario())
+    assert rc.limiter.in_flight == 0 and len(rc.sessions) == 0
+
+
+def test_admit_ignores_session_without_serialization():
+    async def scenario():
+        rc = route_class()
+        async with rc.admit("s1"):
+            return rc.sessions, rc.limiter.in_flight
+
+    assert asyncio.run(scenario()) == (None, 1)
+
+
+# ========== MIDDLEWARE ========== #
+def test_middleware_sheds_with_retry_after(monkeypatch):
+    monkeypatch.setattr(admission, "ROUTE_CLASSES", [])
+    release = None
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmissionMiddleware(app, {
+        "route_classes": [{"name": "llm", "prefixes": ["/api/chat"], "max_in_flight": 1, "max_queue": 0}],
+    })
+
+    async def call(path):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware({"type": "http", "method": "POST", "path": path, "headers": [], "query_string": b""},
+                         receive, send)
+        return sent
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.ensure_future(call("/api/chat"))
+        await settle()
+        shed = await call("/api/chat")
+        unlimited = asyncio.ensure_future(call("/health"))
+        release.set()
+        return await first, shed, await unlimited
+
+    first, shed, unlimited = asyncio.run(scenario())
+    assert first[0]["status"] == 200 and unlimited[0]["status"] == 200
+    assert shed[0]["status"] == 503
+    assert (b"retry-after", b"1") in shed[0]["headers"]
+    assert admission.get_route_class("llm") is middleware.route_classes[0]
+    assert admission.get_route_class("missing") is None
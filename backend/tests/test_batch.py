@@ -0,0 +1,103 @@
+# backend/tests/test_batch.py
+
+import asyncio
+import threading
+
+import orjson
+import pytest
+
+import api.routes as routes
+from api.routes import BatchItem, _stream_batch
+from utils.admission import RouteClass
+from utils.exceptions import AppException
+
+
+class FakeChatbot:
+    """Records call order and how many calls overlap."""
+
+    def __init__(self, fail: dict = None, delay: float = 0.01):
+        self.fail = fail or {}
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_product_info(self, query, session_id, context):
+        with self._lock:
+            self.calls.append((session_id, query, context))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            threading.Event().wait(self.delay)
+            if query in self.fail:
+                raise self.fail[query]
+            return {"query": query, "session_id": session_id, "response": f"answer to {query}"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def run_batch(chatbot, items, concurrency=4) -> list:
+    async def collect():
+        contexts = [f"ctx {i}" for i in range(len(items))]
+        return [orjson.loads(line) async for line in _stream_batch(chatbot, items, contexts, concurrency)]
+    return asyncio.run(collect())
+
+
+@pytest.fixture(autouse=True)
+def no_admission(monkeypatch):
+    monkeypatch.setattr(routes, "get_route_class", lambda name: None)
+
+
+def test_every_item_gets_one_line_and_a_done_line():
+    items = [BatchItem(query=f"q{i}", session_id=f"s{i}") for i in range(5)]
+    lines = run_batch(FakeChatbot(), items)
+    results, done = lines[:-1], lines[-1]
+    assert sorted(line["index"] for line in results) == list(range(5))
+    assert all(line["response"] == f"answer to q{line['index']}" for line in results)
+    assert done["done"] is True and done["count"] == 5 and done["errors"] == 0
+
+
+def test_each_item_gets_its_own_context():
+    chatbot = FakeChatbot()
+    run_batch(chatbot, [BatchItem(query=f"q{i}", session_id=f"s{i}") for i in range(3)])
+    assert sorted((query, context) for _, query, context in chatbot.calls) == [
+        ("q0", "ctx 0"), ("q1", "ctx 1"), ("q2", "ctx 2"),
+    ]
+
+
+def test_items_of_one_session_run_in_order_one_at_a_time():
+    chatbot = FakeChatbot()
+    items = [BatchItem(query=f"q{i}", session_id="same") for i in range(4)]
+    lines = run_batch(chatbot, items)
+    assert [query for _, query, _ in chatbot.calls] == ["q0", "q1", "q2", "q3"]
+    assert [line["index"] for line in lines[:-1]] == [0, 1, 2, 3]
+    assert chatbot.peak == 1
+
+
+def test_concurrency_is_bounded():
+    chatbot = FakeChatbot(delay=0.05)
+    run_batch(chatbot, [BatchItem(query=f"q{i}", session_id=f"s{i}") for i in range(8)], concurrency=3)
+    assert 1 < chatbot.peak <= 3
+
+
+def test_failures_become_error_lines():
+    chatbot = FakeChatbot(fail={"bad": AppException("LLM quota exceeded", 503), "boom": RuntimeError("crash")})
+    items = [BatchItem(query=q, session_id=q) for q in ("ok", "bad", "boom")]
+    lines = {line.get("index"): line for line in run_batch(chatbot, items)}
+    assert "error" not in lines[0]
+    assert lines[1]["error"] == "LLM quota exceeded" and lines[1]["query"] == "bad"
+    assert lines[2]["error"] == "crash"
+    assert lines[None]["errors"] == 2
+
+
+def test_items_are_admitted_through_the_route_class(monkeypatch):
+    route_class = RouteClass({"name": "llm", "max_in_flight": 2, "max_queue": 0}, session_queue=2)
+    monkeypatch.setattr(routes, "get_route_class", lambda name: route_class)
+    chatbot = FakeChatbot(delay=0.05)
+    lines = run_batch(chatbot, [BatchItem(query=f"q{i}", session_id=f"s{i}") for i in range(6)], concurrency=6)
+    assert chatbot.peak <= 2
+    shed = [line for line in lines[:-1] if "error" in line]
+    assert shed and all(line["retry_after"] >= 1 for line in shed)
+    assert route_class.limiter.in_flight == 0
@@ -0,0 +1,170 @@
+# backend/tests/test_catalog.py
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+import services.catalog_service as catalog_service
+from ingestion.catalog import ProductCatalog
+from services.catalog_service import CatalogService
+from utils.exceptions import AppException
+
+PRODUCTS = [
+    # id, title, category, price, rating, rating_count
+    (1, "Backpack", "men's clothing", 109.95, 3.9, 120),
+    (2, "Slim T-Shirt", "men's clothing", 22.3, 4.1, 259),
+    (3, "Gold Bracelet", "jewelery", 695.0, 4.6, 400),
+    (4, "Silver Ring", "jewelery", 9.99, 3.0, 70),
+    (5, "SSD 1TB", "electronics", 109.0, 4.8, 319),
+    (6, "Monitor", "electronics", 599.0, 2.9, 250),
+    (7, "USB Drive", "electronics", 64.0, 4.8, 900),
+]
+
+
+def product_documents() -> list:
+    docs = [
+        Document(page_content=title, metadata={
+            "source": "api", "id": pid, "title": title, "category": category,
+            "price": price, "rating": rating, "rating_count": count,
+        })
+        for pid, title, category, price, rating, count in PRODUCTS
+    ]
+    return docs + [Document(page_content="a review", metadata={"source": "csv"})]
+
+
+@pytest.fixture
+def catalog() -> ProductCatalog:
+    return ProductCatalog.from_documents(product_documents())
+
+
+def titles(catalog, indices) -> list:
+    return [row["title"] for row in catalog.rows(indices)]
+
+
+# ========== CATALOG ========== #
+def test_from_documents_keeps_only_api_products(catalog):
+    assert len(catalog) == 7
+    assert catalog.categories == ["electronics", "jewelery", "men's clothing"]
+    assert catalog.rows([2])[0] == {
+        "id": 3, "title": "Gold Bracelet", "category": "jewelery",
+        "price": 695.0, "rating": 4.6, "rating_count": 400,
+    }
+
+
+def test_mismatched_columns_are_rejected():
+    with pytest.raises(AppException):
+        ProductCatalog([1, 2], ["a"], ["c"], [0, 0], [1.0, 2.0], [1.0, 2.0], [1, 2])
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({}, 7),
+    ({"category": "electronics"}, 3),
+    ({"category": "toys"}, 0),
+    ({"max_price": 100}, 3),
+    ({"min_price": 100, "max_price": 600}, 3),
+    ({"category": "electronics", "min_rating": 4.5}, 2),
+    ({"min_rating_count": 300}, 3),
+])
+def test_mask(catalog, filters, expected):
+    assert catalog.mask(**filters).sum() == expected
+
+
+def test_top_breaks_ties_by_review_count(catalog):
+    # SSD and USB Drive are both rated 4.8; the USB Drive has more reviews
+    assert titles(catalog, catalog.top("rating", 3)) == ["USB Drive", "SSD 1TB", "Gold Bracelet"]
+
+
+def test_top_ascending_with_mask(catalog):
+    mask = catalog.mask(category="electronics")
+    assert titles(catalog, catalog.top("price", 2, ascending=True, mask=mask)) == ["USB Drive", "SSD 1TB"]
+
+
+@pytest.mark.parametrize("n", [0, -1])
+def test_top_of_nothing(catalog, n):
+    assert len(catalog.top("price", n)) == 0
+    assert len(catalog.top("price", 3, mask=catalog.mask(category="toys"))) == 0
+
+
+def test_top_rejects_unknown_columns(catalog):
+    with pytest.raises(AppException):
+        catalog.top("title", 3)
+
+
+@pytest.mark.parametrize("by, ascending", [("price", True), ("rating", False), ("rating_count", False)])
+def test_top_partition_path_matches_a_full_sort(by, ascending):
+    rng = np.random.default_rng(7)
+    size = 400
+    catalog = ProductCatalog(
+        ids=range(size), titles=[f"p{i}" for i in range(size)], categories=["a", "b"],
+        category_codes=rng.integers(0, 2, size),
+        price=rng.integers(1, 20, size),          # many ties on the primary key
+        rating=rng.integers(1, 6, size),
+        rating_count=rng.permutation(size),
+    )
+    column = getattr(catalog, by).astype(np.float64)
+    expected = sorted(range(size), key=lambda i: (column[i] if ascending else -column[i], -catalog.rating_count[i]))
+    assert catalog.top(by, 10, ascending).tolist() == expected[:10]
+
+
+def test_aggregate(catalog):
+    stats = catalog.aggregate()
+    assert stats["electronics"] == {
+        "count": 3, "min_price": 64.0, "mean_price": 257.33, "max_price": 599.0, "mean_rating": 4.17,
+    }
+    assert stats["jewelery"]["min_price"] == 9.99 and stats["jewelery"]["max_price"] == 695.0
+
+
+def test_aggregate_skips_empty_categories(catalog):
+    stats = catalog.aggregate(catalog.mask(max_price=50))
+    assert set(stats) == {"jewelery", "men's clothing"}
+    assert catalog.aggregate(catalog.mask(category="toys")) == {}
+
+
+def test_save_and_load_round_trip(catalog, tmp_path):
+    assert not ProductCatalog.exists(str(tmp_path))
+    catalog.save(str(tmp_path))
+    loaded = ProductCatalog.load(str(tmp_path))
+    assert loaded.categories == catalog.categories
+    assert loaded.rows(range(len(loaded))) == catalog.rows(range(len(catalog)))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_load_missing_catalog(tmp_path):
+    with pytest.raises(AppException):
+        ProductCatalog.load(str(tmp_path))
+
+
+# ========== SERVICE ========== #
+def test_context_for_products(catalog):
+    service = CatalogService(catalog, category_aliases={"gadgets": "electronics"})
+    doc = service.context_for("2 cheapest gadgets under 500")
+    assert doc.metadata["source"] == "catalog"
+    assert doc.page_content.splitlines() == [
+        "Product catalog, 2 cheapest products in electronics under $500:",
+        "1. USB Drive (electronics) - $64.0, rating 4.8 from 900 reviews",
+        "2. SSD 1TB (electronics) - $109.0, rating 4.8 from 319 reviews",
+    ]
+
+
+def test_context_for_categories(catalog):
+    doc = CatalogService(catalog).context_for("What categories do you have?")
+    lines = doc.page_content.splitlines()
+    assert lines[0] == "Product catalog categories:"
+    assert lines[1] == "- electronics: 3 products, $64.0-$599.0, avg rating 4.17"
+
+
+def test_context_for_no_matches_and_non_catalog_questions(catalog):
+    service = CatalogService(catalog)
+    assert service.context_for("cheapest electronics under 10").page_content.endswith("No matching products.")
+    assert service.context_for("does the backpack fit a laptop?") is None
+
+
+def test_catalog_built_after_a_miss_is_picked_up(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_service, "CATALOG_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog_service, "_catalog_service", None)
+    assert catalog_service.get_catalog_service() is None      # worker started before ingestion
+
+    catalog.save(str(tmp_path))
+    service = catalog_service.get_catalog_service()
+    assert service is not None and len(service.catalog) == 7
+    assert catalog_service.get_catalog_service() is service   # a hit is cached
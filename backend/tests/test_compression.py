@@ -0,0 +1,111 @@
+# backend/tests/test_compression.py
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from utils.compression import CompressionMiddleware, accepted_encodings
+
+CONFIG = {"minimum_size": 100, "brotli": False}
+BIG = b'{"text": "' + b"lorem ipsum " * 200 + b'"}'
+
+
+def response_app(body: bytes = BIG, content_type: bytes = b"application/json", status: int = 200, extra_headers=()):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *extra_headers]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def call(app, accept_encoding: str = "gzip", method: str = "GET", config: dict = CONFIG) -> list:
+    sent = []
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    scope = {"type": "http", "method": method, "path": "/", "headers": headers}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, config)(scope, receive, send))
+    return sent
+
+
+def headers_of(messages) -> dict:
+    return {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+
+
+def body_of(messages) -> bytes:
+    return b"".join(m.get("body", b"") for m in messages[1:])
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+    ("GZIP;q=0.5", {"gzip"}),
+    ("gzip;q=0, br", {"br"}),
+    ("gzip;q=0.0", set()),
+    ("gzip;q=abc", set()),
+    ("", set()),
+])
+def test_accepted_encodings(header, expected):
+    assert accepted_encodings(header) == expected
+
+
+def test_large_json_is_gzipped():
+    messages = call(response_app())
+    headers = headers_of(messages)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body_of(messages)) < len(BIG)
+    assert gzip.decompress(body_of(messages)) == BIG
+
+
+SMALL = b'{"ok": true}'
+
+
+@pytest.mark.parametrize("body, app, kwargs", [
+    (SMALL, response_app(SMALL), {}),                                              # below minimum_size
+    (BIG, response_app(content_type=b"audio/mpeg"), {}),                           # not in the allowlist
+    (BIG, response_app(extra_headers=[(b"content-encoding", b"identity")]), {}),   # already encoded
+    (b"", response_app(b"", status=304), {}),
+    (BIG, response_app(), {"accept_encoding": None}),
+    (BIG, response_app(), {"accept_encoding": "identity"}),
+    (BIG, response_app(), {"accept_encoding": "br"}),                              # brotli disabled
+    (BIG, response_app(), {"method": "HEAD"}),
+])
+def test_passthrough(body, app, kwargs):
+    messages = call(app, **kwargs)
+    assert headers_of(messages).get("content-encoding") != "gzip"
+    assert body_of(messages) == body
+
+
+def test_charset_parameter_does_not_block_compression():
+    messages = call(response_app(content_type=b"text/plain; charset=utf-8"))
+    assert headers_of(messages)["content-encoding"] == "gzip"
+
+
+def test_streamed_chunks_are_flushed_one_by_one():
+    lines = [b'{"index": %d, "response": "%s"}\n' % (i, b"x" * 50) for i in range(5)]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    messages = call(app)
+    headers = headers_of(messages)
+    assert headers["content-encoding"] == "gzip" and "content-length" not in headers
+
+    # Every chunk decodes to its line on its own, before the stream ends
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for line, message in zip(lines, messages[1:]):
+        assert message["more_body"] is True
+        assert decoder.decompress(message["body"]) == line
+    assert decoder.decompress(messages[-1]["body"]) == b""
+    assert decoder.eof
@@ -0,0 +1,100 @@
+# backend/tests/test_history_batch.py
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import db.chat_history_setup as chat_history_setup
+from api.history_routes import MAX_BATCH_SIZE, history_router
+from benchmarks.fakes import InMemoryDatabase
+from db.chat_history_setup import COLLECTION_NAME, insert_messages
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    database = InMemoryDatabase()
+    monkeypatch.setattr(chat_history_setup, "connect_to_database", lambda: database)
+    return database.get_collection(COLLECTION_NAME)
+
+
+def message(message_id: str, text: str = "hi") -> dict:
+    return {"id": message_id, "role": "user", "text": text, "timestamp": "2024-01-01T00:00:00"}
+
+
+def stored(collection) -> list:
+    return sorted(doc["id"] for doc in collection.find({}))
+
+
+def test_batch_is_inserted_with_deterministic_ids(collection):
+    result = insert_messages("s1", [message("a"), message("b")])
+    assert result == {"inserted": ["a", "b"], "skipped": []}
+    assert sorted(doc["_id"] for doc in collection.find({"session_id": "s1"})) == ["s1:a", "s1:b"]
+
+
+def test_repeated_ids_in_a_batch_keep_the_first(collection):
+    result = insert_messages("s1", [message("a", "first"), message("b"), message("a", "second")])
+    assert result == {"inserted": ["a", "b"], "skipped": []}
+    assert [doc["text"] for doc in collection.find({"id": "a"})] == ["first"]
+
+
+def test_retry_skips_stored_messages(collection):
+    insert_messages("s1", [message("a"), message("b")])
+    result = insert_messages("s1", [message("a"), message("b"), message("c")])
+    assert result == {"inserted": ["c"], "skipped": ["a", "b"]}
+    assert stored(collection) == ["a", "b", "c"]
+
+
+def test_same_message_id_in_another_session_is_not_a_duplicate(collection):
+    insert_messages("s1", [message("a")])
+    assert insert_messages("s2", [message("a")]) == {"inserted": ["a"], "skipped": []}
+
+
+def test_concurrent_retries_store_each_message_once(collection):
+    batch = [message(str(i)) for i in range(20)]
+    results, start = [], threading.Barrier(4)
+
+    def retry():
+        start.wait()
+        results.append(insert_messages("s1", batch))
+
+    threads = [threading.Thread(target=retry) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stored(collection) == sorted(str(i) for i in range(20))
+    assert sorted(sum((r["inserted"] for r in results), [])) == sorted(str(i) for i in range(20))
+    assert all(len(r["inserted"]) + len(r["skipped"]) == 20 for r in results)
+
+
+def test_other_insert_errors_are_raised(collection, monkeypatch):
+    def broken(documents, ordered=True):
+        raise RuntimeError("astra down")
+    monkeypatch.setattr(collection, "insert_many", broken)
+    with pytest.raises(RuntimeError):
+        insert_messages("s1", [message("a")])
+
+
+# ========== ENDPOINT ========== #
+@pytest.fixture
+def client(collection) -> TestClient:
+    app = FastAPI()
+    app.include_router(history_router)
+    return TestClient(app)
+
+
+def test_endpoint_reports_inserted_and_skipped(client):
+    batch = {"messages": [message("a"), message("b")]}
+    assert client.post("/api/history/s1/batch", json=batch).json() == {
+        "status": "success", "inserted": ["a", "b"], "skipped": [],
+    }
+    assert client.post("/api/history/s1/batch", json=batch).json()["skipped"] == ["a", "b"]
+
+
+@pytest.mark.parametrize("count, status", [(0, 422), (1, 200), (MAX_BATCH_SIZE, 200), (MAX_BATCH_SIZE + 1, 422)])
+def test_endpoint_batch_size_limit(client, count, status):
+    batch = {"messages": [message(str(i)) for i in range(count)]}
+    assert client.post("/api/history/s1/batch", json=batch).status_code == status
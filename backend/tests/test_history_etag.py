@@ -0,0 +1,70 @@
+# backend/tests/test_history_etag.py
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.history_routes as history_routes
+from api.history_routes import _etag_matches, history_router
+
+HISTORY = [{"id": "1", "role": "user", "text": "hi", "timestamp": "2024-01-01T00:00:00"}]
+
+
+@pytest.fixture
+def stored(monkeypatch) -> list:
+    docs = list(HISTORY)
+    monkeypatch.setattr(history_routes, "fetch_history", lambda session_id: docs)
+    return docs
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(history_router)
+    return TestClient(app)
+
+
+def test_history_has_a_weak_etag(client, stored):
+    response = client.get("/api/history/s1")
+    assert response.status_code == 200
+    assert response.json()["history"][0]["text"] == "hi"
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_unchanged_history_is_not_modified(client, stored):
+    etag = client.get("/api/history/s1").headers["etag"]
+    response = client.get("/api/history/s1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_changed_history_gets_a_new_etag(client, stored):
+    etag = client.get("/api/history/s1").headers["etag"]
+    stored.append({"id": "2", "role": "bot", "text": "hello", "timestamp": "2024-01-01T00:00:01"})
+    response = client.get("/api/history/s1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["history"]) == 2
+
+
+def test_fetch_failure_is_a_500(client, monkeypatch):
+    def broken(session_id):
+        raise RuntimeError("astra down")
+    monkeypatch.setattr(history_routes, "fetch_history", broken)
+    assert client.get("/api/history/s1").status_code == 500
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('W/"abc"', True),
+    ('"abc"', True),                       # weak comparison ignores W/
+    ('"xyz", W/"abc"', True),
+    ('"xyz","def"', False),
+    ('W/"abcd"', False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert _etag_matches(if_none_match, 'W/"abc"') is expected
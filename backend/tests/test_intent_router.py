@@ -0,0 +1,179 @@
+# backend/tests/test_intent_router.py
+
+import pytest
+
+from ingestion.catalog import ProductCatalog
+from services.catalog_service import CatalogService, _explain
+from services.intent_router import IntentRouter
+
+CATALOG = CatalogService(
+    ProductCatalog(
+        ids=[1, 2, 3, 4],
+        titles=["Rain Jacket", "Silver Ring", "SSD 1TB", "Monitor"],
+        categories=["electronics", "jewelery", "men's clothing"],
+        category_codes=[2, 1, 0, 0],
+        price=[55.99, 9.99, 109.0, 599.0],
+        rating=[3.8, 3.0, 4.8, 2.9],
+        rating_count=[120, 70, 319, 250],
+    ),
+    category_aliases={"gadgets": "electronics"},
+)
+TEMPLATES = {"greeting": "Hello!", "thanks": "You're welcome!", "goodbye": "Bye!", "help": "I can help."}
+
+
+class FakeEmbeddings:
+    """Bag-of-words vectors over a tiny vocabulary."""
+
+    VOCAB = ("hello", "hey", "thanks", "return", "refund", "shipping", "deliver", "categories", "sell")
+
+    def __init__(self):
+        self.queries = 0
+
+    def _vector(self, text):
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(term)) for term in self.VOCAB]
+
+    def embed_query(self, text):
+        self.queries += 1
+        return self._vector(text)
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+
+def make_router(embeddings=None, catalog=CATALOG, **config) -> IntentRouter:
+    return IntentRouter(embeddings, lambda: catalog, {"templates": TEMPLATES, **config})
+
+
+# ========== PARSING ========== #
+@pytest.mark.parametrize("query, expected", [
+    ("3 cheapest gadgets under 500", {
+        "kind": "products", "category": "electronics", "min_price": None, "max_price": 500.0,
+        "sort": "price", "ascending": True, "n": 3,
+    }),
+    ("top 2 most expensive jewelery", {"category": "jewelery", "sort": "price", "ascending": False, "n": 2}),
+    ("best rated men's clothing over $50", {"category": "men's clothing", "min_price": 50.0, "sort": "rating"}),
+    ("products under ₹200", {"category": None, "max_price": 200.0, "sort": "rating", "ascending": False, "n": 5}),
+    ("most popular items", {"sort": "rating_count", "ascending": False}),
+    ("top 50 cheapest products", {"n": 20}),
+    ("What categories do you have?", {"kind": "categories"}),
+])
+def test_parse(query, expected):
+    spec = CATALOG.parse(query)
+    assert {key: spec[key] for key in expected} == expected
+    assert spec["unexplained"] == []
+    assert spec["coverage"] == 1.0
+
+
+@pytest.mark.parametrize("query", ["does this jacket keep me dry?", "hello", "i want to return my order", ""])
+def test_parse_ignores_non_catalog_questions(query):
+    assert CATALOG.parse(query) is None
+
+
+@pytest.mark.parametrize("query, unexplained", [
+    ("show me the cheapest headphones", ["headphones"]),
+    ("top rated earbuds", ["earbuds"]),
+    ("any good earphones under 500?", ["good", "earphones"]),
+    ("which category is this bag in", ["this", "bag"]),
+    ("cheapest headphones with good bass", ["headphones", "good", "bass"]),
+    ("cheapest electronics", []),
+])
+def test_parse_reports_unexplained_words(query, unexplained):
+    assert CATALOG.parse(query)["unexplained"] == unexplained
+
+
+def test_explain_coverage():
+    assert _explain("", []) == {"coverage": 0.0, "unexplained": []}
+    assert _explain("the red bag", []) == {"coverage": 0.33, "unexplained": ["red", "bag"]}
+
+
+# ========== ROUTING ========== #
+@pytest.mark.parametrize("query, intent", [
+    ("hi", "greeting"),
+    ("Good morning there!", "greeting"),
+    ("thank you so much", "thanks"),
+    ("bye", "goodbye"),
+    ("what can you do?", "help"),
+])
+def test_small_talk_rules(query, intent):
+    route = make_router().route(query)
+    assert (route.intent, route.method, route.answer) == (intent, "rule", TEMPLATES[intent])
+
+
+def test_small_talk_only_matches_the_whole_message():
+    route = make_router().route("hi, is the ssd compatible with a mac?")
+    assert route.intent == "product_qa" and route.answer is None
+
+
+@pytest.mark.parametrize("query, intent", [
+    ("cheapest electronics", "catalog_lookup"),
+    ("2 cheapest gadgets under 500", "catalog_lookup"),
+    ("what categories do you have", "categories"),
+])
+def test_fully_parsed_catalog_questions_are_answered_from_the_catalog(query, intent):
+    route = make_router().route(query)
+    assert route.intent == intent and route.answer is not None
+
+
+def test_catalog_answer_lists_the_products():
+    answer = make_router().route("2 cheapest gadgets").answer
+    assert answer.splitlines() == [
+        "Here are the 2 cheapest products in electronics:",
+        "1. SSD 1TB - $109.0 (rated 4.8/5 by 319 customers)",
+        "2. Monitor - $599.0 (rated 2.9/5 by 250 customers)",
+    ]
+
+
+def test_catalog_answer_without_matches():
+    assert make_router().route("cheapest jewelery under 5").answer.startswith("I couldn't find any products")
+
+
+@pytest.mark.parametrize("query", [
+    "show me the cheapest headphones",
+    "top rated earbuds",
+    "any good earphones under 500?",
+    "which category is this bag in",
+])
+def test_partly_parsed_catalog_questions_go_to_the_llm(query):
+    route = make_router().route(query, embed=False)
+    assert route.intent in ("catalog_lookup", "categories")
+    assert route.answer is None
+
+
+def test_no_catalog_means_no_catalog_answers():
+    route = make_router(catalog=None).route("cheapest electronics", embed=False)
+    assert route.intent == "product_qa" and route.answer is None
+
+
+# ========== CENTROIDS ========== #
+EXEMPLARS = {
+    "returns": ["how do i return this", "i want a refund"],
+    "shipping": ["when will you deliver", "shipping time"],
+    "product_qa": ["does it sell well"],
+}
+
+
+def test_centroid_match_uses_the_template_and_keeps_the_vector():
+    embeddings = FakeEmbeddings()
+    router = make_router(embeddings, exemplars=EXEMPLARS, threshold=0.6,
+                         templates={**TEMPLATES, "returns": "Returns are free within 30 days."})
+    route = router.route("can i get a refund")
+    assert (route.intent, route.method, route.answer) == ("returns", "centroid", "Returns are free within 30 days.")
+    assert route.query_vector == embeddings._vector("can i get a refund")
+
+
+def test_centroid_below_threshold_goes_to_the_llm():
+    router = make_router(FakeEmbeddings(), exemplars=EXEMPLARS, threshold=0.99, templates={"shipping": "2-5 days."})
+    route = router.route("shipping and return")
+    assert route.method == "centroid" and route.answer is None
+
+
+def test_embed_false_skips_the_centroid_step():
+    embeddings = FakeEmbeddings()
+    route = make_router(embeddings, exemplars=EXEMPLARS).route("i want a refund", embed=False)
+    assert route.method == "none" and embeddings.queries == 0
+
+
+def test_zero_vector_falls_through():
+    route = make_router(FakeEmbeddings(), exemplars=EXEMPLARS).route("xyz")
+    assert route.intent == "product_qa" and route.answer is None
@@ -0,0 +1,111 @@
+# backend/tests/test_responses.py
+
+import asyncio
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from utils.responses import audio_response, multipart_response, negotiate
+
+VOICE_OFFERS = ["audio/mpeg", "multipart/mixed", "application/json"]
+AUDIO = bytes(range(256)) * 4  # 1024 bytes
+
+
+async def _collect(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def body_of(response) -> bytes:
+    return asyncio.run(_collect(response))
+
+
+# ========== NEGOTIATION ========== #
+@pytest.mark.parametrize("accept, expected", [
+    (None, "application/json"),
+    ("", "application/json"),
+    ("*/*", "application/json"),                              # browser fetch() default
+    ("text/html,application/xhtml+xml,*/*;q=0.8", "application/json"),
+    ("audio/mpeg", "audio/mpeg"),
+    ("audio/*", "audio/mpeg"),
+    ("audio/mpeg, */*", "audio/mpeg"),                        # named explicitly beats the wildcard
+    ("multipart/mixed", "multipart/mixed"),
+    ("application/json, audio/mpeg", "application/json"),     # tie: the fallback wins
+    ("audio/mpeg, multipart/mixed", "audio/mpeg"),            # tie between others: earlier offer
+    ("audio/mpeg;q=0.5, application/json;q=0.4", "audio/mpeg"),
+    ("audio/mpeg;q=0, */*", "application/json"),              # q=0 means "not acceptable"
+    ("text/html", "application/json"),                        # nothing matches: fallback
+    ("AUDIO/MPEG", "audio/mpeg"),
+    ("audio/mpeg;q=abc, application/json", "application/json"),
+])
+def test_negotiate(accept, expected):
+    assert negotiate(accept, VOICE_OFFERS) == expected
+
+
+# ========== RANGE RESPONSES ========== #
+def test_audio_response_without_range_returns_everything():
+    response = audio_response(AUDIO)
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(AUDIO))
+    assert body_of(response) == AUDIO
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=100-", 100, 1023),
+    ("bytes=1000-5000", 1000, 1023),   # end clamped to the last byte
+    ("bytes=-24", 1000, 1023),         # suffix range
+    ("bytes=-5000", 0, 1023),          # suffix longer than the body
+    (" bytes=5-5 ", 5, 5),
+])
+def test_audio_response_partial(range_header, start, end):
+    response = audio_response(AUDIO, range_header)
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+    assert body_of(response) == AUDIO[start:end + 1]
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1024-", "bytes=2000-3000", "bytes=10-5"])
+def test_audio_response_unsatisfiable_range(range_header):
+    with pytest.raises(HTTPException) as info:
+        audio_response(AUDIO, range_header)
+    assert info.value.status_code == 416
+    assert info.value.headers["Content-Range"] == f"bytes */{len(AUDIO)}"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=0-1,5-9", "items=0-9", "bytes=-", "garbage"])
+def test_audio_response_ignores_unsupported_ranges(range_header):
+    response = audio_response(AUDIO, range_header)
+    assert response.status_code == 200
+    assert body_of(response) == AUDIO
+
+
+def test_audio_response_streams_in_chunks():
+    audio = b"x" * (150 * 1024)
+    chunks = asyncio.run(_chunks(audio_response(audio)))
+    assert len(chunks) == 3
+    assert b"".join(chunks) == audio
+
+
+async def _chunks(response) -> list:
+    return [chunk async for chunk in response.body_iterator]
+
+
+# ========== MULTIPART ========== #
+def test_multipart_response_json_part_first_then_audio():
+    response = multipart_response({"ai_response": "hi"}, b"MP3DATA")
+    boundary = response.media_type.split("boundary=")[1]
+    parts = response.body.split(f"--{boundary}".encode())
+    assert parts[0] == b"" and parts[-1] == b"--\r\n"
+    assert parts[1].startswith(b"\r\nContent-Type: application/json\r\n\r\n")
+    assert orjson.loads(parts[1].split(b"\r\n\r\n", 1)[1]) == {"ai_response": "hi"}
+    assert parts[2].startswith(b"\r\nContent-Type: audio/mpeg\r\nContent-Length: 7\r\n\r\nMP3DATA")
+
+
+def test_multipart_response_without_audio_has_only_the_json_part():
+    response = multipart_response({"has_audio": False}, b"")
+    boundary = response.media_type.split("boundary=")[1]
+    assert response.body.count(f"--{boundary}".encode()) == 2
+    assert b"audio/mpeg" not in response.body
@@ -0,0 +1,174 @@
+# backend/tests/test_speculative_retrieval.py
+
+import asyncio
+import threading
+
+import pytest
+
+import services.voice_session as voice_session
+from services.speculative_retrieval import SpeculationStats, SpeculativeRetriever, token_overlap
+from services.voice_session import VoiceSession
+
+
+class FakeRetriever:
+    def __init__(self, fail: bool = False):
+        self.queries = []
+        self.fail = fail
+
+    def retrieve(self, query: str) -> list:
+        self.queries.append(query)
+        if self.fail:
+            raise RuntimeError("vector store down")
+        return [f"doc for {query}"]
+
+
+def make_speculator(retriever=None, **kwargs) -> SpeculativeRetriever:
+    retriever = retriever or FakeRetriever()
+    return SpeculativeRetriever(retriever.retrieve, stats=SpeculationStats(), **kwargs)
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("show me red shoes", "Show me red shoes!", 1.0),
+    ("red shoes", "blue shirts", 0.0),
+    ("red shoes", "red shoes please", 2 / 3),
+    ("", "anything", 0.0),
+])
+def test_token_overlap(a, b, expected):
+    assert token_overlap(a, b) == pytest.approx(expected)
+
+
+def test_only_stable_partials_launch_once():
+    async def scenario():
+        speculator = make_speculator(stable_partials=2)
+        speculator.on_partial("show me")
+        speculator.on_partial("show me red")
+        assert speculator.stats.launched == 0
+        speculator.on_partial("Show me red.")   # same words, different case/punctuation
+        speculator.on_partial("show me red")    # already speculated
+        assert speculator.stats.launched == 1
+        speculator.cancel_all()
+    asyncio.run(scenario())
+
+
+def test_matching_final_transcript_reuses_the_speculation():
+    async def scenario():
+        retriever = FakeRetriever()
+        speculator = make_speculator(retriever, stable_partials=1)
+        speculator.on_partial("show me red running shoes")
+        docs = await speculator.resolve("show me red running shoes")
+        return retriever, speculator, docs
+
+    retriever, speculator, docs = asyncio.run(scenario())
+    assert docs == ["doc for show me red running shoes"]
+    assert retriever.queries == ["show me red running shoes"]
+    assert speculator.stats.hits == 1 and speculator.stats.wasted == 0
+
+
+def test_diverging_final_transcript_is_a_miss():
+    async def scenario():
+        speculator = make_speculator(stable_partials=1)
+        speculator.on_partial("show me red")
+        return speculator, await speculator.resolve("what laptops do you sell")
+
+    speculator, docs = asyncio.run(scenario())
+    assert docs is None
+    assert speculator.stats.misses == 1 and speculator.stats.wasted == 1
+
+
+def test_failed_speculation_falls_back_to_a_miss():
+    async def scenario():
+        speculator = make_speculator(FakeRetriever(fail=True), stable_partials=1)
+        speculator.on_partial("red shoes")
+        return speculator, await speculator.resolve("red shoes")
+
+    speculator, docs = asyncio.run(scenario())
+    assert docs is None
+    assert speculator.stats.misses == 1
+
+
+def test_max_inflight_discards_the_oldest_speculation():
+    async def scenario():
+        speculator = make_speculator(stable_partials=1, max_inflight=2)
+        for text in ("red", "red shoes", "red shoes size ten"):
+            speculator.on_partial(text)
+        keys = list(speculator._speculations)
+        speculator.cancel_all()
+        return speculator, keys
+
+    speculator, keys = asyncio.run(scenario())
+    assert keys == ["red shoes", "red shoes size ten"]
+    assert speculator.stats.launched == 3
+    assert speculator.stats.wasted == 3
+
+
+def test_cancel_all_cancels_running_retrievals():
+    release = threading.Event()
+
+    def slow_retrieve(query):
+        release.wait(5)
+        return []
+
+    async def scenario():
+        speculator = SpeculativeRetriever(slow_retrieve, stable_partials=1, stats=SpeculationStats())
+        speculator.on_partial("red shoes")
+        task = speculator._speculations["red shoes"].task
+        speculator.cancel_all()
+        release.set()
+        await asyncio.gather(task, return_exceptions=True)
+        return speculator, task
+
+    speculator, task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert speculator._speculations == {}
+    assert speculator.stats.wasted == 1
+
+
+# ========== PER-UTTERANCE ISOLATION ========== #
+class FakeChatbot:
+    def __init__(self):
+        self.retriever = FakeRetriever()
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, payload: dict):
+        self.sent.append(payload)
+
+
+def test_each_turn_keeps_its_own_speculations(monkeypatch):
+    monkeypatch.setitem(voice_session.WS_CONFIG, "speculation", {"enabled": True, "stable_partials": 1})
+    answered = []
+
+    async def fake_answer(self, audio, speculator):
+        answered.append((audio, speculator, await speculator.resolve("red running shoes")))
+
+    monkeypatch.setattr(VoiceSession, "_answer_utterance", fake_answer)
+
+    async def scenario():
+        session = VoiceSession(FakeWebSocket(), session_id="s1", chatbot=FakeChatbot())
+        session.speculator = session._new_speculator()
+        first = session.speculator
+        session.audio.extend(b"utterance one")
+        await session.on_partial_transcript("red running shoes", first)
+
+        await session.on_end_of_utterance()
+        second = session.speculator
+        # A partial of the first utterance arriving late must not seed the second one
+        await session.on_partial_transcript("red running shoes", first)
+        await session._turn_task
+        return session, first, second
+
+    session, first, second = asyncio.run(scenario())
+    assert second is not first
+    assert second._speculations == {}
+    assert answered == [(b"utterance one", first, ["doc for red running shoes"])]
+    assert first._speculations == {}   # released when the turn finished
+    assert [m["type"] for m in session.websocket.sent] == ["partial_transcript", "partial_transcript"]
+
+
+def test_speculation_disabled_gives_no_speculator(monkeypatch):
+    monkeypatch.setitem(voice_session.WS_CONFIG, "speculation", {"enabled": False})
+    session = VoiceSession(FakeWebSocket(), session_id="s1", chatbot=FakeChatbot())
+    assert session._new_speculator() is None
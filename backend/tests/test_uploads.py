@@ -0,0 +1,161 @@
+# backend/tests/test_uploads.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from utils.uploads import MAX_FIELD_SIZE, AudioUpload, sniff_audio_format
+
+WEBM = b"\x1a\x45\xdf\xa3" + b"\x00" * 60
+BOUNDARY = "testboundary"
+
+
+def make_request(body: bytes, content_type: str, chunk_size: int = 7, content_length: bool = True) -> Request:
+    """Starlette request whose body arrives in ``chunk_size`` pieces."""
+    headers = [(b"content-type", content_type.encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers}, receive)
+
+
+def multipart(parts: dict) -> tuple[bytes, str]:
+    body = b""
+    for name, value in parts.items():
+        filename = b'; filename="a.webm"' if name == "file" else b""
+        body += (
+            f"--{BOUNDARY}\r\n".encode()
+            + b'Content-Disposition: form-data; name="' + name.encode() + b'"' + filename + b"\r\n\r\n"
+            + value + b"\r\n"
+        )
+    body += f"--{BOUNDARY}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def read_all(upload: AudioUpload) -> bytes:
+    async def _read():
+        return b"".join([chunk async for chunk in upload])
+    return asyncio.run(_read())
+
+
+# ========== SNIFFING ========== #
+@pytest.mark.parametrize("head, expected", [
+    (b"\x1a\x45\xdf\xa3" + b"\x00" * 12, "webm"),
+    (b"OggS\x00\x02" + b"\x00" * 10, "ogg"),
+    (b"RIFF\x24\x08\x00\x00WAVEfmt ", "wav"),
+    (b"RIFF\x24\x08\x00\x00AVI LIST", None),
+    (b"fLaC\x00\x00\x00\x22", "flac"),
+    (b"\x00\x00\x00\x20ftypM4A ", "mp4"),
+    (b"ID3\x04\x00\x00\x00\x00", "mp3"),
+    (b"\xff\xfb\x90\x64", "mp3"),   # MPEG-1 layer III frame
+    (b"\xff\xf1\x50\x80", "aac"),   # ADTS
+    (b"%PDF-1.7", None),
+    (b"\xff", None),
+    (b"", None),
+])
+def test_sniff_audio_format(head, expected):
+    assert sniff_audio_format(head) == expected
+
+
+# ========== RAW AUDIO BODIES ========== #
+def test_raw_audio_body_is_streamed_back_unchanged():
+    upload = AudioUpload(make_request(WEBM, "audio/webm"))
+    assert read_all(upload) == WEBM
+    assert upload.format == "webm"
+    assert upload.size == len(WEBM)
+
+
+def test_short_body_is_sniffed_at_the_end():
+    body = b"OggS\x00\x02"
+    upload = AudioUpload(make_request(body, "audio/ogg"))
+    assert read_all(upload) == body
+    assert upload.format == "ogg"
+
+
+def test_open_returns_format_before_the_rest_is_read():
+    upload = AudioUpload(make_request(WEBM, "audio/webm", chunk_size=4))
+
+    async def _open():
+        stream = await upload.open()
+        fmt, size = upload.format, upload.size
+        rest = b"".join([chunk async for chunk in stream])
+        return fmt, size, rest
+
+    fmt, size, rest = asyncio.run(_open())
+    assert fmt == "webm"
+    assert size < len(WEBM)
+    assert rest == WEBM
+
+
+# ========== LIMITS AND REJECTIONS ========== #
+def test_content_length_over_limit_is_rejected_before_reading():
+    body = WEBM * 4
+    with pytest.raises(HTTPException) as info:
+        AudioUpload(make_request(body, "audio/webm"), max_bytes=len(body) - MAX_FIELD_SIZE - 1)
+    assert info.value.status_code == 413
+
+
+def test_running_size_over_limit_is_rejected_while_streaming():
+    body = WEBM * 4
+    upload = AudioUpload(make_request(body, "audio/webm", content_length=False), max_bytes=100)
+    with pytest.raises(HTTPException) as info:
+        read_all(upload)
+    assert info.value.status_code == 413
+    assert upload.size <= 100 + 7
+
+
+def test_unknown_format_is_rejected():
+    upload = AudioUpload(make_request(b"%PDF-1.7" + b"\x00" * 40, "audio/webm"))
+    with pytest.raises(HTTPException) as info:
+        read_all(upload)
+    assert info.value.status_code == 415
+
+
+def test_empty_body_is_rejected():
+    upload = AudioUpload(make_request(b"", "audio/webm"))
+    with pytest.raises(HTTPException) as info:
+        read_all(upload)
+    assert info.value.status_code == 400
+    assert info.value.detail == "Empty audio file"
+
+
+@pytest.mark.parametrize("content_type", ["application/json", "multipart/form-data", "text/plain"])
+def test_unexpected_content_type_is_rejected(content_type):
+    upload = AudioUpload(make_request(b"{}", content_type))
+    with pytest.raises(HTTPException) as info:
+        read_all(upload)
+    assert info.value.status_code == 400
+
+
+# ========== MULTIPART ========== #
+def test_multipart_yields_the_file_and_collects_other_fields():
+    body, content_type = multipart({"session_id": b"abc-123", "file": WEBM, "voice": b"alloy"})
+    upload = AudioUpload(make_request(body, content_type))
+    assert read_all(upload) == WEBM
+    assert upload.format == "webm"
+    assert upload.fields == {"session_id": "abc-123", "voice": "alloy"}
+
+
+def test_multipart_truncates_oversized_fields():
+    body, content_type = multipart({"note": b"x" * (MAX_FIELD_SIZE + 100), "file": WEBM})
+    upload = AudioUpload(make_request(body, content_type, chunk_size=512))
+    read_all(upload)
+    assert len(upload.fields["note"]) <= MAX_FIELD_SIZE
+
+
+def test_multipart_without_file_part_is_empty():
+    body, content_type = multipart({"session_id": b"abc"})
+    upload = AudioUpload(make_request(body, content_type))
+    with pytest.raises(HTTPException) as info:
+        read_all(upload)
+    assert info.value.status_code == 400
@@ -0,0 +1,174 @@
+# backend/tests/test_voice_session.py
+
+import asyncio
+
+import pytest
+
+import services.voice_session as voice_session
+from services.voice_executor import VoiceExecutor
+from services.voice_session import VoiceSession
+from utils.admission import RouteClass
+
+WEBM = b"\x1a\x45\xdf\xa3" + b"\x00" * 12
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, payload: dict):
+        self.sent.append(payload)
+
+    async def send_bytes(self, data: bytes):
+        self.sent.append(data)
+
+
+@pytest.fixture
+def executor(monkeypatch) -> VoiceExecutor:
+    executor = VoiceExecutor(max_pending=4)
+    monkeypatch.setattr(voice_session, "get_voice_executor", lambda: executor)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def route_class(monkeypatch) -> RouteClass:
+    route_class = RouteClass({"name": "voice", "max_in_flight": 1, "max_queue": 0, "serialize_sessions": True},
+                             session_queue=2)
+    monkeypatch.setattr(voice_session, "get_route_class", lambda name: route_class)
+    return route_class
+
+
+def make_session(monkeypatch, transcripts: list) -> VoiceSession:
+    session = VoiceSession(FakeWebSocket(), session_id="s1", chatbot=object())
+
+    async def transcribe(audio, timings=None):
+        transcripts.append(len(audio))
+        return "red shoes"
+
+    async def answer(text, timings, speculator=None):
+        await session.send_json({"type": "done", "answer": text})
+
+    monkeypatch.setattr(session, "_transcribe", transcribe)
+    monkeypatch.setattr(session, "answer", answer)
+    return session
+
+
+# ========== TURN ADMISSION ========== #
+def test_turn_runs_with_voice_slots_held(monkeypatch, executor, route_class):
+    held = []
+
+    async def scenario():
+        session = make_session(monkeypatch, [])
+
+        async def answer(text, timings, speculator=None):
+            held.append((route_class.limiter.in_flight, len(route_class.sessions), executor.pending))
+
+        monkeypatch.setattr(session, "answer", answer)
+        await session._answer_utterance(WEBM, None)
+        return session
+
+    session = asyncio.run(scenario())
+    assert held == [(1, 1, 1)]
+    assert route_class.limiter.in_flight == 0 and len(route_class.sessions) == 0 and executor.pending == 0
+    assert session.websocket.sent == [{"type": "transcript", "text": "red shoes"}]
+
+
+def test_turn_is_shed_when_the_voice_class_is_full(monkeypatch, executor, route_class):
+    transcripts = []
+
+    async def scenario():
+        session = make_session(monkeypatch, transcripts)
+        async with route_class.admit("other-session"):   # an HTTP voice turn holds the only slot
+            await session._answer_utterance(WEBM, None)
+        return session
+
+    session = asyncio.run(scenario())
+    assert transcripts == []
+    [error] = session.websocket.sent
+    assert error["type"] == "error" and error["status_code"] == 503 and error["retry_after"] >= 1
+
+
+def test_turn_is_shed_when_the_executor_is_saturated(monkeypatch, executor, route_class):
+    executor.max_pending = 0
+
+    async def scenario():
+        session = make_session(monkeypatch, [])
+        await session._answer_utterance(WEBM, None)
+        return session
+
+    session = asyncio.run(scenario())
+    assert session.websocket.sent == [{
+        "type": "error", "message": "Voice service is busy, please retry shortly.", "status_code": 503,
+        "retry_after": 1,
+    }]
+    assert route_class.limiter.in_flight == 0 and len(route_class.sessions) == 0
+
+
+def test_turn_waits_for_an_http_turn_of_the_same_session(monkeypatch, executor):
+    route_class = RouteClass({"name": "voice", "max_in_flight": 4, "serialize_sessions": True}, session_queue=2)
+    monkeypatch.setattr(voice_session, "get_route_class", lambda name: route_class)
+    transcripts = []
+
+    async def scenario():
+        session = make_session(monkeypatch, transcripts)
+        release = asyncio.Event()
+
+        async def http_turn():
+            async with route_class.admit("s1"):
+                await release.wait()
+
+        http = asyncio.ensure_future(http_turn())
+        await asyncio.sleep(0)
+        turn = asyncio.ensure_future(session._answer_utterance(WEBM, None))
+        await asyncio.sleep(0.01)
+        assert transcripts == []
+        release.set()
+        await asyncio.gather(http, turn)
+
+    asyncio.run(scenario())
+    assert transcripts == [len(WEBM)]
+
+
+# ========== PARTIALS ========== #
+def feed(session, sizes: list):
+    """Grow the buffer to each size and give a finished partial a chance to run."""
+    async def scenario():
+        for size in sizes:
+            session.audio.extend(b"\x00" * (size - len(session.audio)))
+            session._last_partial = 0.0
+            session._maybe_start_partial()
+            if session._partial_task is not None:
+                await session._partial_task
+    asyncio.run(scenario())
+
+
+def test_partials_are_spaced_geometrically_and_capped(monkeypatch, executor):
+    transcripts = []
+    session = make_session(monkeypatch, transcripts)
+    session.partial_growth, session.max_partials = 2.0, 3
+    session.audio.extend(WEBM)
+    feed(session, [100, 150, 200, 300, 400, 800, 1600, 3200])
+    assert transcripts == [100, 200, 400]
+    assert executor.pending == 0
+
+
+def test_new_utterance_resets_the_partial_budget(monkeypatch, executor):
+    transcripts = []
+    session = make_session(monkeypatch, transcripts)
+    session.partial_growth, session.max_partials = 2.0, 1
+    session.audio.extend(WEBM)
+    feed(session, [100, 1000])
+    session._reset_utterance()
+    session.audio.extend(WEBM)
+    feed(session, [50])
+    assert transcripts == [100, 50]
+
+
+def test_no_partials_while_the_executor_is_saturated(monkeypatch, executor):
+    transcripts = []
+    session = make_session(monkeypatch, transcripts)
+    executor._pending = executor.max_pending
+    session.audio.extend(WEBM)
+    feed(session, [100, 1000])
+    assert transcripts == [] and session._partials == 0
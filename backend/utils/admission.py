@@ -0,0 +1,291 @@
+# backend/utils/admission.py
+
+"""
+Admission control for the API process.
+
+Without a limit, a burst admits every request at once: all of them share
+the threadpool, the LLM provider's rate limit and the CPU, so every
+request slows down together and most end up timing out. Each route class
+(``admission.route_classes`` in configuration.yaml) therefore gets:
+
+- a cap on requests in flight,
+- a bounded FIFO wait queue with a queue timeout,
+- fast shedding with 503 + ``Retry-After`` when the queue is full or the
+  wait times out.
+
+Requests that run over their class's capacity are shed at once instead of
+slowing everyone down, so throughput stays at capacity under overload.
+
+Classes with ``serialize_sessions`` also run the turns of one
+``session_id`` one at a time, so concurrent turns of a session no longer
+race on its chat history. A session with more than ``session_queue``
+turns already waiting gets 429. The session id is read from the
+``session_id`` query parameter or from the path (``session_path_patterns``).
+Form fields are not read, because that would consume the body before the
+route runs.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.responses import JSONResponse
+
+from utils.logging import get_logger
+from utils.metrics import Counter, Histogram, CallbackGauge
+
+logger = get_logger(__name__)
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected",
+    "Requests shed by admission control, by route class and reason.",
+    labelnames=("route_class", "reason"),
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds",
+    "Time admitted requests waited for a slot, by route class.",
+    labelnames=("route_class",),
+)
+
+
+class Rejected(Exception):
+    """Raised when a request is shed; carries the response to send."""
+
+    def __init__(self, status_code: int, reason: str, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.message = message
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    In-flight cap plus a bounded FIFO queue for one route class.
+
+    Runs on the worker's event loop only, so the counters need no lock.
+    ``release()`` hands the slot directly to the oldest waiter, so a new
+    arrival can never jump the queue.
+
+    Attributes:
+        name (str): Route class name (metric label).
+        max_in_flight (int): Requests allowed to run at once.
+        max_queue (int): Requests allowed to wait for a slot.
+        queue_timeout (float): Seconds a request may wait before it is shed.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        # EWMA of how long a request holds its slot, used for Retry-After
+        self._hold_seconds = 1.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is likely drained."""
+        return max(1, math.ceil(self._hold_seconds * (self.queued + 1) / self.max_in_flight))
+
+    async def acquire(self):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Rejected(503, "queue_full", "Server is busy, please retry shortly.", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the wait timed out
+                return
+            self._waiters.remove(waiter)
+            raise Rejected(503, "queue_timeout", "Server is busy, please retry shortly.", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away while queued
+            if waiter.done():
+                self.release(0.0)
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, held_seconds: float):
+        if held_seconds:
+            self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot over; in_flight stays the same
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class SessionSerializer:
+    """One-at-a-time execution of the turns of each session."""
+
+    def __init__(self, max_waiting: int):
+        self.max_waiting = max_waiting
+        self._sessions: dict[str, list] = {}  # session_id -> [lock, holders + waiters]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def acquire(self, session_id: str):
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = [asyncio.Lock(), 0]
+        elif entry[1] > self.max_waiting:
+            raise Rejected(429, "session_busy", "A previous message of this session is still being processed.", 1)
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._leave(session_id, entry)
+            raise
+
+    def release(self, session_id: str):
+        entry = self._sessions[session_id]
+        entry[0].release()
+        self._leave(session_id, entry)
+
+    def _leave(self, session_id: str, entry: list):
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._sessions[session_id]
+
+
+class RouteClass:
+    """
+    One ``admission.route_classes`` entry: its limiter and, with
+    ``serialize_sessions``, its per-session serializer.
+
+    Paths under ``exclude_prefixes`` are not admitted by the middleware;
+    their handlers take slots themselves with ``admit()``, once per unit
+    of work (e.g. per LLM call of a batch request).
+    """
+
+    def __init__(self, cfg: dict, session_queue: int):
+        self.name = cfg["name"]
+        self.prefixes = tuple(cfg.get("prefixes", []))
+        self.exclude_prefixes = tuple(cfg.get("exclude_prefixes", []))
+        self.limiter = AdmissionLimiter(
+            self.name,
+            max_in_flight=cfg.get("max_in_flight", 16),
+            max_queue=cfg.get("max_queue", 32),
+            queue_timeout=cfg.get("queue_timeout_s", 5.0),
+        )
+        self.sessions = SessionSerializer(session_queue) if cfg.get("serialize_sessions", False) else None
+
+    def matches(self, path: str) -> bool:
+        return path.startswith(self.prefixes) and not path.startswith(self.exclude_prefixes)
+
+    @asynccontextmanager
+    async def admit(self, session_id: Optional[str] = None):
+        """Hold one slot of this class (and the session's turn) for the body; raises ``Rejected`` when shed."""
+        if self.sessions is None:
+            session_id = None
+        try:
+            # Session first: a turn waiting for its own session must not hold a global slot
+            if session_id is not None:
+                await self.sessions.acquire(session_id)
+            start = time.perf_counter()
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                if session_id is not None:
+                    self.sessions.release(session_id)
+                raise
+        except Rejected as e:
+            ADMISSION_REJECTED.inc(route_class=self.name, reason=e.reason)
+            raise
+
+        admitted = time.perf_counter()
+        ADMISSION_QUEUE_WAIT.observe(admitted - start, route_class=self.name)
+        try:
+            yield
+        finally:
+            self.limiter.release(time.perf_counter() - admitted)
+            if session_id is not None:
+                self.sessions.release(session_id)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying per-route-class admission control to HTTP requests.
+
+    Paths that match no route class (health checks, metrics, static files)
+    and WebSocket connections pass through untouched.
+    """
+
+    def __init__(self, app, config: dict):
+        self.app = app
+        session_queue = config.get("session_queue", 2)
+        self.route_classes = [RouteClass(cfg, session_queue) for cfg in config.get("route_classes", [])]
+        self.session_patterns = [re.compile(p) for p in config.get("session_path_patterns", [])]
+        ROUTE_CLASSES[:] = self.route_classes
+
+    def _route_class(self, path: str) -> Optional[RouteClass]:
+        for route_class in self.route_classes:
+            if route_class.matches(path):
+                return route_class
+        return None
+
+    def _session_id(self, scope) -> Optional[str]:
+        for pattern in self.session_patterns:
+            match = pattern.match(scope["path"])
+            if match:
+                return match.group("session_id")
+        query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        return query.get("session_id") or None
+
+    async def __call__(self, scope, receive, send):
+        route_class = self._route_class(scope["path"]) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        session_id = self._session_id(scope) if route_class.sessions is not None else None
+        try:
+            async with route_class.admit(session_id):
+                # Streaming responses keep their slot until the last chunk is sent
+                await self.app(scope, receive, send)
+        except Rejected as e:
+            logger.warning(
+                f"🚦 Shed {scope['path']} ({route_class.name}: {e.reason}, "
+                f"in_flight={route_class.limiter.in_flight}, queued={route_class.limiter.queued})"
+            )
+            response = JSONResponse(
+                {"error": e.message}, status_code=e.status_code, headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+
+
+# Route classes of the installed middleware, read by the gauges below
+ROUTE_CLASSES: list[RouteClass] = []
+
+
+def get_route_class(name: str) -> Optional[RouteClass]:
+    """Installed route class ``name``, or None (admission disabled or no such class)."""
+    for route_class in ROUTE_CLASSES:
+        if route_class.name == name:
+            return route_class
+    return None
+
+CallbackGauge("admission_in_flight", "Requests running, by route class.",
+              lambda: {rc.name: rc.limiter.in_flight for rc in ROUTE_CLASSES}, labelname="route_class")
+CallbackGauge("admission_queued", "Requests waiting for a slot, by route class.",
+              lambda: {rc.name: rc.limiter.queued for rc in ROUTE_CLASSES}, labelname="route_class")
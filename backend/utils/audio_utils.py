@@ -0,0 +1,252 @@
+# backend/utils/audio_utils.py
+
+import asyncio
+import io
+import os
+import subprocess
+import wave
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+from config.setting import VOICE_CONFIG
+from utils.logging import get_logger
+from utils.exceptions import AudioProcessingError
+
+logger = get_logger(__name__)
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+# PCM layout handed to the STT engine: 16 kHz, mono, signed 16-bit little endian
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+
+def decode_to_pcm(
+    audio_bytes: bytes,
+    input_format: Optional[str] = None,
+    sample_rate: int = SAMPLE_RATE,
+    timeout: float = 30.0,
+) -> bytes:
+    """
+    Decode compressed audio to raw PCM entirely in memory.
+
+    The encoded bytes are piped to ffmpeg's stdin and 16-bit mono PCM is read
+    back from its stdout, so no temporary files are written.
+
+    Args:
+        audio_bytes (bytes): Encoded audio (webm, ogg, mp3, ...).
+        input_format (str, optional): ffmpeg demuxer name; probed if omitted.
+        sample_rate (int): Output sample rate in Hz.
+        timeout (float): Seconds to wait for ffmpeg.
+
+    Returns:
+        bytes: Signed 16-bit little-endian mono PCM.
+
+    Raises:
+        AudioProcessingError: If the input is empty or ffmpeg fails.
+    """
+    if not audio_bytes:
+        raise AudioProcessingError("Empty audio input", 400)
+
+    cmd = _ffmpeg_decode_cmd(input_format, sample_rate)
+
+    try:
+        proc = subprocess.run(cmd, input=audio_bytes, capture_output=True, timeout=timeout)
+    except FileNotFoundError:
+        raise AudioProcessingError("ffmpeg is not installed or not on PATH", 500)
+    except subprocess.TimeoutExpired:
+        raise AudioProcessingError("Audio decoding timed out", 504)
+
+    if proc.returncode != 0:
+        error = proc.stderr.decode("utf-8", errors="replace").strip()
+        logger.error(f"ffmpeg decode failed: {error}")
+        raise AudioProcessingError(f"Could not decode audio: {error or 'unknown error'}", 400)
+
+    return proc.stdout
+
+
+def _ffmpeg_decode_cmd(input_format: Optional[str], sample_rate: int) -> list[str]:
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error"]
+    if input_format:
+        cmd += ["-f", input_format]
+    max_seconds = VOICE_CONFIG.get("max_audio_seconds")
+    cmd += ["-i", "pipe:0"]
+    if max_seconds:
+        cmd += ["-t", str(max_seconds)]
+    cmd += [
+        "-ac", str(CHANNELS),
+        "-ar", str(sample_rate),
+        "-f", "s16le",
+        "pipe:1",
+    ]
+    return cmd
+
+
+async def decode_stream_to_pcm(
+    chunks: AsyncIterator[bytes],
+    input_format: Optional[str] = None,
+    sample_rate: int = SAMPLE_RATE,
+    timeout: float = 30.0,
+) -> bytes:
+    """
+    Decode an audio stream to raw PCM while it is still being received.
+
+    Chunks are written to ffmpeg's stdin as they arrive (with backpressure
+    from ``drain``) and PCM is read from stdout concurrently, so the
+    encoded upload is never held in memory as a whole.
+
+    Errors raised by ``chunks`` (e.g. upload size or format rejection) are
+    re-raised after ffmpeg has been stopped.
+
+    Returns:
+        bytes: Signed 16-bit little-endian mono PCM.
+
+    Raises:
+        AudioProcessingError: If ffmpeg is missing, fails or times out.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_ffmpeg_decode_cmd(input_format, sample_rate),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise AudioProcessingError("ffmpeg is not installed or not on PATH", 500)
+
+    async def _feed():
+        try:
+            async for chunk in chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early; its stderr explains why
+        finally:
+            proc.stdin.close()
+
+    feeder = asyncio.ensure_future(_feed())
+    try:
+        pcm, stderr = await asyncio.wait_for(
+            asyncio.gather(proc.stdout.read(), proc.stderr.read()), timeout
+        )
+        await feeder
+        await proc.wait()
+    except asyncio.TimeoutError:
+        raise AudioProcessingError("Audio decoding timed out", 504)
+    finally:
+        feeder.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        error = stderr.decode("utf-8", errors="replace").strip()
+        logger.error(f"ffmpeg decode failed: {error}")
+        raise AudioProcessingError(f"Could not decode audio: {error or 'unknown error'}", 400)
+    if not pcm:
+        raise AudioProcessingError("Empty audio input", 400)
+    return pcm
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Wrap 16-bit mono PCM in a WAV container, in memory."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def detect_voiced_frames(
+    samples: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    energy_floor_db: float = -50.0,
+    dynamic_range_db: float = 35.0,
+    max_zcr: float = 0.35,
+) -> np.ndarray:
+    """
+    Energy + zero-crossing voice activity detection, vectorized over frames.
+
+    A frame is voiced when its RMS energy is above an adaptive threshold
+    (``dynamic_range_db`` below the loudest frame, never below
+    ``energy_floor_db``) and its zero-crossing rate is below ``max_zcr``;
+    clearly loud frames are voiced regardless of ZCR so fricatives survive.
+
+    Args:
+        samples (np.ndarray): Mono float samples in [-1, 1].
+        sample_rate (int): Sample rate in Hz.
+        frame_ms (int): Frame length in milliseconds.
+
+    Returns:
+        np.ndarray: Boolean mask with one entry per frame.
+    """
+    frame_len = max(int(sample_rate * frame_ms / 1000), 1)
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=bool)
+
+    frames = samples[: n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(rms + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_len
+
+    threshold = max(energy_floor_db, float(energy_db.max()) - dynamic_range_db)
+    loud = energy_db > threshold + 10.0
+    return (energy_db > threshold) & ((zcr < max_zcr) | loud)
+
+
+def trim_silence(
+    pcm: bytes,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    padding_ms: int = 200,
+    min_speech_ms: int = 200,
+    **vad_kwargs,
+) -> bytes:
+    """
+    Trim leading and trailing silence from 16-bit mono PCM.
+
+    Keeps everything from the first to the last voiced frame plus
+    ``padding_ms`` on each side. Returns ``b""`` when less than
+    ``min_speech_ms`` of speech is detected, so callers can reject empty
+    clips before paying for speech-to-text.
+    """
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    voiced = detect_voiced_frames(samples, sample_rate, frame_ms, **vad_kwargs)
+
+    if np.count_nonzero(voiced) * frame_ms < min_speech_ms:
+        return b""
+
+    frame_len = max(int(sample_rate * frame_ms / 1000), 1)
+    padding = int(sample_rate * padding_ms / 1000)
+    indices = np.flatnonzero(voiced)
+    start = max(indices[0] * frame_len - padding, 0)
+    end = min((indices[-1] + 1) * frame_len + padding, len(samples))
+    return pcm[start * SAMPLE_WIDTH: end * SAMPLE_WIDTH]
+
+
+def vad_trim(pcm: bytes) -> bytes:
+    """
+    Trim silence from decoded PCM according to the ``voice.vad`` config.
+
+    Raises:
+        AudioProcessingError: If no speech is detected.
+    """
+    vad_kwargs = dict(VOICE_CONFIG.get("vad", {}))
+    if not vad_kwargs.pop("enabled", True):
+        return pcm
+
+    trimmed = trim_silence(pcm, **vad_kwargs)
+    if not trimmed:
+        raise AudioProcessingError("No speech detected in audio", 400)
+    logger.info(
+        f"VAD trimmed audio from {len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH):.2f}s "
+        f"to {len(trimmed) / (SAMPLE_RATE * SAMPLE_WIDTH):.2f}s"
+    )
+    return trimmed
@@ -0,0 +1,192 @@
+# backend/utils/compression.py
+
+"""
+Response compression for the API process.
+
+Full chat histories, batch NDJSON and JSON replies carrying base64 audio
+used to go out uncompressed. ``CompressionMiddleware`` compresses a
+response when:
+
+- the client sends ``Accept-Encoding`` with ``br`` or ``gzip`` (brotli is
+  preferred, and only used if the optional ``brotli`` package is installed),
+- its ``Content-Type`` is in the allowlist (``compression.content_types``;
+  audio, images and other already-compressed formats are left alone),
+- it has no ``Content-Encoding`` yet, and
+- its body reaches ``compression.minimum_size`` bytes. Below that the
+  headers and CPU cost more than they save.
+
+Streamed responses (e.g. ``/api/chat/batch``) are compressed chunk by
+chunk with a flush after each one, so every NDJSON line still reaches the
+client as soon as it is written.
+"""
+
+import zlib
+from typing import Optional
+
+from utils.logging import get_logger
+from utils.metrics import Counter
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = get_logger(__name__)
+
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes",
+    "Response body bytes before (stage=in) and after (stage=out) compression, by encoding.",
+    labelnames=("encoding", "stage"),
+)
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        return out + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Codings the client accepts (``q=0`` excluded)."""
+    accepted = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip / brotli response compression.
+
+    Args:
+        app: ASGI app to wrap.
+        config (dict): ``compression`` section of configuration.yaml.
+    """
+
+    def __init__(self, app, config: dict):
+        self.app = app
+        self.minimum_size = config.get("minimum_size", 1024)
+        self.gzip_level = config.get("gzip_level", 6)
+        self.brotli_quality = config.get("brotli_quality", 4)
+        self.content_types = tuple(config.get("content_types", DEFAULT_CONTENT_TYPES))
+        self.brotli = brotli is not None and config.get("brotli", True)
+        if config.get("brotli", True) and brotli is None:
+            logger.info("🗜️ brotli not installed; compressing responses with gzip only")
+
+    def _choose(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = accepted_encodings(value.decode("latin-1"))
+                if self.brotli and "br" in accepted:
+                    return "br"
+                if "gzip" in accepted:
+                    return "gzip"
+                return None
+        return None
+
+    def _compressor(self, encoding: str):
+        return _Brotli(self.brotli_quality) if encoding == "br" else _Gzip(self.gzip_level)
+
+    def _compressible(self, headers: list) -> bool:
+        content_type = None
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.decode("latin-1").split(";")[0].strip().lower()
+        return content_type is not None and content_type.startswith(self.content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None  # set once the response is being compressed
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if message["status"] in (204, 304) or not self._compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Hold the headers until the first body chunk decides the encoding
+                start_message = {**message, "headers": headers + [(b"vary", b"Accept-Encoding")]}
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Small, complete body: not worth compressing
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = self._compressor(encoding)
+                headers = [(k, v) for k, v in start_message["headers"] if k != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                compressed = compressor.compress(body, final=not more_body)
+                if not more_body:
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                await send({**start_message, "headers": headers})
+            else:
+                compressed = compressor.compress(body, final=not more_body)
+
+            COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="in")
+            COMPRESSION_BYTES.inc(len(compressed), encoding=encoding, stage="out")
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
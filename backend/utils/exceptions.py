@@ -1,7 +1,7 @@
 # backend/utils/exceptions.py
 
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from utils.responses import ORJSONResponse
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +14,10 @@ class AppException(Exception):
         self.message = message
         self.status_code = status_code
 
+    def __reduce__(self):
+        # Keep status_code when raised inside a process pool worker
+        return (self.__class__, (self.message, self.status_code))
+
 
 class DataIngestionError(AppException):
     """Error raised during data ingestion."""
@@ -23,11 +27,15 @@ class VectorStoreError(AppException):
     """Error raised during vector store operations."""
 
 
+class AudioProcessingError(AppException):
+    """Error raised while decoding or transcoding audio."""
+
+
 # ---- Exception Handlers ----
 async def app_exception_handler(request: Request, exc: AppException):
     """Handles custom AppException errors."""
     logger.error(f"[AppException] {exc.message} | Path: {request.url.path}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.message}
     )
@@ -36,16 +44,17 @@ async def app_exception_handler(request: Request, exc: AppException):
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handles standard FastAPI HTTP errors."""
     logger.warning(f"[HTTPException] {exc.detail} | Path: {request.url.path}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content={"error": exc.detail}
+        content={"error": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
 
 async def generic_exception_handler(request: Request, exc: Exception):
     """Handles all unexpected errors."""
     logger.exception(f"[Unexpected] {str(exc)} | Path: {request.url.path}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Something went wrong, please try again later."}
     )
@@ -1,8 +1,36 @@
 # backend/utils/logging.py
 
+"""
+Queue-backed logging pipeline.
+
+Every logger returned by ``get_logger`` shares one ``QueueHandler``: the
+calling thread only formats the message and enqueues the record. A single
+``QueueListener`` thread writes to the console and to the rotating
+``logs/app.log`` file (JSON lines by default), so file I/O and rotation
+never run on request threads.
+
+Forked processes (the workers of server.py) write to their own
+``logs/app.<pid>.log``: a ``RotatingFileHandler`` per process on one
+shared file would rotate it independently and lose or overwrite records.
+
+High-volume INFO lines can be sampled per logger via ``logging.sampling``
+in configuration.yaml; WARNING and above are always kept. Records logged
+inside a traced request carry its ``request_id``.
+"""
+
+import atexit
+import copy
+import itertools
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config.setting import LOGGING_CONFIG
+from utils.tracing import current_request_id
 
 # Ensure logs directory exists
 LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
@@ -10,38 +38,190 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
+LOG_LEVEL = getattr(logging, str(LOGGING_CONFIG.get("level", "INFO")).upper(), logging.INFO)
+
+# Standard LogRecord attributes; anything else was passed via ``extra=`` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every ``round(1 / rate)`` records below WARNING.
+
+    Counter-based rather than random so the kept fraction is exact and
+    sampled logs stay reproducible between runs.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        return next(self._counter) % self.every == 0
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """
+    Resolves the message and exception text on the calling thread (so the
+    record is picklable and self-contained) but leaves formatting to the
+    listener's handlers, keeping JSON output structured.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        request_id = current_request_id()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _text_formatter(with_line: bool) -> logging.Formatter:
+    location = "%(name)s:%(lineno)d" if with_line else "%(name)s"
+    return logging.Formatter(f"[%(asctime)s] [%(levelname)s] [{location}] - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+
+def _file_handler(path: str, delay: bool = False) -> RotatingFileHandler:
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=int(LOGGING_CONFIG.get("max_file_mb", 5) * 1024 * 1024),
+        backupCount=LOGGING_CONFIG.get("backup_count", 5),
+        encoding="utf-8",
+        delay=delay,
+    )
+    handler.setLevel(LOG_LEVEL)
+    file_json = LOGGING_CONFIG.get("file_format", "json") == "json"
+    handler.setFormatter(JsonFormatter() if file_json else _text_formatter(with_line=True))
+    return handler
+
+
+_pipeline_lock = threading.Lock()
+_queue_handler = None
+_listener = None
+
+
+def _get_queue_handler() -> QueueHandler:
+    """Create the shared queue handler and start the listener thread on first use."""
+    global _queue_handler, _listener
+    with _pipeline_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        # Console Handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(LOG_LEVEL)
+        console_json = LOGGING_CONFIG.get("console_format", "text") == "json"
+        console_handler.setFormatter(JsonFormatter() if console_json else _text_formatter(with_line=False))
+
+        # File Handler (rotating logs, runs on the listener thread only)
+        file_handler = _file_handler(LOG_FILE)
+
+        _queue_handler = _StructuredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(_queue_handler.queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _pipeline_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+# Threads do not survive fork(): drain and stop the listener before forking
+# (server.py) and start a fresh one in both parent and child afterwards.
+# The child switches to its own log file, so processes never rotate the same file.
+def _before_fork():
+    _pipeline_lock.acquire()
+    if _listener is not None:
+        _listener.stop()
+
+
+def _after_fork():
+    if _listener is not None:
+        _listener.start()
+    _pipeline_lock.release()
+
+
+def _after_fork_in_child():
+    global _pipeline_lock
+    _pipeline_lock = threading.Lock()
+    if _listener is not None:
+        root, ext = os.path.splitext(LOG_FILE)
+        handlers = []
+        for handler in _listener.handlers:
+            if isinstance(handler, RotatingFileHandler):
+                handler.close()  # the parent's file; the parent keeps writing it
+                # delay: forked helpers that never log (e.g. transcode pool workers) create no file
+                handler = _file_handler(f"{root}.{os.getpid()}{ext}", delay=True)
+            handlers.append(handler)
+        _listener.handlers = tuple(handlers)
+        _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork, after_in_child=_after_fork_in_child)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
-    Configure and return a logger with both console and rotating file handlers.
+    Return a logger wired to the shared queue-backed pipeline.
+
+    Args:
+        name (str): Logger name, usually ``__name__``.
+
+    Returns:
+        logging.Logger: Logger with the shared queue handler and, if configured,
+        a sampling filter from ``logging.sampling``.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL)
 
     # Prevent duplicate handlers if logger is already configured
-    if logger.hasHandlers():
+    if logger.handlers:
         return logger
 
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    console_handler.setFormatter(console_format)
-
-    # File Handler (rotating logs, 5MB per file, keep 5 backups)
-    file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=5)
-    file_handler.setLevel(logging.INFO)
-    file_format = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] [%(name)s:%(lineno)d] - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(file_format)
+    logger.addHandler(_get_queue_handler())
+    logger.propagate = False
 
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    rate = LOGGING_CONFIG.get("sampling", {}).get(name)
+    if rate is not None and rate < 1:
+        logger.addFilter(SamplingFilter(rate))
 
     return logger
 
@@ -52,3 +232,4 @@ def get_logger(name: str) -> logging.Logger:
 
 # logger.info("Application started successfully")
 # logger.error("Something went wrong", exc_info=True)
+# logger.info("Messages saved", extra={"session_id": session_id, "count": 2})
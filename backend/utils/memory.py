@@ -0,0 +1,60 @@
+# backend/utils/memory.py
+
+"""
+Process memory readings (Linux ``/proc``).
+
+RSS counts every resident page, including pages shared with the parent
+and sibling workers, so summing RSS over forked workers overstates real
+usage. PSS (proportional set size) splits each shared page between the
+processes mapping it, so PSS summed over workers is the actual footprint.
+"""
+
+from typing import Optional
+
+_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+
+
+def read_memory(pid: Optional[int] = None) -> dict:
+    """
+    Memory usage of a process in bytes.
+
+    Args:
+        pid (int, optional): Process id; the current process if omitted.
+
+    Returns:
+        dict: ``rss_bytes``, ``pss_bytes``, ``shared_*``/``private_*`` bytes
+        from ``smaps_rollup``, or just ``rss_bytes`` from ``status`` on older
+        kernels. Empty if ``/proc`` is unavailable (non-Linux).
+    """
+    proc = f"/proc/{pid or 'self'}"
+    memory = {}
+    try:
+        with open(f"{proc}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in _FIELDS:
+                    memory[_FIELDS[key]] = int(value.split()[0]) * 1024
+    except OSError:
+        try:
+            with open(f"{proc}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        memory["rss_bytes"] = int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    if memory:
+        memory["shared_bytes"] = memory.get("shared_clean_bytes", 0) + memory.get("shared_dirty_bytes", 0)
+    return memory
+
+
+def format_memory(memory: dict) -> str:
+    def mb(key: str) -> str:
+        return f"{memory[key] / 2**20:.1f}MB" if key in memory else "n/a"
+    return f"rss={mb('rss_bytes')} pss={mb('pss_bytes')} shared={mb('shared_bytes')}"
@@ -0,0 +1,266 @@
+# backend/utils/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from utils.tracing import current_trace
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _ShardedMetric:
+    """
+    Base for metrics whose hot path never takes a lock.
+
+    Every thread writes to its own shard (a dict keyed by label values)
+    held in a ``threading.local``; only the first write from a new thread
+    registers the shard under a lock. A scrape sums all shards. Readers may
+    see a shard mid-update, which is acceptable for monitoring data.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._register_lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _label_values(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _format_labels(self, values: tuple, extra: Optional[tuple] = None) -> str:
+        pairs = list(zip(self.labelnames, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+        return "{" + body + "}"
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_ShardedMetric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        shard = self._shard()
+        key = self._label_values(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        key = self._label_values(labels)
+        return sum(shard.get(key, 0.0) for shard in list(self._shards))
+
+    def render(self) -> list[str]:
+        totals: dict = {}
+        for shard in list(self._shards):
+            for key, value in list(shard.items()):
+                totals[key] = totals.get(key, 0.0) + value
+        return [f"{self.name}_total{self._format_labels(key)} {value}" for key, value in sorted(totals.items())]
+
+
+class Histogram(_ShardedMetric):
+    """Cumulative-bucket latency histogram (seconds)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        shard = self._shard()
+        key = self._label_values(labels)
+        state = shard.get(key)
+        if state is None:
+            # per-bucket counts (+Inf last), sum, count
+            state = shard[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        merged: dict = {}
+        for shard in list(self._shards):
+            for key, (counts, total, count) in list(shard.items()):
+                target = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                for i, c in enumerate(counts):
+                    target[0][i] += c
+                target[1] += total
+                target[2] += count
+
+        lines = []
+        for key, (counts, total, count) in sorted(merged.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class CallbackGauge:
+    """
+    Gauge whose value is read from a callable at scrape time.
+
+    With ``labelname``, ``fn`` returns a ``{label value: value}`` dict and
+    one sample is rendered per entry.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], float], labelname: Optional[str] = None):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.labelname = labelname
+        REGISTRY.register(self)
+
+    def render(self) -> list[str]:
+        try:
+            if self.labelname is None:
+                return [f"{self.name} {float(self.fn())}"]
+            return [
+                f'{self.name}{{{self.labelname}="{_escape(str(label))}"}} {float(value)}'
+                for label, value in sorted(self.fn().items())
+            ]
+        except Exception:
+            return []
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ---- Application metrics ----
+STAGE_LATENCY = Histogram(
+    "chatbot_stage_latency_seconds",
+    "Latency of each stage of a chat turn (history, retrieval, llm, stt, tts, ...).",
+    labelnames=("stage",),
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    labelnames=("method", "route", "status"),
+)
+
+
+def time_stage(stage: str):
+    """
+    Record the duration of a chat-turn stage in ``STAGE_LATENCY`` and as a
+    span of the current request trace.
+
+    Usable as a context manager or as a decorator for sync functions.
+    """
+    return _StageTimer(stage)
+
+
+class _StageTimer:
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self._trace = current_trace()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        STAGE_LATENCY.observe(end - self._start, stage=self.stage)
+        if self._trace is not None:
+            self._trace.add(self.stage, self._start, end)
+        return False
+
+    def __call__(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(self.stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording ``HTTP_REQUEST_LATENCY`` for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
@@ -0,0 +1,147 @@
+# backend/utils/responses.py
+
+import re
+import uuid
+from typing import Any, Optional
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson (several times faster than
+    ``json.dumps``; NumPy scalars/arrays and non-string dict keys allowed).
+    The app's default response class, see main.py.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def negotiate(accept: Optional[str], offers: list[str]) -> str:
+    """
+    Pick the best of ``offers`` for an HTTP ``Accept`` header.
+
+    Media ranges are matched exactly, by ``type/*`` or by ``*/*`` (most
+    specific range wins). Offers are ranked by ``q``, then by how
+    specifically they were named. The last offer is the caller's fallback
+    format and wins ties, so ``*/*`` (the browser ``fetch`` default), a
+    missing header or one that matches nothing selects it; other ties go to
+    the earlier offer.
+    """
+    if not accept:
+        return offers[-1]
+
+    ranges = []
+    for part in accept.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranges.append((media, q))
+
+    best, best_score = offers[-1], (0.0, -1)
+    # Fallback first, so it keeps ties
+    for offer in [offers[-1]] + offers[:-1]:
+        offer_type = offer.split("/")[0]
+        match_q, specificity = None, -1
+        for media, q in ranges:
+            if media == offer:
+                level = 2
+            elif media == f"{offer_type}/*":
+                level = 1
+            elif media == "*/*":
+                level = 0
+            else:
+                continue
+            if level > specificity:
+                match_q, specificity = q, level
+        if match_q and (match_q, specificity) > best_score:
+            best, best_score = offer, (match_q, specificity)
+    return best
+
+
+def _iter_chunks(data: memoryview):
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield bytes(data[start:start + CHUNK_SIZE])
+
+
+def audio_response(
+    audio: bytes,
+    range_header: Optional[str] = None,
+    media_type: str = "audio/mpeg",
+    headers: Optional[dict] = None,
+) -> StreamingResponse:
+    """
+    Stream raw audio bytes, honouring a single ``Range: bytes=a-b`` request.
+
+    Returns 206 with ``Content-Range`` for satisfiable ranges and raises a
+    416 for unsatisfiable ones; multi-range requests get the full body.
+    """
+    total = len(audio)
+    start, end, status_code = 0, total - 1, 200
+    extra = {"Accept-Ranges": "bytes", **(headers or {})}
+
+    match = RANGE_PATTERN.match(range_header.strip()) if range_header else None
+    if match and (match.group(1) or match.group(2)):
+        if match.group(1):
+            start = int(match.group(1))
+            end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+        else:  # suffix range: last N bytes
+            start = max(total - int(match.group(2)), 0)
+        if start > end or start >= total:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{total}"},
+            )
+        status_code = 206
+        extra["Content-Range"] = f"bytes {start}-{end}/{total}"
+
+    body = memoryview(audio)[start:end + 1]
+    extra["Content-Length"] = str(len(body))
+    return StreamingResponse(
+        _iter_chunks(body), status_code=status_code, media_type=media_type, headers=extra
+    )
+
+
+def multipart_response(
+    metadata: dict,
+    audio: Optional[bytes],
+    audio_type: str = "audio/mpeg",
+) -> Response:
+    """
+    Return a ``multipart/mixed`` body: a JSON part followed by an audio part.
+
+    The audio part is omitted when ``audio`` is empty, so clients can rely
+    on the JSON part always being first.
+    """
+    boundary = uuid.uuid4().hex
+    parts = [
+        f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode("utf-8"),
+        orjson.dumps(metadata, option=ORJSON_OPTIONS),
+        b"\r\n",
+    ]
+    if audio:
+        parts += [
+            f"--{boundary}\r\nContent-Type: {audio_type}\r\n"
+            f"Content-Length: {len(audio)}\r\n\r\n".encode("utf-8"),
+            audio,
+            b"\r\n",
+        ]
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return Response(
+        content=b"".join(parts),
+        media_type=f"multipart/mixed; boundary={boundary}",
+    )
@@ -0,0 +1,76 @@
+# backend/utils/startup.py
+
+"""
+Startup-time profiler for the API process.
+
+``STARTUP.stage(phase, name)`` times a block (a router import, a lazy
+service initialization) and records which top-level packages it imported
+for the first time. ``main.py`` wraps router imports with it, and lazily
+built services time their first initialization the same way, so the
+report (logged at startup and served on ``/debug/startup``) shows where
+worker cold start goes.
+
+For a per-package breakdown of import time, run
+``python -m benchmarks.import_time``.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupProfiler:
+    """Records import and initialization stages of the process."""
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.stages: list[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, phase: str, name: str):
+        """
+        Time one startup stage.
+
+        Args:
+            phase (str): "import" or "init".
+            name (str): Module or service being loaded.
+        """
+        before = {module.split(".")[0] for module in list(sys.modules)}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            after = {module.split(".")[0] for module in list(sys.modules)}
+            with self._lock:
+                self.stages.append({
+                    "phase": phase,
+                    "name": name,
+                    "ms": round(duration * 1000, 1),
+                    "offset_ms": round((start - self.created) * 1000, 1),
+                    "new_packages": sorted(p for p in after - before if not p.startswith("_")),
+                })
+
+    def report(self) -> dict:
+        with self._lock:
+            stages = list(self.stages)
+        totals = {}
+        for stage in stages:
+            totals[stage["phase"]] = round(totals.get(stage["phase"], 0.0) + stage["ms"], 1)
+        return {"totals_ms": totals, "stages": stages}
+
+    def log_report(self):
+        report = self.report()
+        logger.info(f"🚀 Startup profile: {report['totals_ms']}")
+        for stage in sorted(report["stages"], key=lambda s: -s["ms"]):
+            packages = ", ".join(stage["new_packages"][:8])
+            logger.info(f"   {stage['phase']:<6} {stage['name']:<28} {stage['ms']:>8.1f} ms  {packages}")
+
+
+STARTUP = StartupProfiler()
@@ -0,0 +1,27 @@
+# backend/utils/static_files.py
+
+import os
+
+from fastapi.staticfiles import StaticFiles
+
+ONE_YEAR = 365 * 24 * 60 * 60
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that marks content-addressed files as immutable.
+
+    Files whose name starts with one of ``immutable_prefixes`` are named by
+    the hash of their content, so browsers and proxies may cache them for a
+    year without revalidation. Other files keep Starlette's default headers.
+    """
+
+    def __init__(self, *args, immutable_prefixes: tuple = ("tts_",), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_prefixes = immutable_prefixes
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if os.path.basename(full_path).startswith(self.immutable_prefixes):
+            response.headers["Cache-Control"] = f"public, max-age={ONE_YEAR}, immutable"
+        return response
@@ -0,0 +1,274 @@
+# backend/utils/tracing.py
+
+"""
+Request-scoped tracing.
+
+``TracingMiddleware`` gives every HTTP request a request id (the incoming
+``X-Request-ID`` or a new one) and a ``Trace`` held in a contextvar. Code
+anywhere below the route (ChatbotServices, RetrieverServices, DB helpers,
+``time_stage`` blocks) records timed spans into it with ``span()``
+without the trace being passed around; contextvars follow the request
+into ``run_in_threadpool`` and asyncio tasks.
+
+Spans are summarized in a ``Server-Timing`` response header and, for
+requests slower than ``tracing.export_min_ms``, appended to a per-process
+Chrome trace file (``chrome://tracing`` / Perfetto, JSON array format).
+"""
+
+import itertools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Optional
+
+from config.setting import TRACING_CONFIG
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_lanes = itertools.count(1)
+_SERVER_TIMING_NAME = re.compile(r"[^A-Za-z0-9_-]")
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class Trace:
+    """Spans recorded for one request (or one WebSocket voice turn)."""
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        self.name = name
+        self.request_id = request_id or uuid.uuid4().hex
+        self.lane = next(_lanes)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.spans: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, **args):
+        """Record a span from two ``time.perf_counter()`` readings."""
+        with self._lock:
+            self.spans.append((name, start, end, threading.current_thread().name, args))
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value: total duration per span name, plus ``total``."""
+        totals = {}
+        with self._lock:
+            for name, start, end, _, _ in self.spans:
+                totals[name] = totals.get(name, 0.0) + (end - start) * 1000
+        metrics = [f"{_SERVER_TIMING_NAME.sub('_', name)};dur={ms:.1f}" for name, ms in totals.items()]
+        metrics.append(f"total;dur={self.duration_ms:.1f}")
+        return ", ".join(metrics)
+
+    def to_chrome_events(self) -> list[dict]:
+        """Complete ("X") events on one lane per request, timestamps in microseconds."""
+        pid = os.getpid()
+
+        def _us(t: float) -> float:
+            return round((self.wall_start + (t - self.start)) * 1e6, 1)
+
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": self.lane,
+             "args": {"name": f"{self.name} [{self.request_id}]"}},
+            {"name": self.name, "cat": "request", "ph": "X", "pid": pid, "tid": self.lane,
+             "ts": _us(self.start), "dur": round(self.duration_ms * 1000, 1),
+             "args": {"request_id": self.request_id}},
+        ]
+        with self._lock:
+            spans = list(self.spans)
+        for name, start, end, thread, args in spans:
+            events.append({
+                "name": name, "cat": "stage", "ph": "X", "pid": pid, "tid": self.lane,
+                "ts": _us(start), "dur": round((end - start) * 1e6, 1),
+                "args": {"request_id": self.request_id, "thread": thread, **args},
+            })
+        return events
+
+
+# ======================
+# 🔎 Context helpers
+# ======================
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def start_trace(name: str, request_id: Optional[str] = None):
+    """Make a new ``Trace`` current for the enclosed block and finish it on exit."""
+    trace = Trace(name, request_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_trace.reset(token)
+
+
+def record_span(name: str, start: float, end: float, trace: Optional[Trace] = None, **args):
+    """Record an externally timed span into ``trace`` (default: the current one)."""
+    trace = trace or _current_trace.get()
+    if trace is not None:
+        trace.add(name, start, end, **args)
+
+
+def span(name: str, **args):
+    """
+    Time a block (context manager) or a sync function (decorator) as a span
+    of the current trace. A no-op outside a traced request.
+    """
+    return _Span(name, args)
+
+
+class _Span:
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        # Bind the trace on entry: generators may resume on a thread without the context
+        self._trace = _current_trace.get()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._trace is not None:
+            self._trace.add(self.name, self._start, time.perf_counter(), **self.args)
+        return False
+
+    def __call__(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(self.name, self.args):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+# ======================
+# 📤 Chrome trace export
+# ======================
+class ChromeTraceExporter:
+    """
+    Appends trace events to a Chrome trace file from a background thread.
+
+    Uses the JSON array format, whose closing ``]`` is optional, so events
+    can be appended without rewriting the file. Each process writes its
+    own file (``traces.<pid>.json`` for ``export_path: logs/traces.json``),
+    so forked workers never interleave writes. Once a file reaches
+    ``max_bytes`` it is moved to ``<file>.1`` (replacing the previous one)
+    and a new file is started.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 20 * 1024 * 1024):
+        root, ext = os.path.splitext(path)
+        self.path = f"{root}.{os.getpid()}{ext or '.json'}"
+        self.max_bytes = max_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace):
+        self._queue.put(trace.to_chrome_events())
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        while True:
+            events = self._queue.get()
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self.max_bytes and size >= self.max_bytes:
+                os.replace(self.path, self.path + ".1")
+                size = 0
+            has_events = size > 2
+            with open(self.path, "a", encoding="utf-8") as f:
+                if not has_events:
+                    f.write("[\n")
+                for i, event in enumerate(events):
+                    f.write(("" if not has_events and i == 0 else ",\n") + json.dumps(event))
+
+
+@lru_cache(maxsize=1)
+def get_trace_exporter() -> Optional[ChromeTraceExporter]:
+    path = TRACING_CONFIG.get("export_path")
+    if not path:
+        return None
+    return ChromeTraceExporter(
+        path if os.path.isabs(path) else os.path.join(ROOT_DIR, path),
+        max_bytes=int(TRACING_CONFIG.get("export_max_mb", 20) * 1024 * 1024),
+    )
+
+
+# The exporter thread does not survive fork(); forked workers start their own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=get_trace_exporter.cache_clear)
+
+
+def export_trace(trace: Trace):
+    """Export a finished trace if it is slow enough and sampled in."""
+    if trace.duration_ms < TRACING_CONFIG.get("export_min_ms", 0):
+        return
+    if random.random() >= TRACING_CONFIG.get("sample_rate", 1.0):
+        return
+    exporter = get_trace_exporter()
+    if exporter is not None:
+        exporter.export(trace)
+
+
+# ======================
+# 🧩 ASGI middleware
+# ======================
+class TracingMiddleware:
+    """
+    Starts a trace per HTTP request and returns ``X-Request-ID`` and
+    ``Server-Timing`` headers.
+
+    For streaming responses the header only covers spans finished before
+    the first byte; the exported trace covers the whole response.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _REQUEST_ID.match(incoming) else None
+        name = f"{scope.get('method', '')} {scope.get('path', '')}"
+
+        with start_trace(name, request_id) as trace:
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-request-id", trace.request_id.encode("latin-1")))
+                    if self.server_timing:
+                        headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                trace.finish()
+                export_trace(trace)
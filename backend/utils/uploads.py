@@ -0,0 +1,182 @@
+# backend/utils/uploads.py
+
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, Request
+
+from config.setting import VOICE_CONFIG
+from utils.logging import get_logger
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+logger = get_logger(__name__)
+
+MAX_AUDIO_SIZE = int(VOICE_CONFIG.get("max_upload_mb", 25) * 1024 * 1024)
+MAX_FIELD_SIZE = 4 * 1024   # plain form fields (session_id, voice, ...)
+SNIFF_BYTES = 16            # enough for every signature below
+
+
+def sniff_audio_format(head: bytes) -> Optional[str]:
+    """
+    Identify an audio container from its first bytes (magic numbers).
+
+    Returns:
+        str | None: ffmpeg demuxer name, or None if the format is unknown.
+    """
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return "webm"
+    if head.startswith(b"OggS"):
+        return "ogg"
+    if head.startswith(b"RIFF") and head[8:12] == b"WAVE":
+        return "wav"
+    if head.startswith(b"fLaC"):
+        return "flac"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head.startswith(b"ID3"):
+        return "mp3"
+    if len(head) >= 2 and head[0] == 0xFF:
+        if head[1] & 0xF6 == 0xF0:   # ADTS sync word, layer bits 00
+            return "aac"
+        if head[1] & 0xE0 == 0xE0:   # MPEG audio frame sync
+            return "mp3"
+    return None
+
+
+class AudioUpload:
+    """
+    Stream an audio upload out of the request body chunk by chunk.
+
+    Accepts either ``multipart/form-data`` (the audio in ``field``, other
+    small fields collected into ``fields``) or a raw ``audio/*`` body.
+    Nothing is spooled to memory or disk: chunks are yielded as they
+    arrive, so the caller can forward them straight into the decoder.
+
+    Oversized uploads are rejected from ``Content-Length`` before reading
+    and otherwise as soon as the running total passes ``max_bytes`` (413).
+    The format is sniffed from the first bytes and unknown containers are
+    rejected before any decoding (415).
+
+    Attributes:
+        fields (dict): Non-file multipart fields; complete once iteration ends.
+        format (str | None): Sniffed ffmpeg format name.
+        size (int): Audio bytes received so far.
+    """
+
+    def __init__(self, request: Request, field: str = "file", max_bytes: int = MAX_AUDIO_SIZE):
+        self.request = request
+        self.field = field
+        self.max_bytes = max_bytes
+        self.fields: dict = {}
+        self.format: Optional[str] = None
+        self.size = 0
+
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes + MAX_FIELD_SIZE:
+            raise self._too_large()
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"Audio file too large. Max size: {self.max_bytes / (1024 * 1024):.1f}MB",
+        )
+
+    async def open(self) -> AsyncIterator[bytes]:
+        """
+        Read until the format is known, then return the full chunk stream.
+
+        Lets callers pick the decoder from ``self.format`` before the rest
+        of the body is read; size checks keep applying while iterating.
+        """
+        stream = self.__aiter__()
+        first = await stream.__anext__()
+
+        async def _chained():
+            yield first
+            async for chunk in stream:
+                yield chunk
+
+        return _chained()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        head = b""
+        async for chunk in self._file_chunks():
+            self.size += len(chunk)
+            if self.size > self.max_bytes:
+                raise self._too_large()
+
+            if self.format is None:
+                head += chunk
+                if len(head) < SNIFF_BYTES:
+                    continue
+                self._sniff(head)
+                chunk, head = head, b""
+            yield chunk
+
+        if self.format is None:
+            if not head:
+                raise HTTPException(status_code=400, detail="Empty audio file")
+            self._sniff(head)
+            yield head
+
+    def _sniff(self, head: bytes):
+        self.format = sniff_audio_format(head)
+        if self.format is None:
+            raise HTTPException(status_code=415, detail="Unsupported or unrecognized audio format")
+
+    async def _file_chunks(self) -> AsyncIterator[bytes]:
+        content_type, params = parse_options_header(self.request.headers.get("content-type", ""))
+        if content_type.startswith(b"audio/"):
+            async for chunk in self.request.stream():
+                if chunk:
+                    yield chunk
+            return
+
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=400, detail="Expected multipart/form-data or an audio/* body")
+
+        state = {"name": None, "header_field": b"", "header_value": b"", "value": b""}
+        pending: list[bytes] = []
+
+        def on_part_begin():
+            state["name"], state["value"] = None, b""
+
+        def on_header_field(data, start, end):
+            state["header_field"] += data[start:end]
+
+        def on_header_value(data, start, end):
+            state["header_value"] += data[start:end]
+
+        def on_header_end():
+            if state["header_field"].lower() == b"content-disposition":
+                _, options = parse_options_header(state["header_value"])
+                state["name"] = options.get(b"name", b"").decode("utf-8", errors="replace")
+            state["header_field"], state["header_value"] = b"", b""
+
+        def on_part_data(data, start, end):
+            if state["name"] == self.field:
+                pending.append(bytes(data[start:end]))
+            elif len(state["value"]) + (end - start) <= MAX_FIELD_SIZE:
+                state["value"] += data[start:end]
+
+        def on_part_end():
+            if state["name"] and state["name"] != self.field:
+                self.fields[state["name"]] = state["value"].decode("utf-8", errors="replace")
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        })
+        async for chunk in self.request.stream():
+            parser.write(chunk)
+            for data in pending:
+                yield data
+            pending.clear()
+        parser.finalize()
@@ -24,12 +24,94 @@ API_URL = config.get("data_sources", {}).get("api_url")
 # 🔎 Vectorstore
 # ======================
 VECTORSTORE_CONFIG = config.get("vectorstore", {})
+LOCAL_INDEX_DIR = os.path.join(
+    os.path.dirname(BASE_DIR), VECTORSTORE_CONFIG.get("local_index_dir", "data/vector_index")
+)
+
+# ======================
+# 🗂️ Product catalog (columnar, for structured questions)
+# ======================
+CATALOG_CONFIG = config.get("catalog", {})
+CATALOG_DIR = os.path.join(
+    os.path.dirname(BASE_DIR), CATALOG_CONFIG.get("directory", "data/catalog")
+)
+
+# ======================
+# 🧾 Offline review summaries (python -m ingestion.review_summaries)
+# ======================
+REVIEW_SUMMARY_CONFIG = config.get("review_summaries", {})
+REVIEW_SUMMARIES_PATH = os.path.join(
+    os.path.dirname(BASE_DIR), REVIEW_SUMMARY_CONFIG.get("path", "data/review_summaries.jsonl")
+)
+REVIEW_SUMMARY_CSV_PATH = os.path.join(
+    os.path.dirname(BASE_DIR), REVIEW_SUMMARY_CONFIG.get("job", {}).get("csv_path", "data/flipkart_product_review.csv")
+)
+
+# ======================
+# 🧭 Intent router (answers small talk / catalog lookups without the LLM)
+# ======================
+INTENT_ROUTER_CONFIG = config.get("intent_router", {})
 
 # ======================
 # 🧠 Embeddings
 # ======================
 EMBEDDINGS_CONFIG = config.get("embeddings", {})
 
+# ======================
+# 🎙️ Voice pipeline
+# ======================
+VOICE_CONFIG = config.get("voice", {})
+
+# ======================
+# 🔊 TTS audio cache
+# ======================
+TTS_CACHE_CONFIG = config.get("tts_cache", {})
+
+# ======================
+# 🌐 API process
+# ======================
+API_CONFIG = config.get("api", {})
+
+# ======================
+# 📦 Batch queries (/api/chat/batch)
+# ======================
+BATCH_CONFIG = config.get("batch", {})
+
+# ======================
+# 🍴 Preload-and-fork server
+# ======================
+SERVER_CONFIG = config.get("server", {})
+
+# ======================
+# 🔥 Warm-up / readiness
+# ======================
+WARMUP_CONFIG = config.get("warmup", {})
+
+# ======================
+# 🚦 Admission control
+# ======================
+ADMISSION_CONFIG = config.get("admission", {})
+
+# ======================
+# 🗜️ Response compression
+# ======================
+COMPRESSION_CONFIG = config.get("compression", {})
+
+# ======================
+# 📝 Logging
+# ======================
+LOGGING_CONFIG = config.get("logging", {})
+
+# ======================
+# 🧵 Request tracing
+# ======================
+TRACING_CONFIG = config.get("tracing", {})
+
+# ======================
+# 📏 Retrieval evaluation
+# ======================
+EVALUATION_CONFIG = config.get("evaluation", {})
+
 # ======================
 # 🤖 LLMs
 # ======================
@@ -47,13 +47,13 @@ export default function VoiceChat() {
     loadHistory();
   }, [sessionId]);
 
-  // ---------------------- Save message ----------------------
-  const saveToHistory = async (message) => {
+  // ---------------------- Save messages (one batch per turn) ----------------------
+  const saveToHistory = async (...messages) => {
     try {
-      await fetch(`${BACKEND_URL}/api/history/${sessionId}`, {
+      await fetch(`${BACKEND_URL}/api/history/${sessionId}/batch`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(message),
+        body: JSON.stringify({ messages }),
       });
     } catch (err) {
       console.error("Failed to save history:", err);
@@ -97,7 +97,7 @@ export default function VoiceChat() {
     };
 
     setMessages((prev) => [...prev, userMsg]);
-    saveToHistory(userMsg);
+    let aiMsg = null;
 
     try {
       const res = await fetch(
@@ -112,7 +112,7 @@ export default function VoiceChat() {
       // ✅ Fix: backend sends “response”, not “answer”
       const parsed = parseBotReply(data.response || data.answer);
 
-      const aiMsg = {
+      aiMsg = {
         id: Date.now() + "_a",
         role: "ai",
         ...parsed,
@@ -120,13 +120,14 @@ export default function VoiceChat() {
       };
 
       setMessages((prev) => [...prev, aiMsg]);
-      saveToHistory(aiMsg);
       setInput("");
     } catch (err) {
       console.error(err);
       setError(err.message);
     } finally {
       setLoading(false);
+      // user + bot message go out together; retries are idempotent on `id`
+      saveToHistory(...(aiMsg ? [userMsg, aiMsg] : [userMsg]));
     }
   };
 
@@ -167,7 +168,8 @@ export default function VoiceChat() {
       formData.append("file", blob, "voice.webm");
       formData.append("session_id", sessionId);
 
-      const res = await fetch(`${BACKEND_URL}/api/voice/chat`, {
+      // session_id in the query string lets the backend serialize turns of a session
+      const res = await fetch(`${BACKEND_URL}/api/voice/chat?session_id=${encodeURIComponent(sessionId)}`, {
         method: "POST",
         body: formData,
       });
@@ -195,8 +197,7 @@ export default function VoiceChat() {
       };
 
       setMessages((prev) => [...prev, userMsg, aiMsg]);
-      saveToHistory(userMsg);
-      saveToHistory(aiMsg);
+      saveToHistory(userMsg, aiMsg);
     } catch (err) {
       setError(err.message || "Voice processing failed");
     } finally {
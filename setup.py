@@ -15,6 +15,7 @@ install_requires = [
     "python-dotenv",
     "flask",
     "fastapi",
+    "orjson",
     "uvicorn",
     "huggingface_hub",
     "transformers",